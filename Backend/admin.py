@@ -1,21 +1,37 @@
-from fastapi import APIRouter, HTTPException, Body, Query
+from fastapi import APIRouter, HTTPException, Body, Query, UploadFile, File, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
-import boto3
-
-from app.config.settings import settings
+from datetime import date
+from pydantic import BaseModel, Field
 from app.services.db_service import (
-    get_all_exit_requests,
-    get_all_damage_reports,
-    update_exit_request_status,
-    update_exit_request_data
+    get_status_counters_async,
+    rebuild_status_counters_async,
+    get_cache_stats_async,
+    query_exit_requests_async,
+    get_damage_reports_page_async,
+    update_exit_request_status_async,
+    batch_update_exit_request_status_async,
+    update_exit_request_data_async,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    VALID_EXIT_STATUSES,
+    parse_fields
 )
-
-# Initialize DynamoDB (used only if needed directly)
-dynamodb = boto3.resource(
-    'dynamodb',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
+from app.services.import_service import detect_format, import_records
+from app.services.codec import DecimalJSONResponse
+from app.services.export_service import detect_export_format, export_filename, open_export, EXPORT_FORMATS
+from app.services.export_jobs import submit_export_job, get_export_job
+from app.services.async_io import run_blocking
+from app.services.etag import conditional_get, cache_headers
+from app.services.search_index import search_documents, get_search_stats, rebuild_search_index
+from app.services.landlord_views import backfill_landlord_views_async
+from app.services.analytics import (
+    AnalyticsUnavailable,
+    exits_per_week,
+    approval_turnaround,
+    damage_costs,
+    get_analytics_status,
+    refresh_analytics
 )
 
 router = APIRouter(tags=["Admin Dashboard"])  # prefix handled in main.py
@@ -25,22 +41,35 @@ router = APIRouter(tags=["Admin Dashboard"])  # prefix handled in main.py
 # -------------------------
 @router.get("/exit-requests")
 async def get_all_exit_requests_filtered(
+    request: Request,
     status: Optional[str] = Query(None),
     tenant_id: Optional[str] = Query(None),
-    room_number: Optional[str] = Query(None)
+    room_number: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
 ):
+    """
+    One page of exit requests, filtered through the status/tenant/room indexes.
+    Pass the returned next_token back (with the same filters) to get the next page.
+    Send the ETag back as If-None-Match to get a 304 while nothing has changed.
+    """
     try:
+        etag, not_modified = await conditional_get(request, "exit_requests")
+        if not_modified:
+            return not_modified
         print("🔍 Admin fetching filtered exit requests...")
-        records = get_all_exit_requests()
-
-        if status:
-            records = [r for r in records if r.get("request_status") == status]
-        if tenant_id:
-            records = [r for r in records if r.get("tenant_id") == tenant_id]
-        if room_number:
-            records = [r for r in records if r.get("room_number") == room_number]
-
-        return records
+        page = await query_exit_requests_async(
+            status=status,
+            tenant_id=tenant_id,
+            room_number=room_number,
+            limit=limit,
+            next_token=next_token,
+            fields=parse_fields(fields, "exit_admin")
+        )
+        return DecimalJSONResponse(page, headers=cache_headers(etag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print("❌ Error filtering exit requests:", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve exit requests")
@@ -49,10 +78,29 @@ async def get_all_exit_requests_filtered(
 # GET: All Damage Reports
 # -------------------------
 @router.get("/damage-reports")
-async def get_all_damage_reports_view():
+async def get_all_damage_reports_view(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
+    """
+    One page of damage reports. Pass the returned next_token back to get the next page.
+    Conditional on If-None-Match, like /exit-requests.
+    """
     try:
+        etag, not_modified = await conditional_get(request, "damage_reports")
+        if not_modified:
+            return not_modified
         print("🔍 Fetching all damage reports...")
-        return get_all_damage_reports()
+        page = await get_damage_reports_page_async(
+            limit=limit,
+            next_token=next_token,
+            fields=parse_fields(fields, "damage")
+        )
+        return DecimalJSONResponse(page, headers=cache_headers(etag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print("❌ Error fetching damage reports:", e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch damage reports: {str(e)}")
@@ -65,12 +113,59 @@ async def update_exit_status(
     request_id: str = Body(...),
     new_status: str = Body(...)
 ):
+    if new_status not in VALID_EXIT_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status value.")
+
     try:
         print(f"🛠 Updating status for {request_id} → {new_status}")
-        return update_exit_request_status(request_id, new_status)
+        return await update_exit_request_status_async(request_id, new_status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update status: {str(e)}")
 
+# -------------------------
+# PATCH: Batch Update Exit Status
+# -------------------------
+MAX_BATCH_STATUS_UPDATES = 500
+
+
+class StatusChange(BaseModel):
+    request_id: str
+    new_status: str
+
+
+class BatchStatusUpdate(BaseModel):
+    updates: List[StatusChange] = Field(..., min_length=1)
+
+
+@router.patch("/update-exit-status/batch")
+async def batch_update_exit_status(payload: BatchStatusUpdate):
+    """
+    Apply many status changes in one call and return an outcome per request_id.
+    Invalid statuses are reported per item; the rest are still applied.
+    """
+    if len(payload.updates) > MAX_BATCH_STATUS_UPDATES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_STATUS_UPDATES} updates per batch.")
+
+    results = {}
+    changes = {}
+    for change in payload.updates:
+        if change.new_status not in VALID_EXIT_STATUSES:
+            results[change.request_id] = {"status": "invalid_status", "detail": "Invalid status value."}
+            changes.pop(change.request_id, None)
+        else:
+            # A later entry for the same request_id wins
+            results.pop(change.request_id, None)
+            changes[change.request_id] = change.new_status
+
+    try:
+        print(f"🛠 Batch updating {len(changes)} exit request statuses")
+        if changes:
+            results.update(await batch_update_exit_request_status_async(changes))
+        updated = sum(1 for outcome in results.values() if outcome["status"] == "updated")
+        return {"updated": updated, "total": len(results), "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to batch update status: {str(e)}")
+
 # -------------------------
 # PATCH: Add Admin Notes / Edit Fields
 # -------------------------
@@ -79,10 +174,16 @@ async def update_exit_fields(
     request_id: str = Body(...),
     admin_notes: Optional[str] = Body(None),
     exit_reason: Optional[str] = Body(None),
-    moveout_checklist: Optional[List[str]] = Body(None)
+    moveout_checklist: Optional[List[str]] = Body(None),
+    exit_date: Optional[date] = Body(None),
+    moved_out_at: Optional[date] = Body(None),
+    move_in_date: Optional[date] = Body(None),
+    landlord_id: Optional[str] = Body(None),
+    property_id: Optional[str] = Body(None)
 ):
     """
-    Admin updates one or more fields: checklist, notes, reason.
+    Admin updates one or more fields: checklist, notes, reason, exit/move dates,
+    landlord/property. Dates and ownership feed the landlord views.
     """
     try:
         update_fields = {}
@@ -92,12 +193,19 @@ async def update_exit_fields(
             update_fields["exit_reason"] = exit_reason
         if moveout_checklist is not None:
             update_fields["moveout_checklist"] = moveout_checklist
+        for field, value in (("exit_date", exit_date), ("moved_out_at", moved_out_at), ("move_in_date", move_in_date)):
+            if value is not None:
+                update_fields[field] = value.isoformat()
+        if landlord_id is not None:
+            update_fields["landlord_id"] = landlord_id
+        if property_id is not None:
+            update_fields["property_id"] = property_id
 
         if not update_fields:
             raise HTTPException(status_code=400, detail="No update fields provided.")
 
         print(f"📝 Admin updating fields for {request_id}: {list(update_fields.keys())}")
-        return update_exit_request_data(request_id, update_fields)
+        return await update_exit_request_data_async(request_id, update_fields)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update fields: {str(e)}")
 
@@ -106,29 +214,366 @@ async def update_exit_fields(
 # -------------------------
 @router.get("/dashboard-summary")
 async def dashboard_summary():
+    """
+    Served from the materialized status counters (one GetItem).
+    """
     try:
-        records = get_all_exit_requests()
-        total = len(records)
-        approved = sum(1 for r in records if r.get("request_status") == "Approved")
-        pending = sum(1 for r in records if r.get("request_status") == "Pending")
-        rejected = sum(1 for r in records if r.get("request_status") == "Rejected")
+        counters = await get_status_counters_async()
+        statuses = counters["statuses"]
         return {
-            "total_requests": total,
-            "approved": approved,
-            "pending": pending,
-            "rejected": rejected
+            "total_requests": counters["total_requests"],
+            "approved": statuses.get("Approved", 0),
+            "pending": statuses.get("Pending", 0),
+            "rejected": statuses.get("Rejected", 0),
+            "by_status": statuses
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to fetch summary")
 
 # -------------------------
-# GET: Export PDF Report (Stub for future)
+# POST: Rebuild Summary Counters
+# -------------------------
+@router.post("/dashboard-summary/rebuild")
+async def rebuild_dashboard_summary():
+    """
+    Recompute the status counters from a full scan and report any drift.
+    """
+    try:
+        print("🔁 Rebuilding exit request status counters...")
+        return await rebuild_status_counters_async()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild summary: {str(e)}")
+
+# -------------------------
+# POST: Rebuild Landlord Views
+# -------------------------
+@router.post("/landlord-views/rebuild")
+async def rebuild_landlord_views():
+    """
+    Re-derive the landlord projections from every exit request
+    (same as `python -m app.manage backfill-landlord-views`).
+    """
+    try:
+        print("🔁 Backfilling landlord views...")
+        return await backfill_landlord_views_async()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild landlord views: {str(e)}")
+
+# -------------------------
+# GET: Tenant Cache Stats
+# -------------------------
+@router.get("/cache-stats")
+async def cache_stats():
+    """
+    Hit/miss/eviction counters for the per-tenant read cache.
+    """
+    return await get_cache_stats_async()
+
+# -------------------------
+# GET: Full-Text Search
+# -------------------------
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, description="Words to find; the last letters of a word may be left off"),
+    kind: Optional[str] = Query(None, description="'exit' or 'damage'"),
+    tenant_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="Exit request status"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None)
+):
+    """
+    Exit requests (exit_reason, admin_notes) and damage reports (damaged items,
+    description) ranked by BM25, best match first. Every word must match, as a
+    whole word or a prefix. Pass next_token back with the same query for more.
+    """
+    try:
+        return DecimalJSONResponse(await run_blocking(
+            search_documents, q, kind=kind, tenant_id=tenant_id, status=status, limit=limit, next_token=next_token
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print("❌ Search failed:", e)
+        raise HTTPException(status_code=500, detail="Search failed")
+
+
+@router.get("/search/stats")
+async def search_stats():
+    """
+    Size and freshness of this worker's search index.
+    """
+    return get_search_stats()
+
+
+@router.post("/search/rebuild")
+async def rebuild_search():
+    """
+    Re-read every exit request and damage report into the search index and save the snapshot.
+    """
+    try:
+        print("🔁 Rebuilding search index...")
+        return await run_blocking(rebuild_search_index)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild search index: {str(e)}")
+
+# -------------------------
+# GET: Analytics
+# Answered from the in-memory columnar snapshot, not from storage
+# -------------------------
+def _parse_percentiles(percentiles: Optional[str]):
+    if not percentiles:
+        return None
+    try:
+        return [float(value) for value in percentiles.split(",") if value.strip()]
+    except ValueError:
+        raise ValueError("percentiles must be comma-separated numbers, e.g. 50,90,99")
+
+
+def _analytics(query, **filters):
+    try:
+        return query(**filters)
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print("❌ Analytics query failed:", e)
+        raise HTTPException(status_code=500, detail="Analytics query failed")
+
+
+@router.get("/analytics/exits-per-week")
+async def analytics_exits_per_week(
+    date_field: str = Query("exit_date", description="'exit_date' or 'submitted_at'"),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    status: Optional[str] = Query(None),
+    top: int = Query(10, ge=0, le=100, description="Most common reasons listed separately; the rest count as 'other'")
+):
+    """
+    Exit requests per week (weeks start on Monday), split by exit reason.
+    """
+    return _analytics(exits_per_week, date_field=date_field, since=since, until=until, status=status, top=top)
+
+
+@router.get("/analytics/approval-turnaround")
+async def analytics_approval_turnaround(
+    since: Optional[date] = Query(None, description="Submitted on or after"),
+    until: Optional[date] = Query(None, description="Submitted on or before"),
+    room_number: Optional[str] = Query(None),
+    percentiles: Optional[str] = Query(None, description="Comma-separated, e.g. 50,90,95")
+):
+    """
+    Hours from submission to approval/rejection: overall, per final status and per week.
+    """
+    try:
+        parsed = _parse_percentiles(percentiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _analytics(approval_turnaround, since=since, until=until, room_number=room_number, percentiles=parsed)
+
+
+@router.get("/analytics/damage-costs")
+async def analytics_damage_costs(
+    since: Optional[date] = Query(None, description="Reported on or after"),
+    until: Optional[date] = Query(None, description="Reported on or before"),
+    room_number: Optional[str] = Query(None),
+    percentiles: Optional[str] = Query(None, description="Comma-separated, e.g. 50,90,95")
+):
+    """
+    Estimated damage cost distribution per room: count, total, mean, min/max and percentiles.
+    """
+    try:
+        parsed = _parse_percentiles(percentiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _analytics(damage_costs, since=since, until=until, room_number=room_number, percentiles=parsed)
+
+
+@router.get("/analytics/status")
+async def analytics_status():
+    """
+    Whether analytics are available, and the size and age of this worker's snapshot.
+    """
+    return get_analytics_status()
+
+
+@router.post("/analytics/refresh")
+async def analytics_refresh():
+    """
+    Reload the analytics snapshot from storage now.
+    """
+    try:
+        return await run_blocking(refresh_analytics)
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to refresh analytics: {str(e)}")
+
+# -------------------------
+# POST: Bulk Import (CSV / NDJSON)
+# -------------------------
+def _bulk_import(file: UploadFile, fmt: Optional[str], kind: str):
+    try:
+        fmt = detect_format(file.filename, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    print(f"📥 Bulk importing {kind} from {file.filename} ({fmt})")
+    # Per-row results stream back as NDJSON while the upload is still being read
+    return StreamingResponse(
+        import_records(file.file, fmt, kind),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/import/exit-requests")
+async def bulk_import_exit_requests(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson (default: from file extension)")
+):
+    """
+    Bulk-create exit requests. Rows follow ExitRequestImport; CSV checklists are ';'-separated.
+    """
+    return _bulk_import(file, format, "exit_requests")
+
+
+@router.post("/import/damage-reports")
+async def bulk_import_damage_reports(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson (default: from file extension)")
+):
+    """
+    Bulk-create damage reports. Rows follow DamageReportImport; CSV damaged_items is a JSON list.
+    """
+    return _bulk_import(file, format, "damage_reports")
+
+# -------------------------
+# GET: Portfolio-Wide Exports (CSV / NDJSON)
 # -------------------------
-@router.get("/export/pdf")
-async def export_exit_report_pdf():
+async def _export(request: Request, collection: str, fmt: Optional[str], tenant_id: Optional[str], fields: Optional[str], view: str):
+    # Weak ETag: the export is equivalent, not byte-for-byte guaranteed, for a given version
+    etag, not_modified = await conditional_get(request, collection, weak=True)
+    if not_modified:
+        return not_modified
     try:
-        # Placeholder for future PDF report feature
-        # Example: generate_pdf_report(get_all_exit_requests())
-        return {"message": "PDF export feature coming soon."}
+        fmt = detect_export_format(fmt)
+        chunks = await open_export(collection, fmt, tenant_id=tenant_id, fields=parse_fields(fields, view), allow_empty=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Failed to generate PDF")
+        print(f"❌ Error starting {collection} export:", e)
+        raise HTTPException(status_code=500, detail=f"Failed to export {collection}")
+
+    print(f"📤 Exporting {collection} ({fmt}, tenant={tenant_id or 'all'})")
+    # Pages are read and encoded as the client downloads, so memory stays flat
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f"attachment; filename={export_filename(collection, fmt, tenant_id)}",
+            **cache_headers(etag)
+        }
+    )
+
+
+@router.get("/export/exit-requests")
+async def export_exit_requests(
+    request: Request,
+    format: str = Query("csv", description="csv or ndjson"),
+    tenant_id: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
+    """
+    Stream every exit request (or one tenant's) as CSV or NDJSON.
+    """
+    return await _export(request, "exit_requests", format, tenant_id, fields, "exit_admin")
+
+
+@router.get("/export/damage-reports")
+async def export_damage_reports(
+    request: Request,
+    format: str = Query("csv", description="csv or ndjson"),
+    tenant_id: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
+    """
+    Stream every damage report (or one tenant's) as CSV or NDJSON.
+    """
+    return await _export(request, "damage_reports", format, tenant_id, fields, "damage")
+
+# -------------------------
+# Background Export Jobs (PDF / CSV → S3)
+# -------------------------
+EXPORT_JOB_VIEWS = {"exit_requests": "exit_admin", "damage_reports": "damage"}
+
+
+class ExportJobRequest(BaseModel):
+    report: str = Field("exit_requests", description="exit_requests or damage_reports")
+    format: str = Field("pdf", description="pdf or csv")
+    status: Optional[str] = None
+    tenant_id: Optional[str] = None
+    room_number: Optional[str] = None
+    fields: Optional[str] = Field(None, description="Comma-separated attributes, or 'summary'")
+
+
+def _submit_export_job(job: ExportJobRequest) -> dict:
+    if job.report not in EXPORT_JOB_VIEWS:
+        raise HTTPException(status_code=400, detail=f"Unknown report '{job.report}'. Available: {sorted(EXPORT_JOB_VIEWS)}")
+    if job.status and job.status not in VALID_EXIT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status '{job.status}'. Allowed: {sorted(VALID_EXIT_STATUSES)}")
+    try:
+        submitted = submit_export_job(
+            job.report,
+            job.format,
+            filters={"status": job.status, "tenant_id": job.tenant_id, "room_number": job.room_number},
+            fields=parse_fields(job.fields, EXPORT_JOB_VIEWS[job.report])
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"🧾 Export job {submitted['job_id']} ({job.report}, {submitted['format']}) reused={submitted['reused']}")
+    return submitted
+
+
+@router.post("/export/jobs", status_code=202)
+async def create_export_job(job: ExportJobRequest):
+    """
+    Queue a PDF/CSV report. Poll GET /admin/export/jobs/{job_id} for progress and,
+    once completed, a presigned download_url. Identical requests within the cache
+    window return the existing job.
+    """
+    return _submit_export_job(job)
+
+
+@router.get("/export/jobs/{job_id}")
+async def export_job_status(job_id: str):
+    """
+    Progress of an export job; includes download_url when completed.
+    """
+    try:
+        job = await run_blocking(get_export_job, job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read export job: {str(e)}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+# -------------------------
+# GET: Export PDF Report
+# -------------------------
+@router.get("/export/pdf", status_code=202)
+async def export_exit_report_pdf(
+    status: Optional[str] = Query(None),
+    tenant_id: Optional[str] = Query(None),
+    room_number: Optional[str] = Query(None)
+):
+    """
+    Start a PDF report of exit requests (same filters as /admin/exit-requests).
+    Returns the export job to poll.
+    """
+    return _submit_export_job(ExportJobRequest(
+        report="exit_requests",
+        format="pdf",
+        status=status,
+        tenant_id=tenant_id,
+        room_number=room_number
+    ))
@@ -0,0 +1,518 @@
+import threading
+import time
+from datetime import datetime, timezone, date
+from app.config.settings import settings
+from app.services.event_bus import event_bus
+from app.services.db_service import iter_exit_request_pages, iter_damage_report_pages
+
+# -----------------------------
+# Snapshot Columns
+# "time" columns hold UTC epoch seconds (NaN when missing), "number" columns
+# floats (NaN when missing), "category" columns int32 codes into a label list
+# (-1 when missing). Exit reasons are free text: they are grouped by their
+# lowercased, whitespace-collapsed form.
+# -----------------------------
+EXIT_COLUMNS = {
+    "submitted_at": "time",
+    "exit_date": "time",
+    "status_updated_at": "time",
+    "request_status": "category",
+    "exit_reason": "category",
+    "room_number": "category",
+}
+DAMAGE_COLUMNS = {
+    "reported_at": "time",
+    "estimated_cost": "number",
+    "room_number": "category",
+}
+
+# Statuses that end a request's review, for turnaround times
+DECIDED_STATUSES = ("Approved", "Rejected")
+
+DEFAULT_PERCENTILES = (50, 90, 95)
+PAGE_SCAN_SIZE = 500
+INITIAL_CAPACITY = 1024
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """
+    NumPy is not installed, analytics are disabled, or the first snapshot is still loading.
+    """
+
+
+# =====================================================
+#                NUMPY (OPTIONAL)
+# Imported on first use; without it the analytics endpoints answer 503 and
+# nothing else changes.
+# =====================================================
+
+_np = None
+_available = None
+
+
+def analytics_available() -> bool:
+    global _np, _available
+    if _available is None:
+        _available = False
+        if settings.ANALYTICS_ENABLED:
+            try:
+                import numpy
+                _np = numpy
+                _available = True
+            except ImportError:
+                print("⚠️ NumPy is not installed; analytics are disabled")
+    return _available
+
+
+def _timestamp(value) -> float:
+    """
+    ISO date/datetime (naive = UTC) → epoch seconds; NaN when missing or unparsable.
+    """
+    if value is None or value == "":
+        return float("nan")
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return float("nan")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _category(name: str, value):
+    if value is None or value == "":
+        return None
+    value = str(value)
+    return " ".join(value.lower().split()) if name == "exit_reason" else value
+
+
+def _iso_day(seconds) -> str:
+    return datetime.fromtimestamp(int(seconds), tz=timezone.utc).date().isoformat()
+
+# =====================================================
+#                COLUMN TABLE
+# One growable NumPy array per column (capacity doubles), rows addressed by
+# item id so an update rewrites its row in place.
+# =====================================================
+
+class ColumnTable:
+    def __init__(self, columns: dict, capacity: int = INITIAL_CAPACITY):
+        self.columns = columns
+        self.size = 0
+        self.rows = {}                                              # item id → row
+        self.labels = {name: [] for name, kind in columns.items() if kind == "category"}
+        self.codes = {name: {} for name in self.labels}             # label → code
+        self.arrays = {name: self._empty(kind, capacity) for name, kind in columns.items()}
+
+    @staticmethod
+    def _empty(kind: str, capacity: int):
+        if kind == "category":
+            return _np.full(capacity, -1, dtype=_np.int32)
+        return _np.full(capacity, _np.nan, dtype=_np.float64)
+
+    def _grow(self):
+        capacity = len(next(iter(self.arrays.values()))) * 2
+        for name, kind in self.columns.items():
+            grown = self._empty(kind, capacity)
+            grown[:self.size] = self.arrays[name][:self.size]
+            self.arrays[name] = grown
+
+    def code(self, name: str, label) -> int:
+        """
+        The code of a category label; -2 (matching no row, not even the
+        missing ones) for labels never seen.
+        """
+        return self.codes[name].get(_category(name, label), -2)
+
+    def _encode(self, name: str, value):
+        kind = self.columns[name]
+        if kind == "time":
+            return _timestamp(value)
+        if kind == "number":
+            return _number(value)
+        label = _category(name, value)
+        if label is None:
+            return -1
+        codes = self.codes[name]
+        if label not in codes:
+            codes[label] = len(self.labels[name])
+            self.labels[name].append(label)
+        return codes[label]
+
+    def upsert(self, key: str, item: dict, partial: bool = False) -> bool:
+        """
+        Write an item's columns into its row (a new row for new ids). With
+        partial=True only the columns present in `item` change, and unknown ids
+        are ignored. Returns whether a row was written.
+        """
+        row = self.rows.get(key)
+        if row is None:
+            if partial:
+                return False
+            if self.size == len(next(iter(self.arrays.values()))):
+                self._grow()
+            row = self.rows[key] = self.size
+            self.size += 1
+        for name in self.columns:
+            if name in item:
+                self.arrays[name][row] = self._encode(name, item[name])
+        return True
+
+    def column(self, name: str):
+        return self.arrays[name][:self.size]
+
+# =====================================================
+#                VECTORIZED QUERIES
+# =====================================================
+
+def _window(times, since=None, until=None):
+    mask = ~_np.isnan(times)
+    if since:
+        mask &= times >= _timestamp(since)
+    if until:
+        # `until` is inclusive of the whole day
+        mask &= times < _timestamp(until) + SECONDS_PER_DAY
+    return mask
+
+
+def _week_starts(times):
+    # Epoch day 0 was a Thursday; shift so weeks start on Monday
+    days = _np.floor(times / SECONDS_PER_DAY).astype(_np.int64)
+    return days - (days + 3) % 7
+
+
+def _check_percentiles(percentiles) -> list:
+    percentiles = list(percentiles or DEFAULT_PERCENTILES)
+    if any(not 0 <= q <= 100 for q in percentiles):
+        raise ValueError("Percentiles must be between 0 and 100")
+    return percentiles
+
+
+def grouped_stats(groups, values, percentiles) -> dict:
+    """
+    Count, sum, min, max and linear-interpolated percentiles of `values` per
+    group code, without a Python loop over groups: values are sorted within
+    groups once and every percentile is read at its interpolated position.
+    """
+    order = _np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    keys, starts, counts = _np.unique(groups, return_index=True, return_counts=True)
+    if not len(keys):
+        return {"keys": keys, "count": counts, "sum": values, "min": values, "max": values, "percentiles": _np.empty((0, len(percentiles)))}
+    positions = starts[:, None] + _np.asarray(percentiles, dtype=_np.float64)[None, :] / 100 * (counts[:, None] - 1)
+    low = _np.floor(positions).astype(_np.int64)
+    high = _np.ceil(positions).astype(_np.int64)
+    return {
+        "keys": keys,
+        "count": counts,
+        "sum": _np.add.reduceat(values, starts),
+        "min": values[starts],
+        "max": values[starts + counts - 1],
+        "percentiles": values[low] + (values[high] - values[low]) * (positions - low),
+    }
+
+
+def _summary(stats: dict, index: int, percentiles: list, scale: float = 1.0) -> dict:
+    count = int(stats["count"][index])
+    return {
+        "count": count,
+        "total": round(float(stats["sum"][index]) / scale, 2),
+        "mean": round(float(stats["sum"][index]) / count / scale, 2),
+        "min": round(float(stats["min"][index]) / scale, 2),
+        "max": round(float(stats["max"][index]) / scale, 2),
+        "percentiles": {f"p{q:g}": round(float(value) / scale, 2) for q, value in zip(percentiles, stats["percentiles"][index])},
+    }
+
+
+class AnalyticsSnapshot:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.exits = ColumnTable(EXIT_COLUMNS)
+        self.damages = ColumnTable(DAMAGE_COLUMNS)
+        self.updated_at = None
+
+    def replace_with(self, other: "AnalyticsSnapshot"):
+        with self._lock:
+            self.exits, self.damages = other.exits, other.damages
+            self.updated_at = time.time()
+
+    def apply(self, table: str, key: str, item: dict, partial: bool = False):
+        with self._lock:
+            if getattr(self, table).upsert(key, item, partial=partial):
+                self.updated_at = time.time()
+
+    def exits_per_week(self, date_field: str = "exit_date", since=None, until=None, status: str = None, top: int = 10) -> dict:
+        """
+        Exit requests per Monday-starting week of `date_field`, split by exit
+        reason. The `top` most common reasons are kept; the rest count as "other".
+        """
+        if date_field not in ("exit_date", "submitted_at"):
+            raise ValueError("date_field must be 'exit_date' or 'submitted_at'")
+        with self._lock:
+            exits = self.exits
+            mask = _window(exits.column(date_field), since, until)
+            if status:
+                mask &= exits.column("request_status") == exits.code("request_status", status)
+            weeks = _week_starts(exits.column(date_field)[mask])
+            reasons = exits.column("exit_reason")[mask]
+            labels = list(exits.labels["exit_reason"])
+
+        codes, counts = _np.unique(reasons[reasons >= 0], return_counts=True)
+        kept = codes[_np.argsort(-counts, kind="stable")][:max(top, 0)]
+        names = [labels[code] for code in kept] + ["other", "unspecified"]
+        # Kept reasons → 0..len(kept)-1, other → len(kept), missing → len(kept)+1
+        lookup = _np.full(len(labels) + 1, len(kept), dtype=_np.int64)
+        lookup[kept] = _np.arange(len(kept))
+        lookup[-1] = len(kept) + 1
+        columns = lookup[reasons]
+
+        week_keys, rows = _np.unique(weeks, return_inverse=True)
+        matrix = _np.zeros((len(week_keys), len(names)), dtype=_np.int64)
+        _np.add.at(matrix, (rows, columns), 1)
+        totals = matrix.sum(axis=0)
+        return {
+            "date_field": date_field,
+            "total": int(totals.sum()),
+            "reasons": {name: int(total) for name, total in zip(names, totals) if total},
+            "weeks": [
+                {
+                    "week_start": _iso_day(week * SECONDS_PER_DAY),
+                    "total": int(matrix[index].sum()),
+                    "by_reason": {name: int(count) for name, count in zip(names, matrix[index]) if count},
+                }
+                for index, week in enumerate(week_keys)
+            ],
+        }
+
+    def approval_turnaround(self, since=None, until=None, room_number: str = None, percentiles=None) -> dict:
+        """
+        Hours from submitted_at to the decision (status_updated_at) for decided
+        requests, per final status and per week of submission. Requests decided
+        before status changes were timestamped are not counted.
+        """
+        percentiles = _check_percentiles(percentiles)
+        with self._lock:
+            exits = self.exits
+            submitted = exits.column("submitted_at")
+            decided = exits.column("status_updated_at")
+            statuses = exits.column("request_status")
+            mask = _window(submitted, since, until) & ~_np.isnan(decided) & (decided >= submitted)
+            mask &= _np.isin(statuses, [exits.code("request_status", status) for status in DECIDED_STATUSES])
+            if room_number:
+                mask &= exits.column("room_number") == exits.code("room_number", room_number)
+            seconds = (decided - submitted)[mask]
+            statuses = statuses[mask]
+            weeks = _week_starts(submitted[mask])
+            status_labels = list(exits.labels["request_status"])
+
+        overall = grouped_stats(_np.zeros(len(seconds), dtype=_np.int64), seconds, percentiles)
+        by_status = grouped_stats(statuses, seconds, percentiles)
+        by_week = grouped_stats(weeks, seconds, percentiles)
+        return {
+            "unit": "hours",
+            "overall": _summary(overall, 0, percentiles, SECONDS_PER_HOUR) if len(overall["keys"]) else {"count": 0},
+            "by_status": {
+                status_labels[code]: _summary(by_status, index, percentiles, SECONDS_PER_HOUR)
+                for index, code in enumerate(by_status["keys"])
+            },
+            "by_week": [
+                dict(_summary(by_week, index, percentiles, SECONDS_PER_HOUR), week_start=_iso_day(week * SECONDS_PER_DAY))
+                for index, week in enumerate(by_week["keys"])
+            ],
+        }
+
+    def damage_costs(self, since=None, until=None, room_number: str = None, percentiles=None) -> dict:
+        """
+        Distribution of estimated_cost per room: count, total, mean, min/max and percentiles.
+        """
+        percentiles = _check_percentiles(percentiles)
+        with self._lock:
+            damages = self.damages
+            costs = damages.column("estimated_cost")
+            mask = ~_np.isnan(costs)
+            if since or until:
+                mask &= _window(damages.column("reported_at"), since, until)
+            if room_number:
+                mask &= damages.column("room_number") == damages.code("room_number", room_number)
+            costs = costs[mask]
+            rooms = damages.column("room_number")[mask]
+            room_labels = list(damages.labels["room_number"]) + ["unspecified"]
+
+        overall = grouped_stats(_np.zeros(len(costs), dtype=_np.int64), costs, percentiles)
+        by_room = grouped_stats(rooms, costs, percentiles)
+        return {
+            "overall": _summary(overall, 0, percentiles) if len(overall["keys"]) else {"count": 0},
+            "by_room": {
+                room_labels[code]: _summary(by_room, index, percentiles)
+                for index, code in enumerate(by_room["keys"])
+            },
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"exit_requests": self.exits.size, "damage_reports": self.damages.size}
+
+# =====================================================
+#                LIFECYCLE
+# Loaded once from storage in the background, then kept current from the
+# event bus (creates, status changes, field updates). Bulk imports and other
+# workers' writes arrive with the next full reload: after a bulk import and
+# every ANALYTICS_REFRESH_SECONDS.
+# =====================================================
+
+_snapshot = None
+_state = {"status": "disabled", "loaded_at": None, "stale": False}
+_stop = threading.Event()
+_thread = None
+_building = None
+
+EVENT_TABLES = {"exit_request": ("exits", "request_id"), "damage_report": ("damages", "report_id")}
+
+
+def _on_event(event: dict):
+    target = EVENT_TABLES.get(event["topic"])
+    if target is None:
+        return
+    if event["key"] is None:
+        # Bulk imports publish a count, not the rows
+        _state["stale"] = True
+        return
+    table, _ = target
+    change = event["type"].split(".", 1)[1]
+    item = dict(event["data"])
+    if change == "status_changed":
+        if item.get("previous_status") == item.get("request_status"):
+            # Nothing changed; keep the original decision time
+            return
+        item.setdefault("status_updated_at", event["at"])
+    for snapshot in (_snapshot, _building):
+        if snapshot is not None:
+            snapshot.apply(table, event["key"], item, partial=change != "created")
+
+
+def refresh_analytics() -> dict:
+    """
+    Reload the snapshot from storage (only the snapshot columns are read).
+    """
+    global _snapshot, _building
+    if not analytics_available():
+        raise AnalyticsUnavailable("Analytics need NumPy (and ANALYTICS_ENABLED)")
+    started = time.perf_counter()
+    _state["stale"] = False
+    if _snapshot is None:
+        _snapshot = AnalyticsSnapshot()
+    # Writes made during the scan go to both snapshots, so the swap loses none of them
+    fresh = _building = AnalyticsSnapshot()
+    try:
+        for pages, table, key, columns in (
+            (iter_exit_request_pages, "exits", "request_id", EXIT_COLUMNS),
+            (iter_damage_report_pages, "damages", "report_id", DAMAGE_COLUMNS),
+        ):
+            for page in pages(page_size=PAGE_SCAN_SIZE, fields=[key, *columns]):
+                for item in page:
+                    fresh.apply(table, item[key], item)
+    finally:
+        _building = None
+    _snapshot.replace_with(fresh)
+    _state.update(status="ready", loaded_at=time.time())
+    return {**_snapshot.stats(), "seconds": round(time.perf_counter() - started, 3)}
+
+
+def _maintain():
+    last_refresh = time.monotonic()
+    while not _stop.wait(1.0):
+        refresh_every = settings.ANALYTICS_REFRESH_SECONDS
+        due = refresh_every and time.monotonic() - last_refresh >= refresh_every
+        if not (due or _state["stale"]):
+            continue
+        try:
+            refresh_analytics()
+        except Exception as e:
+            print("❌ Analytics refresh failed:", e)
+        last_refresh = time.monotonic()
+
+
+def start_analytics():
+    """
+    App startup: follow writes and load the first snapshot in the background.
+    Does nothing when NumPy is missing or analytics are disabled.
+    """
+    global _snapshot, _thread
+    if not analytics_available():
+        return
+    _snapshot = AnalyticsSnapshot()
+    _state["status"] = "loading"
+    event_bus.add_listener(_on_event)
+
+    def run():
+        try:
+            print(f"📊 Analytics snapshot loaded: {refresh_analytics()}")
+        except Exception as e:
+            _state["status"] = "failed"
+            print("❌ Analytics snapshot failed to load:", e)
+        _maintain()
+
+    _stop.clear()
+    _thread = threading.Thread(target=run, name="analytics", daemon=True)
+    _thread.start()
+
+
+def stop_analytics():
+    global _thread
+    _stop.set()
+    event_bus.remove_listener(_on_event)
+    _thread = None
+
+# =====================================================
+#                QUERIES
+# =====================================================
+
+def _ready() -> AnalyticsSnapshot:
+    if not analytics_available():
+        raise AnalyticsUnavailable("Analytics need NumPy (and ANALYTICS_ENABLED)")
+    if _snapshot is None or _state["status"] != "ready":
+        raise AnalyticsUnavailable(f"Analytics snapshot is {_state['status']}")
+    return _snapshot
+
+
+def _result(snapshot: AnalyticsSnapshot, data: dict) -> dict:
+    as_of = snapshot.updated_at
+    return dict(data, as_of=datetime.fromtimestamp(as_of, tz=timezone.utc).isoformat() if as_of else None)
+
+
+def exits_per_week(**filters) -> dict:
+    snapshot = _ready()
+    return _result(snapshot, snapshot.exits_per_week(**filters))
+
+
+def approval_turnaround(**filters) -> dict:
+    snapshot = _ready()
+    return _result(snapshot, snapshot.approval_turnaround(**filters))
+
+
+def damage_costs(**filters) -> dict:
+    snapshot = _ready()
+    return _result(snapshot, snapshot.damage_costs(**filters))
+
+
+def get_analytics_status() -> dict:
+    loaded_at = _state["loaded_at"]
+    return {
+        "available": analytics_available(),
+        "status": _state["status"],
+        "stale": _state["stale"],
+        "loaded_at": datetime.fromtimestamp(loaded_at, tz=timezone.utc).isoformat() if loaded_at else None,
+        **(_snapshot.stats() if _snapshot is not None else {}),
+    }
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config.settings import settings
+
+# -----------------------------
+# Bounded AWS I/O Executor
+# boto3 is blocking; running its calls here keeps the event loop free while
+# capping how many AWS calls a single worker keeps in flight.
+# -----------------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Lazily create the shared executor sized by settings.AWS_IO_MAX_WORKERS.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.AWS_IO_MAX_WORKERS,
+                    thread_name_prefix="aws-io"
+                )
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking callable on the AWS I/O executor and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def awaitable(func):
+    """
+    Turn a blocking service function into a coroutine function with the same signature.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(func, *args, **kwargs)
+    return wrapper
+
+
+def shutdown_executor():
+    """
+    Stop the executor on app shutdown (waits for in-flight AWS calls).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
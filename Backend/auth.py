@@ -12,7 +12,8 @@ router = APIRouter(tags=["Authentication"])
 users_db: Dict[str, Dict[str, str]] = {
     "admin1": {"password": "adminpass", "role": "admin"},
     "tenant1": {"password": "tenantpass", "role": "tenant"},
-    "landlord1": {"password": "landlordpass", "role": "landlord"},
+    # landlord_id selects the landlord views; "default" owns requests that name no landlord
+    "landlord1": {"password": "landlordpass", "role": "landlord", "landlord_id": "default"},
     # ➕ Add more users as needed
 }
 
@@ -39,6 +40,8 @@ async def login(request: Request, creds: LoginRequest):
     # Store user session info
     request.session["username"] = username
     request.session["role"] = user["role"]
+    if user.get("landlord_id"):
+        request.session["landlord_id"] = user["landlord_id"]
 
     return JSONResponse(content={
         "message": "Login successful",
@@ -0,0 +1,99 @@
+import threading
+from app.config.settings import settings
+
+# -----------------------------
+# Shared AWS Clients
+# One boto3 session, and one client/resource per service, built on first use
+# and shared by every module. Nothing here talks to AWS (or even imports boto3)
+# until a service is actually needed, so the app starts without credentials.
+# boto3 clients are thread-safe once built; only creation is serialized.
+# -----------------------------
+_session = None
+_clients = {}
+_resources = {}
+_lock = threading.RLock()
+
+
+def client_config():
+    """
+    botocore Config from Settings: connection pool size, TCP keepalive, retries and timeouts.
+    """
+    from botocore.config import Config
+
+    return Config(
+        region_name=settings.clean_region,
+        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=settings.AWS_TCP_KEEPALIVE,
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT,
+        read_timeout=settings.AWS_READ_TIMEOUT,
+        retries={"mode": settings.AWS_RETRY_MODE, "max_attempts": settings.AWS_MAX_ATTEMPTS}
+    )
+
+
+def endpoint_url(service: str):
+    """
+    Endpoint override for `service` (e.g. DynamoDB Local, LocalStack), or None for AWS.
+    """
+    return settings.AWS_ENDPOINT_OVERRIDES.get(service) or settings.AWS_ENDPOINT_URL or None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import boto3
+
+                _session = boto3.session.Session(
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.clean_region
+                )
+    return _session
+
+
+def get_client(service: str):
+    """
+    The shared low-level client for `service` ('s3', 'ses', 'dynamodb', ...).
+    """
+    client = _clients.get(service)
+    if client is None:
+        with _lock:
+            client = _clients.get(service)
+            if client is None:
+                client = get_session().client(
+                    service,
+                    config=client_config(),
+                    endpoint_url=endpoint_url(service)
+                )
+                _clients[service] = client
+    return client
+
+
+def get_resource(service: str):
+    """
+    The shared boto3 resource for `service` (DynamoDB tables and batch helpers).
+    """
+    resource = _resources.get(service)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service)
+            if resource is None:
+                resource = get_session().resource(
+                    service,
+                    config=client_config(),
+                    endpoint_url=endpoint_url(service)
+                )
+                _resources[service] = resource
+    return resource
+
+
+def reset_clients():
+    """
+    Drop every cached client (e.g. after changing credentials or endpoints).
+    """
+    global _session
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _session = None
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by CacheBackend.get on a miss (None is a valid cached value)
+MISS = object()
+
+# -----------------------------
+# Backend Interface
+# -----------------------------
+
+class CacheBackend:
+    """
+    Interface for read-through cache stores. The in-process backend below is the
+    default; a shared store (e.g. Redis) only needs to implement these methods
+    and be registered with register_cache_backend.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, read_started: float = None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+# -----------------------------
+# In-Process TTL + LRU Backend
+# -----------------------------
+
+class InMemoryTTLCache(CacheBackend):
+    """
+    Thread-safe LRU cache whose entries also expire after ttl_seconds.
+
+    set() accepts the monotonic time the caller started its read: if the key was
+    invalidated after that moment, the (possibly stale) value is dropped instead
+    of being cached.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()       # key -> (expires_at, value)
+        self._invalidated = OrderedDict()   # key -> monotonic time of last delete
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return MISS
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key, value, read_started: float = None):
+        with self._lock:
+            invalidated_at = self._invalidated.get(key)
+            if read_started is not None and invalidated_at is not None and invalidated_at >= read_started:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._invalidated[key] = time.monotonic()
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                self._invalidated.popitem(last=False)
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidated.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0
+            }
+
+# -----------------------------
+# Backend Registry
+# -----------------------------
+
+_BACKENDS = {
+    "memory": InMemoryTTLCache,
+}
+
+
+def register_cache_backend(name: str, factory):
+    """
+    Make a backend selectable by name (factory receives max_entries, ttl_seconds).
+    """
+    _BACKENDS[name] = factory
+
+
+def build_cache_backend(name: str, max_entries: int, ttl_seconds: float) -> CacheBackend:
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown cache backend '{name}'. Available: {sorted(_BACKENDS)}")
+    return _BACKENDS[name](max_entries=max_entries, ttl_seconds=ttl_seconds)
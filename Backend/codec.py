@@ -0,0 +1,78 @@
+import json
+from decimal import Decimal
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+# =====================================================
+#                DYNAMODB VALUE CODEC
+# DynamoDB rejects Python floats and hands numbers back as Decimal. These walk
+# an item once and convert every nested value, not just the top-level fields.
+# =====================================================
+
+def to_dynamo(value):
+    """
+    Write path: return a copy of `value` with every float (at any depth) as a Decimal.
+    """
+    if isinstance(value, float):
+        # str() keeps the short repr (12.5, not 12.4999999...)
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {key: to_dynamo(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamo(item) for item in value]
+    return value
+
+
+def _plain_number(value: Decimal):
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def from_dynamo(value):
+    """
+    Read path: return a copy of `value` with every Decimal as an int or float and
+    every set as a list, i.e. plain JSON-compatible Python values.
+    """
+    if isinstance(value, Decimal):
+        return _plain_number(value)
+    if isinstance(value, dict):
+        return {key: from_dynamo(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [from_dynamo(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """
+    `default=` hook for json.dumps/orjson.dumps: serializes Decimals (and DynamoDB
+    string/number sets) directly, so items never need a from_dynamo pass first.
+    """
+    if isinstance(value, Decimal):
+        return _plain_number(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """
+    Encode `value` as compact UTF-8 JSON, via orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# -----------------------------
+# Response Class
+# Registered app-wide in main.py. Routes returning large item lists hand their
+# payload straight to it, which skips FastAPI's jsonable_encoder walk.
+# -----------------------------
+
+class DecimalJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,65 @@
+import csv
+import io
+from decimal import Decimal
+from app.services.codec import dumps, from_dynamo
+
+# Rows buffered before a chunk is yielded to the response
+CSV_CHUNK_ROWS = 500
+
+# =====================================================
+#                CSV EXPORT
+# Plain `csv` writer instead of pandas: no DataFrame copy of the items, and
+# nothing heavy to import when the app starts.
+# =====================================================
+
+def infer_columns(items, preferred: list = None) -> list:
+    """
+    Union of the attribute names across `items`, in first-seen order.
+    Names in `preferred` come first (when any item has them).
+    """
+    seen = {}
+    for item in items:
+        for name in item:
+            seen.setdefault(name, None)
+    leading = [name for name in (preferred or []) if name in seen]
+    return leading + [name for name in seen if name not in leading]
+
+
+def format_cell(value):
+    """
+    One CSV cell: lists of plain values are ';'-joined (the bulk import format),
+    nested maps/lists become JSON, numbers lose their Decimal wrapper.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return from_dynamo(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if all(isinstance(entry, (str, int, float, Decimal)) for entry in value):
+            return ";".join(str(from_dynamo(entry)) for entry in value)
+        return dumps(value).decode("utf-8")
+    if isinstance(value, dict):
+        return dumps(value).decode("utf-8")
+    return value
+
+
+def iter_csv(items, columns: list, header: bool = True, chunk_rows: int = CSV_CHUNK_ROWS):
+    """
+    Yield CSV text for `items` in chunks of about `chunk_rows` rows.
+    Attributes not in `columns` are dropped; missing ones are left empty.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    rows = 0
+    for item in items:
+        writer.writerow([format_cell(item.get(name)) for name in columns])
+        rows += 1
+        if rows >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
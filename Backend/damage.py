@@ -1,31 +1,28 @@
 # app/routers/damage.py
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 from fastapi import Request
-from typing import Optional, List
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from uuid import uuid4
 from datetime import datetime
 
-from app.services.db_service import create_damage_report, get_damage_reports_by_tenant
-from app.services.s3_service import upload_file_to_s3
-from app.services.email_service import send_email
+from app.services.db_service import (
+    create_damage_report_async,
+    get_damage_reports_by_tenant_async,
+    update_damage_report_data,
+    parse_fields
+)
+from app.services.s3_service import upload_file_to_s3_async, resolve_content_type, UploadRejected
+from app.services.image_pipeline import schedule_derivatives
+from app.services.email_outbox import enqueue_email_async
+from app.services.email_templates import render_email
+from app.services.codec import DecimalJSONResponse
+from app.services.etag import conditional_get, cache_headers
+from app.services.export_service import detect_export_format, open_export, EXPORT_FORMATS
 
 router = APIRouter(tags=["Damage Reports"])  # Prefix handled in main.py
 
-# -----------------------------
-# Pydantic model for damaged items
-# -----------------------------
-class DamageItem(BaseModel):
-    item: str
-    price: float
-
-class DamageReport(BaseModel):
-    tenant_id: str
-    room_number: str
-    damaged_items: List[DamageItem]
-    total_estimated: float
-
 # -----------------------------
 # POST: Submit JSON-Based Damage Report (modern format)
 # -----------------------------
@@ -45,7 +42,7 @@ async def submit_damage_json(
 
         # Upload document to S3 if present
         if document:
-            document_url = upload_file_to_s3(document, folder="damage_docs")
+            document_url = await upload_file_to_s3_async(document, folder="damage_docs")
 
         damage_data = {
             "report_id": report_id,
@@ -58,24 +55,28 @@ async def submit_damage_json(
         }
 
         # Save to DB
-        create_damage_report(damage_data)
+        await create_damage_report_async(damage_data)
+
+        # Photos get a thumbnail + web copy in the background, attached to the report when ready
+        if document_url:
+            schedule_derivatives(
+                document_url,
+                "damage_docs",
+                resolve_content_type(document.filename, document.content_type),
+                on_ready=lambda urls: update_damage_report_data(report_id, urls)
+            )
 
         # Optional: Email notification
         if notify_email:
-            send_email(
-                subject="Damage Report Submitted",
-                body=(
-                    f"Dear Tenant,\n\nYour damage report has been submitted.\n\n"
-                    f"Report ID: {report_id}\nEstimated Amount: ₹{body['total_estimated']}\n\nThank you."
-                ),
-                recipient=notify_email
-            )
+            await enqueue_email_async(recipient=notify_email, **render_email("damage_report_submitted", damage_data))
 
         return {
             "message": "Damage report submitted successfully",
             "report_id": report_id
         }
 
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting damage report: {str(e)}")
 
@@ -84,12 +85,59 @@ async def submit_damage_json(
 # GET: List Damage Reports by Tenant ID
 # -----------------------------
 @router.get("/list/{tenant_id}")
-async def list_damage_reports(tenant_id: str):
+async def list_damage_reports(
+    request: Request,
+    tenant_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
     """
-    Get all damage reports submitted by a specific tenant.
+    Get all damage reports submitted by a specific tenant (304 on a matching If-None-Match).
     """
     try:
-        records = get_damage_reports_by_tenant(tenant_id)
-        return records
+        etag, not_modified = await conditional_get(request, "damage_reports")
+        if not_modified:
+            return not_modified
+        records = await get_damage_reports_by_tenant_async(tenant_id, fields=parse_fields(fields, "damage"))
+        return DecimalJSONResponse(records, headers=cache_headers(etag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch damage reports: {str(e)}")
+
+# -----------------------------
+# GET: Download Damage Report Export by Tenant ID
+# -----------------------------
+@router.get("/report/{tenant_id}")
+async def generate_damage_report_export(
+    request: Request,
+    tenant_id: str,
+    format: str = Query("csv", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
+    """
+    Download all damage reports for a tenant (CSV or NDJSON), streamed page by page.
+    Weak ETag for conditional re-downloads.
+    """
+    try:
+        etag, not_modified = await conditional_get(request, "damage_reports", weak=True)
+        if not_modified:
+            return not_modified
+        fmt = detect_export_format(format)
+        chunks = await open_export("damage_reports", fmt, tenant_id=tenant_id, fields=parse_fields(fields, "damage"))
+        if chunks is None:
+            raise HTTPException(status_code=404, detail="No damage reports found.")
+
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_FORMATS[fmt],
+            headers={
+                "Content-Disposition": f"attachment; filename=damage_report_{tenant_id}.{fmt}",
+                **cache_headers(etag)
+            }
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate damage report export: {str(e)}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 class DamageReport(BaseModel):
@@ -9,3 +9,18 @@ class DamageReport(BaseModel):
     severity: str = Field(..., example="moderate")  # minor | moderate | severe
     estimated_cost: Decimal = Field(..., example=1500.00)
     photo_url: Optional[HttpUrl] = Field(None, example="https://s3.amazonaws.com/bucket/damage/photo.jpg")
+
+
+class DamageItem(BaseModel):
+    item: str = Field(..., example="Door")
+    price: float = Field(..., example=1200.00)
+
+
+class DamageReportImport(BaseModel):
+    """
+    One row of a bulk damage report import (CSV or NDJSON).
+    """
+    tenant_id: str = Field(..., example="T1001")
+    room_number: str = Field(..., example="101")
+    damaged_items: List[DamageItem]
+    total_estimated: float = Field(..., example=1200.00)
@@ -1,29 +1,248 @@
-import boto3
-from boto3.dynamodb.conditions import Key
-from decimal import Decimal
+import re
+import threading
+import time
+from collections import Counter
 from app.config.settings import settings
+from app.services.async_io import awaitable
+from app.services.cache import MISS, build_cache_backend
+from app.services.codec import to_dynamo
+from app.services.event_bus import publish_event
+from app.services.repository import (
+    get_repository,
+    project_items,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BATCH_WRITE_SIZE
+)
 
 # -----------------------------
-# Initialize DynamoDB Resource
+# Storage
+# Every read and write goes through the repository selected by
+# settings.STORAGE_BACKEND ("dynamodb" or "sqlite"); this module adds caching
+# and the request-level rules on top. Successful writes are published on the
+# in-process event bus for live dashboards.
 # -----------------------------
-dynamodb = boto3.resource(
-    'dynamodb',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
+VALID_EXIT_STATUSES = {"Pending", "Approved", "Rejected"}
+
+# =====================================================
+#                FIELD PROJECTIONS
+# =====================================================
+
+# Predefined "summary" projections: just what each table view renders
+SUMMARY_PROJECTIONS = {
+    "exit_admin": ["request_id", "tenant_id", "name", "room_number", "exit_reason", "request_status", "submitted_at"],
+    "exit_tenant": ["request_id", "room_number", "exit_reason", "request_status", "submitted_at", "supporting_document_url", "thumbnail_url"],
+    "damage": ["report_id", "tenant_id", "room_number", "estimated_cost", "reported_at", "document_url", "thumbnail_url"],
+}
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_fields(fields: str, view: str):
+    """
+    Turn a `fields=` query value into a list of attribute names.
+    None/empty means all attributes; "summary" selects the view's predefined projection.
+    Raises ValueError for names that aren't plain top-level attributes.
+    """
+    if not fields:
+        return None
+    if fields.strip() == "summary":
+        return list(SUMMARY_PROJECTIONS[view])
+
+    names = []
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if not _FIELD_NAME.match(name):
+            raise ValueError(f"Invalid field name '{name}'")
+        if name not in names:
+            names.append(name)
+    return names or None
+
+# =====================================================
+#                TENANT CACHE
+# Read-through cache for the per-tenant lookups, keyed by (collection, tenant_id).
+# Every write path below invalidates exactly the keys it affects: this worker's
+# entry is dropped and the tenant's stored version is bumped, which other
+# workers check before serving their entry (see _cached_tenant_read).
+# =====================================================
+
+EXIT_CACHE = "exit_requests"
+DAMAGE_CACHE = "damage_reports"
+
+tenant_cache = build_cache_backend(
+    settings.TENANT_CACHE_BACKEND,
+    max_entries=settings.TENANT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS
 )
 
-# -----------------------------
-# Table Names
-# -----------------------------
-EXIT_REQUEST_TABLE = "TenantExitRequests"
-DAMAGE_REPORT_TABLE = "TenantDamageReports"
 
-# -----------------------------
-# Table Objects
-# -----------------------------
-exit_table = dynamodb.Table(EXIT_REQUEST_TABLE)
-damage_table = dynamodb.Table(DAMAGE_REPORT_TABLE)
+def _tenant_entry_current(key: tuple, entry: tuple, version: str, check_started: float) -> bool:
+    """
+    Whether a cached entry may be served under collection version `version`.
+    Entries are (collection version last checked, tenant version at load, items).
+    """
+    checked_version, tenant_version, items = entry
+    if checked_version == version:
+        return True
+    if get_repository().get_tenant_version(*key) != tenant_version:
+        return False
+    # No write to this tenant since the load: re-stamp, so later hits skip the check
+    tenant_cache.set(key, (version, tenant_version, items), read_started=check_started)
+    return True
+
+
+def _cached_tenant_read(collection: str, tenant_id: str, loader, fields: list = None):
+    """
+    Serve a tenant's items from the cache, or load and cache them.
+    With `fields`, a cache hit is projected in memory; a miss is loaded with the
+    projection and not cached (partial items would poison later full reads).
+
+    Writes on other workers can't delete this worker's entries, so an entry
+    keeps the tenant's stored version read before its load. While the
+    collection version is unchanged, a hit costs no storage call. Once it has
+    moved (a write anywhere), the tenant's version is re-read once: the entry
+    survives writes to other tenants, and is reloaded after a write to this
+    tenant. The body is never older than the ETag version it is served under.
+    Returns a new list each time; the cached item dicts must not be mutated.
+    """
+    key = (collection, tenant_id)
+    try:
+        version = get_collection_version(collection)
+        check_started = time.monotonic()
+        cached = tenant_cache.get(key)
+        if cached is not MISS and not _tenant_entry_current(key, cached, version, check_started):
+            cached = MISS
+        tenant_version = None
+        if cached is MISS and not fields:
+            tenant_version = get_repository().get_tenant_version(collection, tenant_id)
+    except Exception as e:
+        print(f"⚠️ Could not check {collection} versions, reading {tenant_id} uncached:", e)
+        return loader(fields or None)
+
+    if cached is not MISS:
+        return project_items(list(cached[2]), fields)
+    if fields:
+        return loader(fields)
+
+    items = loader(None)
+    tenant_cache.set(key, (version, tenant_version, items), read_started=check_started)
+    return list(items)
+
+
+def invalidate_tenant_cache(collection: str, *tenant_ids):
+    """
+    Drop the tenants' entries here and bump their stored versions for other
+    workers. Call before bump_collection_version. Never raises.
+    """
+    for tenant_id in tenant_ids:
+        if tenant_id:
+            tenant_cache.delete((collection, tenant_id))
+            try:
+                get_repository().bump_tenant_version(collection, tenant_id)
+            except Exception as e:
+                print(f"⚠️ Failed to bump {collection} version of tenant {tenant_id}:", e)
+
+
+def get_cache_stats():
+    """
+    Hit/miss counters and size of the tenant cache.
+    """
+    return {"backend": settings.TENANT_CACHE_BACKEND, **tenant_cache.stats()}
+
+# =====================================================
+#                COLLECTION VERSIONS (ETags)
+# Every write bumps its collection's counter in the stats store. Readers use a
+# copy refreshed at most every ETAG_VERSION_TTL_SECONDS, so a conditional GET
+# normally costs no storage call; this worker's writes update the copy at
+# once, other workers' writes are seen within the TTL.
+# =====================================================
+
+_versions = {}
+_versions_read_at = None
+_versions_lock = threading.Lock()
+# Writes whose bump failed: folded into this worker's ETags so they can't match stale bodies
+_unversioned_writes = Counter()
+
+
+def _version_tag(collection: str) -> str:
+    version = str(_versions.get(collection, 0))
+    lost = _unversioned_writes[collection]
+    return f"{version}.{lost}" if lost else version
+
+
+def peek_collection_version(collection: str):
+    """
+    The cached version tag, or None when the copy is due for a refresh.
+    """
+    read_at = _versions_read_at
+    if read_at is None or time.monotonic() - read_at > settings.ETAG_VERSION_TTL_SECONDS:
+        return None
+    return _version_tag(collection)
+
+
+def get_collection_version(collection: str) -> str:
+    """
+    Version tag for a collection, refreshing the cached copy from storage when stale.
+    """
+    global _versions_read_at
+    tag = peek_collection_version(collection)
+    if tag is not None:
+        return tag
+    stored = get_repository().get_collection_versions()
+    with _versions_lock:
+        for name, value in stored.items():
+            # Never step back behind a bump this worker has already seen
+            _versions[name] = max(_versions.get(name, 0), value)
+        _versions_read_at = time.monotonic()
+        return _version_tag(collection)
+
+
+def bump_collection_version(collection: str):
+    """
+    Record a write. Never raises: the write itself already succeeded.
+    """
+    try:
+        value = get_repository().bump_collection_version(collection)
+        with _versions_lock:
+            _versions[collection] = max(_versions.get(collection, 0), value)
+    except Exception as e:
+        print(f"⚠️ Failed to bump {collection} version:", e)
+        with _versions_lock:
+            _unversioned_writes[collection] += 1
+
+# =====================================================
+#                STATUS COUNTERS
+# =====================================================
+
+def get_status_counters():
+    """
+    Read the materialized exit request counters (a single GetItem on DynamoDB).
+    """
+    try:
+        return get_repository().get_status_counters()
+    except Exception as e:
+        raise Exception(f"Failed to read status counters: {str(e)}")
+
+
+def rebuild_status_counters():
+    """
+    Recompute the counters from a (parallel, projected) scan of the exit requests and
+    overwrite the aggregate. Returns the previous and rebuilt values so drift can be
+    reported. Writes that land while the scan runs can be missed, so run it during a
+    quiet period.
+    """
+    try:
+        repository = get_repository()
+        before = repository.get_status_counters()
+        counts = Counter(
+            item.get("request_status")
+            for item in repository.iter_exit_requests(fields=["request_status"])
+        )
+        repository.replace_status_counters(counts)
+        return {"before": before, "after": repository.get_status_counters()}
+    except Exception as e:
+        raise Exception(f"Failed to rebuild status counters: {str(e)}")
 
 # =====================================================
 #                EXIT REQUEST FUNCTIONS
@@ -31,26 +250,32 @@ damage_table = dynamodb.Table(DAMAGE_REPORT_TABLE)
 
 def create_exit_request(data: dict):
     """
-    Save a new exit request in the DynamoDB table.
+    Save a new exit request.
     Supports checklist, supporting document, and exit date.
+    The item and its status counter increment are written in one transaction.
     """
     try:
-        return exit_table.put_item(Item=data)
+        data = to_dynamo(data)
+        response = get_repository().put_exit_request(data)
+        invalidate_tenant_cache(EXIT_CACHE, data.get("tenant_id"))
+        bump_collection_version(EXIT_CACHE)
+        publish_event("exit_request.created", data["request_id"], data, tenant_id=data.get("tenant_id"))
+        return response
     except Exception as e:
         raise Exception(f"Failed to save exit request: {str(e)}")
 
 
-def get_exit_requests_by_tenant(tenant_id: str):
+def get_exit_requests_by_tenant(tenant_id: str, fields: list = None):
     """
-    Fetch all exit requests for a given tenant_id.
-    Requires GSI: TenantId-index.
+    Fetch all exit requests for a given tenant_id (cached per tenant).
     """
     try:
-        response = exit_table.query(
-            IndexName="TenantId-index",
-            KeyConditionExpression=Key("tenant_id").eq(tenant_id)
+        return _cached_tenant_read(
+            EXIT_CACHE,
+            tenant_id,
+            lambda projection: get_repository().query_exit_requests_by_tenant(tenant_id, fields=projection),
+            fields
         )
-        return response.get("Items", [])
     except Exception as e:
         raise Exception(f"Error fetching tenant exit requests: {str(e)}")
 
@@ -58,92 +283,338 @@ def get_exit_requests_by_tenant(tenant_id: str):
 def update_exit_request_status(request_id: str, new_status: str):
     """
     Update the request_status of an exit request.
+
+    The status change and the counter move (old status -1, new status +1) are applied
+    atomically by the repository, so counters never drift. Setting the status a
+    request already has writes nothing, so it bumps no version and publishes no event.
     """
     try:
-        response = exit_table.update_item(
-            Key={"request_id": request_id},
-            UpdateExpression="SET request_status = :s",
-            ExpressionAttributeValues={":s": new_status},
-            ReturnValues="UPDATED_NEW"
+        previous = get_repository().update_exit_status(request_id, new_status)
+        if previous.get("request_status") == new_status:
+            return {"Attributes": {"request_status": new_status}}
+        invalidate_tenant_cache(EXIT_CACHE, previous.get("tenant_id"))
+        bump_collection_version(EXIT_CACHE)
+        publish_event(
+            "exit_request.status_changed",
+            request_id,
+            {"request_id": request_id, "request_status": new_status, "previous_status": previous.get("request_status")},
+            tenant_id=previous.get("tenant_id")
         )
-        return response
+        return {"Attributes": {"request_status": new_status}}
     except Exception as e:
         raise Exception(f"Failed to update request status: {str(e)}")
 
 
+def batch_update_exit_request_status(changes: dict) -> dict:
+    """
+    Apply many request_id -> new_status changes and return a per-request outcome.
+    """
+    outcomes = get_repository().batch_update_exit_status(changes)
+    touched = set()
+    for request_id, outcome in outcomes.items():
+        tenant_id = outcome.pop("tenant_id", None)
+        touched.add(tenant_id)
+        if outcome["status"] == "updated":
+            publish_event(
+                "exit_request.status_changed",
+                request_id,
+                {"request_id": request_id, "request_status": outcome["request_status"], "previous_status": outcome.get("previous_status")},
+                tenant_id=tenant_id
+            )
+    invalidate_tenant_cache(EXIT_CACHE, *touched)
+    if any(outcome["status"] == "updated" for outcome in outcomes.values()):
+        bump_collection_version(EXIT_CACHE)
+    return outcomes
+
+
 def update_exit_request_data(request_id: str, updates: dict):
     """
     Update multiple fields (notes, checklist, etc.) of an exit request.
     """
     try:
-        update_expr = []
-        expr_attrs = {}
-
-        for key, value in updates.items():
-            update_expr.append(f"{key} = :{key}")
-            expr_attrs[f":{key}"] = value
+        updates = to_dynamo(updates)
+        item = get_repository().update_exit_fields(request_id, updates)
+        invalidate_tenant_cache(EXIT_CACHE, item.get("tenant_id"))
+        bump_collection_version(EXIT_CACHE)
+        # Callers (and event subscribers) only see the updated fields
+        changed = {key: item[key] for key in updates if key in item}
+        publish_event("exit_request.updated", request_id, dict(changed, request_id=request_id), tenant_id=item.get("tenant_id"))
+        return {"Attributes": changed}
+    except Exception as e:
+        raise Exception(f"Failed to update exit request fields: {str(e)}")
 
-        update_string = "SET " + ", ".join(update_expr)
 
-        response = exit_table.update_item(
-            Key={"request_id": request_id},
-            UpdateExpression=update_string,
-            ExpressionAttributeValues=expr_attrs,
-            ReturnValues="UPDATED_NEW"
-        )
-        return response
+def get_exit_request(request_id: str):
+    """
+    One exit request by id, straight from storage (None if it doesn't exist).
+    """
+    try:
+        return get_repository().get_exit_request(request_id)
     except Exception as e:
-        raise Exception(f"Failed to update exit request fields: {str(e)}")
+        raise Exception(f"Error fetching exit request: {str(e)}")
 
 
 def get_all_exit_requests():
     """
-    Admin view: Get all exit requests (scan-based).
+    Get every exit request (parallel segmented scan on DynamoDB).
+    Prefer get_exit_requests_page / iter_exit_request_pages for admin views.
     """
     try:
-        response = exit_table.scan()
-        return response.get("Items", [])
+        return list(get_repository().iter_exit_requests())
     except Exception as e:
         raise Exception(f"Error fetching all exit requests: {str(e)}")
 
+
+def iter_all_exit_requests(total_segments: int = None, fields: list = None):
+    """
+    Stream every exit request without materializing the table.
+    """
+    try:
+        yield from get_repository().iter_exit_requests(fields=fields, total_segments=total_segments)
+    except Exception as e:
+        raise Exception(f"Error streaming exit requests: {str(e)}")
+
+
+def get_exit_requests_page(limit: int = None, next_token: str = None, fields: list = None):
+    """
+    Admin view: one page of exit requests plus an opaque next_token cursor.
+    """
+    return query_exit_requests(limit=limit, next_token=next_token, fields=fields)
+
+
+def query_exit_requests(
+    status: str = None,
+    tenant_id: str = None,
+    room_number: str = None,
+    limit: int = None,
+    next_token: str = None,
+    fields: list = None
+):
+    """
+    Admin view: one page of exit requests matching the given filters.
+    On DynamoDB the most selective filter (tenant, then room, then status) is served
+    by its GSI and the rest become a FilterExpression.
+    """
+    filters = {
+        "tenant_id": tenant_id,
+        "room_number": room_number,
+        "request_status": status,
+    }
+    try:
+        return get_repository().page_exit_requests(filters, limit=limit, next_token=next_token, fields=fields)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error querying exit requests: {str(e)}")
+
+
+def iter_exit_request_pages(page_size: int = None, tenant_id: str = None, fields: list = None):
+    """
+    Yield exit requests (all, or one tenant's) one page at a time, straight from
+    storage. Used by exports, so memory stays bounded by page_size.
+    """
+    try:
+        yield from get_repository().iter_exit_request_pages(page_size=page_size, tenant_id=tenant_id, fields=fields)
+    except Exception as e:
+        raise Exception(f"Error walking exit request pages: {str(e)}")
+
 # =====================================================
 #                DAMAGE REPORT FUNCTIONS
 # =====================================================
 
 def create_damage_report(data: dict):
     """
-    Save a damage report in the DynamoDB table.
-    Supports optional document URL.
+    Save a damage report.
+    Supports optional document URL. Floats anywhere in the report (including
+    damaged_items prices) are stored as Decimal.
     """
     try:
-        if "estimated_cost" in data and isinstance(data["estimated_cost"], float):
-            data["estimated_cost"] = Decimal(str(data["estimated_cost"]))
-        return damage_table.put_item(Item=data)
+        data = to_dynamo(data)
+        response = get_repository().put_damage_report(data)
+        invalidate_tenant_cache(DAMAGE_CACHE, data.get("tenant_id"))
+        bump_collection_version(DAMAGE_CACHE)
+        publish_event("damage_report.created", data["report_id"], data, tenant_id=data.get("tenant_id"))
+        return response
     except Exception as e:
         raise Exception(f"Failed to save damage report: {str(e)}")
 
 
-def get_damage_reports_by_tenant(tenant_id: str):
+def get_damage_reports_by_tenant(tenant_id: str, fields: list = None):
     """
-    Fetch all damage reports for a given tenant_id.
-    Requires GSI: TenantId-index.
+    Fetch all damage reports for a given tenant_id (cached per tenant).
     """
     try:
-        response = damage_table.query(
-            IndexName="TenantId-index",
-            KeyConditionExpression=Key("tenant_id").eq(tenant_id)
+        return _cached_tenant_read(
+            DAMAGE_CACHE,
+            tenant_id,
+            lambda projection: get_repository().query_damage_reports_by_tenant(tenant_id, fields=projection),
+            fields
         )
-        return response.get("Items", [])
     except Exception as e:
         raise Exception(f"Error fetching damage reports: {str(e)}")
 
 
+def update_damage_report_data(report_id: str, updates: dict):
+    """
+    Update fields (e.g. document_url) of an existing damage report.
+    """
+    try:
+        updates = to_dynamo(updates)
+        item = get_repository().update_damage_fields(report_id, updates)
+        invalidate_tenant_cache(DAMAGE_CACHE, item.get("tenant_id"))
+        bump_collection_version(DAMAGE_CACHE)
+        changed = {key: item[key] for key in updates if key in item}
+        publish_event("damage_report.updated", report_id, dict(changed, report_id=report_id), tenant_id=item.get("tenant_id"))
+        return {"Attributes": changed}
+    except Exception as e:
+        raise Exception(f"Failed to update damage report fields: {str(e)}")
+
+
 def get_all_damage_reports():
     """
-    Admin view: Get all damage reports (scan-based).
+    Get every damage report (parallel segmented scan on DynamoDB).
+    Prefer get_damage_reports_page / iter_damage_report_pages for admin views.
     """
     try:
-        response = damage_table.scan()
-        return response.get("Items", [])
+        return list(get_repository().iter_damage_reports())
     except Exception as e:
         raise Exception(f"Error fetching all damage reports: {str(e)}")
+
+
+def iter_all_damage_reports(total_segments: int = None, fields: list = None):
+    """
+    Stream every damage report without materializing the table.
+    """
+    try:
+        yield from get_repository().iter_damage_reports(fields=fields, total_segments=total_segments)
+    except Exception as e:
+        raise Exception(f"Error streaming damage reports: {str(e)}")
+
+
+def get_damage_reports_page(limit: int = None, next_token: str = None, fields: list = None):
+    """
+    Admin view: one page of damage reports plus an opaque next_token cursor.
+    """
+    try:
+        return get_repository().page_damage_reports(limit=limit, next_token=next_token, fields=fields)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error fetching damage reports page: {str(e)}")
+
+
+def iter_damage_report_pages(page_size: int = None, tenant_id: str = None, fields: list = None):
+    """
+    Yield damage reports (all, or one tenant's) one page at a time, straight from storage.
+    """
+    try:
+        yield from get_repository().iter_damage_report_pages(page_size=page_size, tenant_id=tenant_id, fields=fields)
+    except Exception as e:
+        raise Exception(f"Error walking damage report pages: {str(e)}")
+
+# =====================================================
+#                BULK WRITES
+# =====================================================
+
+def batch_create_exit_requests(items: list) -> set:
+    """
+    Bulk-save exit requests (one chunk of at most BATCH_WRITE_SIZE) and add them to
+    the status counters. Returns the request_ids that failed to write.
+    Unlike create_exit_request this is not transactional on DynamoDB: the counters
+    are bumped with one update per chunk, for the items that were actually written.
+    """
+    try:
+        items = to_dynamo(items)
+        failed = get_repository().batch_put_exit_requests(items)
+        invalidate_tenant_cache(EXIT_CACHE, *{item["tenant_id"] for item in items if item["request_id"] not in failed})
+        # One event per chunk rather than per row: dashboards reload after a bulk import
+        if len(items) > len(failed):
+            bump_collection_version(EXIT_CACHE)
+            publish_event("exit_request.bulk_created", None, {"count": len(items) - len(failed)})
+        return failed
+    except Exception as e:
+        raise Exception(f"Failed to bulk save exit requests: {str(e)}")
+
+
+def batch_create_damage_reports(items: list) -> set:
+    """
+    Bulk-save damage reports (one chunk of at most BATCH_WRITE_SIZE).
+    Returns the report_ids that failed to write.
+    """
+    try:
+        items = to_dynamo(items)
+        failed = get_repository().batch_put_damage_reports(items)
+        invalidate_tenant_cache(DAMAGE_CACHE, *{item["tenant_id"] for item in items if item["report_id"] not in failed})
+        if len(items) > len(failed):
+            bump_collection_version(DAMAGE_CACHE)
+            publish_event("damage_report.bulk_created", None, {"count": len(items) - len(failed)})
+        return failed
+    except Exception as e:
+        raise Exception(f"Failed to bulk save damage reports: {str(e)}")
+
+# =====================================================
+#                UPLOAD DEDUP INDEX
+# content_id ("<folder>/<sha256>") → S3 key of the stored copy
+# =====================================================
+
+def get_upload_index_entry(content_id: str):
+    try:
+        return get_repository().get_upload_index(content_id)
+    except Exception as e:
+        raise Exception(f"Error reading upload index: {str(e)}")
+
+
+def record_upload_index_entry(entry: dict):
+    """
+    Index stored content (replacing a stale entry whose object is gone).
+    """
+    try:
+        get_repository().put_upload_index(entry)
+    except Exception as e:
+        raise Exception(f"Error writing upload index: {str(e)}")
+
+# =====================================================
+#                LANDLORD VIEW PROJECTIONS
+# Read-optimized entries derived from exit requests (see landlord_views)
+# =====================================================
+
+def replace_landlord_view_entries(source_id: str, entries: list):
+    try:
+        get_repository().replace_view_entries(source_id, to_dynamo(entries))
+    except Exception as e:
+        raise Exception(f"Error writing landlord view entries: {str(e)}")
+
+
+def page_landlord_view(view_key: str, limit: int = None, next_token: str = None,
+                       descending: bool = False, start: str = None, end: str = None):
+    try:
+        return get_repository().page_view_entries(
+            view_key, limit=limit, next_token=next_token, descending=descending, start=start, end=end
+        )
+    except ValueError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error reading landlord view: {str(e)}")
+
+# =====================================================
+#                ASYNC API
+# Awaitable versions for async routers; each call runs on the bounded
+# AWS I/O executor instead of blocking the event loop.
+# =====================================================
+
+create_exit_request_async = awaitable(create_exit_request)
+get_exit_requests_by_tenant_async = awaitable(get_exit_requests_by_tenant)
+update_exit_request_status_async = awaitable(update_exit_request_status)
+batch_update_exit_request_status_async = awaitable(batch_update_exit_request_status)
+update_exit_request_data_async = awaitable(update_exit_request_data)
+get_exit_requests_page_async = awaitable(get_exit_requests_page)
+query_exit_requests_async = awaitable(query_exit_requests)
+get_status_counters_async = awaitable(get_status_counters)
+get_cache_stats_async = awaitable(get_cache_stats)
+get_collection_version_async = awaitable(get_collection_version)
+rebuild_status_counters_async = awaitable(rebuild_status_counters)
+
+create_damage_report_async = awaitable(create_damage_report)
+get_damage_reports_by_tenant_async = awaitable(get_damage_reports_by_tenant)
+update_damage_report_data_async = awaitable(update_damage_report_data)
+get_damage_reports_page_async = awaitable(get_damage_reports_page)
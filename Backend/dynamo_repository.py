@@ -0,0 +1,713 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from datetime import datetime
+from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from app.config.settings import settings
+from app.config.aws_config import get_resource
+from app.services.repository import (
+    Repository,
+    encode_next_token,
+    decode_next_token,
+    clamp_page_size
+)
+
+# -----------------------------
+# Table Names
+# -----------------------------
+EXIT_REQUEST_TABLE = "TenantExitRequests"
+DAMAGE_REPORT_TABLE = "TenantDamageReports"
+STATS_TABLE = "TenantExitStats"  # partition key: stat_id (small aggregate items)
+UPLOAD_INDEX_TABLE = "TenantUploadIndex"  # partition key: content_id ("<folder>/<sha256>")
+LANDLORD_VIEW_TABLE = "TenantLandlordViews"  # partition key: view_key, sort key: sort_key
+
+# -----------------------------
+# Global Secondary Indexes
+# -----------------------------
+TENANT_INDEX = "TenantId-index"        # partition key: tenant_id (exit + damage tables)
+STATUS_INDEX = "RequestStatus-index"   # partition key: request_status (exit table)
+ROOM_INDEX = "RoomNumber-index"        # partition key: room_number (exit table)
+
+# Exit request filter attributes, most selective index first
+EXIT_FILTER_INDEXES = [
+    ("tenant_id", TENANT_INDEX),
+    ("room_number", ROOM_INDEX),
+    ("request_status", STATUS_INDEX),
+]
+
+MAX_PAGE_ROUNDS = 10  # Cap on DynamoDB round trips spent filling one filtered page
+STATUS_COUNTER_ID = "exit_request_status_counts"
+COLLECTION_VERSION_ID = "collection_versions"
+TENANT_VERSION_PREFIX = "tenant_version"  # stat_id "<prefix>#<collection>#<tenant_id>"
+STATUS_UPDATE_RETRIES = 3
+VIEW_MANIFEST_SORT_KEY = "manifest"  # landlord view table: the entry keys each source owns
+VIEW_UPDATE_RETRIES = 3
+BATCH_STATUS_CHUNK_SIZE = 25  # status updates per transaction (+1 counter update, limit is 100)
+BATCH_GET_RETRIES = 5
+BATCH_WRITE_RETRIES = 6
+
+_serializer = TypeSerializer()
+
+# =====================================================
+#                PAGINATION HELPERS
+# =====================================================
+
+def _read_page(operation, limit=None, next_token=None, scope=None, **kwargs):
+    """
+    Read one page through table.scan or table.query.
+
+    DynamoDB applies Limit before FilterExpression, so a filtered read may come
+    back short. We keep reading with Limit = remaining (never overshooting, so the
+    returned LastEvaluatedKey is an exact cursor) for at most MAX_PAGE_ROUNDS calls.
+    """
+    remaining = clamp_page_size(limit)
+    start_key = decode_next_token(next_token, scope)
+    items = []
+
+    for _ in range(MAX_PAGE_ROUNDS):
+        params = dict(kwargs, Limit=remaining)
+        if start_key:
+            params["ExclusiveStartKey"] = start_key
+
+        response = operation(**params)
+        page = response.get("Items", [])
+        items.extend(page)
+        remaining -= len(page)
+        start_key = response.get("LastEvaluatedKey")
+
+        if not start_key or remaining <= 0:
+            break
+
+    return {"items": items, "next_token": encode_next_token(start_key, scope)}
+
+
+def _iter_pages(operation, page_size=None, **kwargs):
+    """
+    Walk every page of a scan/query, yielding one list of items per round trip.
+    Memory stays bounded by page_size regardless of table size.
+    """
+    params = dict(kwargs)
+    if page_size:
+        params["Limit"] = page_size
+
+    while True:
+        response = operation(**params)
+        items = response.get("Items", [])
+        if items:
+            yield items
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        params["ExclusiveStartKey"] = last_key
+
+
+def _read_all(operation, **kwargs):
+    items = []
+    for page in _iter_pages(operation, **kwargs):
+        items.extend(page)
+    return items
+
+
+def _iter_table_pages(table, page_size, tenant_id, fields):
+    """
+    Page through one tenant's items (TenantId-index query) or the whole table (scan).
+    """
+    if tenant_id:
+        return _iter_pages(
+            table.query,
+            page_size=page_size,
+            IndexName=TENANT_INDEX,
+            KeyConditionExpression=Key("tenant_id").eq(tenant_id),
+            **_projection_kwargs(fields)
+        )
+    return _iter_pages(table.scan, page_size=page_size, **_projection_kwargs(fields))
+
+
+def _projection_kwargs(fields) -> dict:
+    """
+    ProjectionExpression using #placeholders for every name, so reserved words
+    (name, status, date, ...) are safe. boto3 merges these with the names it
+    generates for Key/Attr conditions.
+    """
+    if not fields:
+        return {}
+    names = {f"#p{i}": name for i, name in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names
+    }
+
+def _update_fields(table, key_name: str, key_value: str, updates: dict, label: str) -> dict:
+    """
+    SET top-level attributes on an existing item and return the full updated item.
+    """
+    update_expr = []
+    expr_attrs = {}
+
+    for key, value in updates.items():
+        update_expr.append(f"{key} = :{key}")
+        expr_attrs[f":{key}"] = value
+
+    try:
+        response = table.update_item(
+            Key={key_name: key_value},
+            UpdateExpression="SET " + ", ".join(update_expr),
+            ConditionExpression=f"attribute_exists({key_name})",
+            ExpressionAttributeValues=expr_attrs,
+            ReturnValues="ALL_NEW"
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            raise Exception(f"{label} {key_value} not found")
+        raise
+    return response.get("Attributes", {})
+
+# =====================================================
+#                PARALLEL SEGMENTED SCAN
+# =====================================================
+
+_SEGMENT_DONE = object()
+
+
+def parallel_scan(table, total_segments: int = None, max_workers: int = None, **scan_kwargs):
+    """
+    Stream every item of a table using a DynamoDB parallel scan.
+
+    The table is split into `total_segments` (Segment/TotalSegments); each segment is
+    paged by a worker from a bounded thread pool and the pages are merged into one
+    item stream in arrival order (no global ordering). A bounded hand-off queue keeps
+    memory flat: workers block once the consumer falls behind.
+    Extra kwargs (FilterExpression, ProjectionExpression, ...) go to every scan call.
+    """
+    segments = max(1, total_segments or settings.SCAN_TOTAL_SEGMENTS)
+    workers = max(1, min(max_workers or settings.SCAN_MAX_WORKERS, segments))
+
+    if segments == 1:
+        for page in _iter_pages(table.scan, **scan_kwargs):
+            yield from page
+        return
+
+    pages = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def hand_off(value):
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment: int):
+        try:
+            for page in _iter_pages(table.scan, Segment=segment, TotalSegments=segments, **scan_kwargs):
+                if not hand_off(page):
+                    return
+        except Exception as e:
+            hand_off(e)
+        finally:
+            hand_off(_SEGMENT_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dynamo-scan")
+    try:
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+
+        finished = 0
+        while finished < segments:
+            value = pages.get()
+            if value is _SEGMENT_DONE:
+                finished += 1
+            elif isinstance(value, Exception):
+                raise value
+            else:
+                yield from value
+    finally:
+        # Unblock workers if the consumer stopped early or a segment failed
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# =====================================================
+#                TRANSACTION BUILDERS
+# =====================================================
+
+def _serialize(value):
+    return _serializer.serialize(value)
+
+
+def _status_attribute(status: str) -> str:
+    # Counters live as top-level attributes, e.g. status_Approved
+    return f"status_{status}"
+
+
+def _counter_update(deltas: dict, total_delta: int = 0) -> dict:
+    """
+    Build a TransactWriteItems "Update" on the aggregate item that ADDs the
+    given per-status deltas (and optionally total_requests).
+    """
+    clauses = []
+    names = {}
+    values = {}
+
+    if total_delta:
+        clauses.append("total_requests :total")
+        values[":total"] = _serialize(total_delta)
+
+    for i, (status, delta) in enumerate(deltas.items()):
+        if not delta:
+            continue
+        clauses.append(f"#s{i} :d{i}")
+        names[f"#s{i}"] = _status_attribute(status)
+        values[f":d{i}"] = _serialize(delta)
+
+    update = {
+        "TableName": STATS_TABLE,
+        "Key": {"stat_id": _serialize(STATUS_COUNTER_ID)},
+        "UpdateExpression": "ADD " + ", ".join(clauses),
+        "ExpressionAttributeValues": values,
+    }
+    if names:
+        update["ExpressionAttributeNames"] = names
+    return {"Update": update}
+
+
+def _status_update_action(request_id: str, old_status, new_status: str) -> dict:
+    """
+    TransactWriteItems "Update" that sets a request's status (and when it changed),
+    conditioned on the status we last read so a concurrent change cancels the transaction.
+    """
+    values = {":new": _serialize(new_status), ":at": _serialize(datetime.utcnow().isoformat())}
+    if old_status is None:
+        condition = "attribute_not_exists(request_status)"
+    else:
+        condition = "request_status = :old"
+        values[":old"] = _serialize(old_status)
+
+    return {
+        "Update": {
+            "TableName": EXIT_REQUEST_TABLE,
+            "Key": {"request_id": _serialize(request_id)},
+            "UpdateExpression": "SET request_status = :new, status_updated_at = :at",
+            "ConditionExpression": condition,
+            "ExpressionAttributeValues": values
+        }
+    }
+
+
+def _status_deltas(transitions) -> Counter:
+    """
+    Net counter changes for an iterable of (old_status, new_status) pairs.
+    """
+    deltas = Counter()
+    for old_status, new_status in transitions:
+        if old_status is not None:
+            deltas[old_status] -= 1
+        deltas[new_status] += 1
+    return deltas
+
+
+def _is_transaction_cancelled(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") == "TransactionCanceledException"
+
+# =====================================================
+#                DYNAMODB REPOSITORY
+# =====================================================
+
+class DynamoRepository(Repository):
+    """
+    Repository backed by DynamoDB tables and GSIs.
+    Requires GSIs: TenantId-index (exit + damage), RoomNumber-index, RequestStatus-index.
+    """
+
+    name = "dynamodb"
+
+    def __init__(self):
+        self.dynamodb = get_resource("dynamodb")
+        self.client = self.dynamodb.meta.client
+        self.exit_table = self.dynamodb.Table(EXIT_REQUEST_TABLE)
+        self.damage_table = self.dynamodb.Table(DAMAGE_REPORT_TABLE)
+        self.stats_table = self.dynamodb.Table(STATS_TABLE)
+        self.upload_index_table = self.dynamodb.Table(UPLOAD_INDEX_TABLE)
+        self.landlord_view_table = self.dynamodb.Table(LANDLORD_VIEW_TABLE)
+
+    # ---------- Exit requests ----------
+
+    def put_exit_request(self, item: dict):
+        # The item and its status counter increment are written in one transaction
+        return self.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": EXIT_REQUEST_TABLE,
+                        "Item": {name: _serialize(value) for name, value in item.items()},
+                        "ConditionExpression": "attribute_not_exists(request_id)"
+                    }
+                },
+                _counter_update({item.get("request_status", "Pending"): 1}, total_delta=1)
+            ]
+        )
+
+    def get_exit_request(self, request_id: str):
+        # Strongly consistent: callers re-read right after a write (landlord projections)
+        return self.exit_table.get_item(Key={"request_id": request_id}, ConsistentRead=True).get("Item")
+
+    def query_exit_requests_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        return _read_all(
+            self.exit_table.query,
+            IndexName=TENANT_INDEX,
+            KeyConditionExpression=Key("tenant_id").eq(tenant_id),
+            **_projection_kwargs(fields)
+        )
+
+    def update_exit_status(self, request_id: str, new_status: str) -> dict:
+        # Conditioned on the status we read; if another writer changed it in between,
+        # the transaction is cancelled and we re-read (consistently, so the retry
+        # sees that write) and retry
+        for _ in range(STATUS_UPDATE_RETRIES):
+            current = self.exit_table.get_item(
+                Key={"request_id": request_id},
+                ProjectionExpression="request_status, tenant_id",
+                ConsistentRead=True
+            ).get("Item")
+            if current is None:
+                raise Exception(f"Exit request {request_id} not found")
+
+            old_status = current.get("request_status")
+            if old_status == new_status:
+                return current
+
+            try:
+                self.client.transact_write_items(
+                    TransactItems=[
+                        _status_update_action(request_id, old_status, new_status),
+                        _counter_update(_status_deltas([(old_status, new_status)]))
+                    ]
+                )
+                return current
+            except ClientError as e:
+                if not _is_transaction_cancelled(e):
+                    raise
+
+        raise Exception("status changed concurrently, retries exhausted")
+
+    def _batch_get_exit_statuses(self, request_ids: list) -> dict:
+        """
+        request_id -> {request_status, tenant_id} for the ids that exist (one BatchGetItem,
+        retrying UnprocessedKeys).
+        """
+        keys = [{"request_id": request_id} for request_id in request_ids]
+        found = {}
+        for attempt in range(BATCH_GET_RETRIES):
+            response = self.dynamodb.batch_get_item(RequestItems={
+                EXIT_REQUEST_TABLE: {
+                    "Keys": keys,
+                    "ProjectionExpression": "request_id, request_status, tenant_id",
+                    "ConsistentRead": True
+                }
+            })
+            for item in response.get("Responses", {}).get(EXIT_REQUEST_TABLE, []):
+                found[item["request_id"]] = item
+            keys = response.get("UnprocessedKeys", {}).get(EXIT_REQUEST_TABLE, {}).get("Keys", [])
+            if not keys:
+                return found
+            time.sleep(min(0.05 * (2 ** attempt), 2.0))
+        raise Exception("BatchGetItem left unprocessed keys after retries")
+
+    def _apply_status_chunk(self, changes: dict) -> dict:
+        """
+        Apply up to BATCH_STATUS_CHUNK_SIZE status changes in one TransactWriteItems call
+        together with the net counter update. If the transaction is cancelled (one of
+        the items changed underneath us), fall back to per-item updates so the other
+        items still go through and each gets its own outcome.
+        """
+        outcomes = {}
+        current = self._batch_get_exit_statuses(list(changes))
+
+        transitions = {}
+        for request_id, new_status in changes.items():
+            item = current.get(request_id)
+            if item is None:
+                outcomes[request_id] = {"status": "not_found"}
+            elif item.get("request_status") == new_status:
+                outcomes[request_id] = {"status": "unchanged", "request_status": new_status}
+            else:
+                transitions[request_id] = (item.get("request_status"), new_status)
+
+        if not transitions:
+            return outcomes
+
+        actions = [
+            _status_update_action(request_id, old_status, new_status)
+            for request_id, (old_status, new_status) in transitions.items()
+        ]
+        deltas = {status: delta for status, delta in _status_deltas(transitions.values()).items() if delta}
+        if deltas:
+            actions.append(_counter_update(deltas))
+
+        try:
+            self.client.transact_write_items(TransactItems=actions)
+        except ClientError as e:
+            if not _is_transaction_cancelled(e):
+                raise
+            for request_id, (_, new_status) in transitions.items():
+                try:
+                    previous = self.update_exit_status(request_id, new_status)
+                    outcomes[request_id] = {
+                        "status": "updated",
+                        "previous_status": previous.get("request_status"),
+                        "request_status": new_status,
+                        "tenant_id": previous.get("tenant_id")
+                    }
+                except Exception as item_error:
+                    outcomes[request_id] = {"status": "error", "detail": str(item_error)}
+            return outcomes
+
+        for request_id, (old_status, new_status) in transitions.items():
+            outcomes[request_id] = {
+                "status": "updated",
+                "previous_status": old_status,
+                "request_status": new_status,
+                "tenant_id": current[request_id].get("tenant_id")
+            }
+        return outcomes
+
+    def batch_update_exit_status(self, changes: dict) -> dict:
+        # Chunks run one after another: every transaction also updates the shared
+        # counter item, and concurrent transactions on it would conflict
+        outcomes = {}
+        request_ids = list(changes)
+        for start in range(0, len(request_ids), BATCH_STATUS_CHUNK_SIZE):
+            chunk = {request_id: changes[request_id] for request_id in request_ids[start:start + BATCH_STATUS_CHUNK_SIZE]}
+            try:
+                outcomes.update(self._apply_status_chunk(chunk))
+            except Exception as e:
+                for request_id in chunk:
+                    outcomes[request_id] = {"status": "error", "detail": str(e)}
+        return outcomes
+
+    def update_exit_fields(self, request_id: str, updates: dict) -> dict:
+        return _update_fields(self.exit_table, "request_id", request_id, updates, "Exit request")
+
+    def page_exit_requests(self, filters: dict, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        # The most selective filter present is served by its GSI through
+        # KeyConditionExpression; the rest become a FilterExpression
+        filters = {name: value for name, value in (filters or {}).items() if value}
+        if not filters:
+            return _read_page(self.exit_table.scan, limit=limit, next_token=next_token, scope="exit_scan", **_projection_kwargs(fields))
+
+        attribute, index_name = next(
+            (attribute, index_name) for attribute, index_name in EXIT_FILTER_INDEXES if attribute in filters
+        )
+        kwargs = {
+            "IndexName": index_name,
+            "KeyConditionExpression": Key(attribute).eq(filters.pop(attribute)),
+            **_projection_kwargs(fields)
+        }
+
+        filter_expression = None
+        for name, value in filters.items():
+            condition = Attr(name).eq(value)
+            filter_expression = condition if filter_expression is None else filter_expression & condition
+        if filter_expression is not None:
+            kwargs["FilterExpression"] = filter_expression
+
+        return _read_page(self.exit_table.query, limit=limit, next_token=next_token, scope=index_name, **kwargs)
+
+    def iter_exit_requests(self, fields: list = None, total_segments: int = None):
+        return parallel_scan(self.exit_table, total_segments=total_segments, **_projection_kwargs(fields))
+
+    def iter_exit_request_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        return _iter_table_pages(self.exit_table, page_size, tenant_id, fields)
+
+    def _batch_put(self, table_name: str, items: list) -> list:
+        """
+        Write up to BATCH_WRITE_SIZE items with one BatchWriteItem call, retrying
+        UnprocessedItems with exponential backoff. Returns the items that could
+        still not be written.
+        """
+        pending = [{"PutRequest": {"Item": item}} for item in items]
+        for attempt in range(BATCH_WRITE_RETRIES):
+            response = self.dynamodb.batch_write_item(RequestItems={table_name: pending})
+            pending = response.get("UnprocessedItems", {}).get(table_name, [])
+            if not pending:
+                return []
+            time.sleep(min(0.05 * (2 ** attempt), 2.0))
+        return [request["PutRequest"]["Item"] for request in pending]
+
+    def batch_put_exit_requests(self, items: list) -> set:
+        # Not transactional: counters are bumped once per chunk for the items written
+        failed = {item["request_id"] for item in self._batch_put(EXIT_REQUEST_TABLE, items)}
+        written = [item for item in items if item["request_id"] not in failed]
+        if written:
+            deltas = Counter(item.get("request_status", "Pending") for item in written)
+            self.client.update_item(**_counter_update(deltas, total_delta=len(written))["Update"])
+        return failed
+
+    # ---------- Status counters ----------
+
+    def get_status_counters(self) -> dict:
+        item = self.stats_table.get_item(Key={"stat_id": STATUS_COUNTER_ID}).get("Item") or {}
+        statuses = {
+            name[len("status_"):]: int(value)
+            for name, value in item.items()
+            if name.startswith("status_")
+        }
+        return {
+            "total_requests": int(item.get("total_requests", 0)),
+            "statuses": statuses
+        }
+
+    def replace_status_counters(self, counts: dict):
+        item = {"stat_id": STATUS_COUNTER_ID, "total_requests": sum(counts.values())}
+        for status, count in counts.items():
+            if status:
+                item[_status_attribute(status)] = count
+        self.stats_table.put_item(Item=item)
+
+    # ---------- Collection versions (ETags) ----------
+
+    def get_collection_versions(self) -> dict:
+        item = self.stats_table.get_item(Key={"stat_id": COLLECTION_VERSION_ID}).get("Item") or {}
+        return {
+            name[len("version_"):]: int(value)
+            for name, value in item.items()
+            if name.startswith("version_")
+        }
+
+    def bump_collection_version(self, collection: str) -> int:
+        response = self.stats_table.update_item(
+            Key={"stat_id": COLLECTION_VERSION_ID},
+            UpdateExpression="ADD #v :one",
+            ExpressionAttributeNames={"#v": f"version_{collection}"},
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW"
+        )
+        return int(response["Attributes"][f"version_{collection}"])
+
+    def get_tenant_version(self, collection: str, tenant_id: str) -> int:
+        item = self.stats_table.get_item(
+            Key={"stat_id": f"{TENANT_VERSION_PREFIX}#{collection}#{tenant_id}"},
+            ConsistentRead=True
+        ).get("Item") or {}
+        return int(item.get("version", 0))
+
+    def bump_tenant_version(self, collection: str, tenant_id: str) -> int:
+        response = self.stats_table.update_item(
+            Key={"stat_id": f"{TENANT_VERSION_PREFIX}#{collection}#{tenant_id}"},
+            UpdateExpression="ADD version :one",
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW"
+        )
+        return int(response["Attributes"]["version"])
+
+    # ---------- Damage reports ----------
+
+    def put_damage_report(self, item: dict):
+        return self.damage_table.put_item(Item=item)
+
+    def query_damage_reports_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        return _read_all(
+            self.damage_table.query,
+            IndexName=TENANT_INDEX,
+            KeyConditionExpression=Key("tenant_id").eq(tenant_id),
+            **_projection_kwargs(fields)
+        )
+
+    def update_damage_fields(self, report_id: str, updates: dict) -> dict:
+        return _update_fields(self.damage_table, "report_id", report_id, updates, "Damage report")
+
+    def page_damage_reports(self, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        return _read_page(self.damage_table.scan, limit=limit, next_token=next_token, scope="damage_scan", **_projection_kwargs(fields))
+
+    def iter_damage_reports(self, fields: list = None, total_segments: int = None):
+        return parallel_scan(self.damage_table, total_segments=total_segments, **_projection_kwargs(fields))
+
+    def iter_damage_report_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        return _iter_table_pages(self.damage_table, page_size, tenant_id, fields)
+
+    def batch_put_damage_reports(self, items: list) -> set:
+        return {item["report_id"] for item in self._batch_put(DAMAGE_REPORT_TABLE, items)}
+
+    # ---------- Upload dedup index ----------
+
+    def get_upload_index(self, content_id: str):
+        return self.upload_index_table.get_item(Key={"content_id": content_id}).get("Item")
+
+    def put_upload_index(self, entry: dict):
+        self.upload_index_table.put_item(Item=entry)
+
+    # ---------- Landlord view projections ----------
+
+    def replace_view_entries(self, source_id: str, entries: list):
+        # Each source has a manifest item ("source#<id>", "manifest") listing the
+        # entry keys it owns. It is read consistently from the base table, so a
+        # just-written entry is never missed, and it is rewritten in the same
+        # transaction as the entries, conditioned on the revision we read, so
+        # concurrent refreshes of one request retry instead of interleaving.
+        manifest_key = {"view_key": f"source#{source_id}", "sort_key": VIEW_MANIFEST_SORT_KEY}
+        kept = [[entry["view_key"], entry["sort_key"]] for entry in entries]
+        for _ in range(VIEW_UPDATE_RETRIES):
+            manifest = self.landlord_view_table.get_item(Key=manifest_key, ConsistentRead=True).get("Item")
+            owned = manifest.get("entry_keys", []) if manifest else []
+            revision = int(manifest["revision"]) if manifest else 0
+
+            actions = [
+                {"Delete": {
+                    "TableName": LANDLORD_VIEW_TABLE,
+                    "Key": {"view_key": _serialize(view_key), "sort_key": _serialize(sort_key)}
+                }}
+                for view_key, sort_key in owned
+                if [view_key, sort_key] not in kept
+            ]
+            actions += [
+                {"Put": {
+                    "TableName": LANDLORD_VIEW_TABLE,
+                    "Item": {name: _serialize(value) for name, value in entry.items()}
+                }}
+                for entry in entries
+            ]
+            actions.append({"Put": {
+                "TableName": LANDLORD_VIEW_TABLE,
+                "Item": {
+                    **{name: _serialize(value) for name, value in manifest_key.items()},
+                    "source_id": _serialize(source_id),
+                    "entry_keys": _serialize(kept),
+                    "revision": _serialize(revision + 1)
+                },
+                "ConditionExpression": "revision = :revision" if manifest else "attribute_not_exists(view_key)",
+                **({"ExpressionAttributeValues": {":revision": _serialize(revision)}} if manifest else {})
+            }})
+            try:
+                self.client.transact_write_items(TransactItems=actions)
+                return
+            except ClientError as e:
+                if not _is_transaction_cancelled(e):
+                    raise
+
+        raise Exception("view entries changed concurrently, retries exhausted")
+
+    def page_view_entries(self, view_key: str, limit: int = None, next_token: str = None,
+                          descending: bool = False, start: str = None, end: str = None) -> dict:
+        condition = Key("view_key").eq(view_key)
+        # sort_key is "<date>#<entry id>"; "~" sorts after every such suffix.
+        # Key values can't be empty strings, so open-ended ranges use gte/lte.
+        if start and end:
+            condition = condition & Key("sort_key").between(start, end + "~")
+        elif start:
+            condition = condition & Key("sort_key").gte(start)
+        elif end:
+            condition = condition & Key("sort_key").lte(end + "~")
+        return _read_page(
+            self.landlord_view_table.query,
+            limit=limit,
+            next_token=next_token,
+            scope=f"{view_key}:{descending}:{start}:{end}",
+            KeyConditionExpression=condition,
+            ScanIndexForward=not descending
+        )
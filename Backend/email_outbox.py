@@ -0,0 +1,425 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import uuid4
+from app.config.settings import settings
+from app.services.async_io import awaitable
+from app.services.email_service import deliver_email, get_send_rate
+
+# -----------------------------
+# Schema
+# status: pending → sending → sent, or → dead after too many (or permanent) failures.
+# A "sending" row whose lease ran out belongs to a dispatcher that died mid-batch
+# and is picked up again.
+# -----------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    message_id      TEXT PRIMARY KEY,
+    status          TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    lease_until     REAL,
+    created_at      REAL NOT NULL,
+    sent_at         REAL,
+    last_error      TEXT,
+    data            TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+CREATE TABLE IF NOT EXISTS dispatcher_lease (
+    name        TEXT PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+"""
+
+INSERT_MESSAGE = """
+INSERT INTO outbox (message_id, status, attempts, next_attempt_at, created_at, data)
+VALUES (?, 'pending', 0, ?, ?, ?)
+"""
+SELECT_DUE = """
+SELECT message_id, attempts, data FROM outbox
+WHERE (status = 'pending' AND next_attempt_at <= ?) OR (status = 'sending' AND lease_until <= ?)
+ORDER BY next_attempt_at LIMIT ?
+"""
+CLAIM_MESSAGE = "UPDATE outbox SET status = 'sending', lease_until = ? WHERE message_id = ?"
+MARK_SENT = "UPDATE outbox SET status = 'sent', attempts = ?, sent_at = ?, last_error = NULL, lease_until = NULL WHERE message_id = ?"
+MARK_RETRY = """
+UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ?, lease_until = NULL
+WHERE message_id = ?
+"""
+MARK_DEAD = "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ?, lease_until = NULL WHERE message_id = ?"
+REQUEUE_DEAD = """
+UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, last_error = NULL
+WHERE message_id = ? AND status = 'dead'
+"""
+SELECT_DEAD = """
+SELECT message_id, attempts, created_at, last_error, data FROM outbox
+WHERE status = 'dead' ORDER BY created_at DESC LIMIT ?
+"""
+SELECT_NEXT_DUE = "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+PRUNE_SENT = "DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?"
+TAKE_LEASE = """
+INSERT INTO dispatcher_lease (name, owner, lease_until) VALUES ('dispatcher', ?, ?)
+ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, lease_until = excluded.lease_until
+WHERE dispatcher_lease.owner = excluded.owner OR dispatcher_lease.lease_until <= ?
+"""
+RELEASE_LEASE = "DELETE FROM dispatcher_lease WHERE name = 'dispatcher' AND owner = ?"
+
+# SES error codes that will fail the same way on every retry
+PERMANENT_SES_ERRORS = {
+    "MessageRejected",
+    "InvalidParameterValue",
+    "MailFromDomainNotVerifiedException",
+    "ConfigurationSetDoesNotExistException",
+}
+THROTTLING_SES_ERRORS = {"Throttling", "ThrottlingException", "TooManyRequestsException"}
+
+# =====================================================
+#                EMAIL OUTBOX
+# Routers enqueue into a local SQLite outbox (one fast local write) and return;
+# a dispatcher thread sends in the background. Messages survive restarts, and
+# several workers on one host can share the file: claiming a batch is a
+# BEGIN IMMEDIATE transaction, so a message is only sent by one of them.
+# Every worker starts a dispatcher, but only the one holding the lease row in
+# the file sends; the others stand by and take over when its lease runs out.
+# One sender per outbox keeps the whole host at the SES rate.
+# =====================================================
+
+class _Outbox:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def add(self, message: dict) -> str:
+        message_id = str(uuid4())
+        now = time.time()
+        self._conn().execute(INSERT_MESSAGE, (message_id, now, now, json.dumps(message)))
+        return message_id
+
+    def claim(self, limit: int, lease_seconds: float) -> list:
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(SELECT_DUE, (now, now, limit)).fetchall()
+            conn.executemany(CLAIM_MESSAGE, [(now + lease_seconds, row[0]) for row in rows])
+        return [{"message_id": row[0], "attempts": row[1], **json.loads(row[2])} for row in rows]
+
+    def record(self, sent: list, retries: list, dead: list):
+        with self._transaction() as conn:
+            conn.executemany(MARK_SENT, sent)
+            conn.executemany(MARK_RETRY, retries)
+            conn.executemany(MARK_DEAD, dead)
+
+    def next_due(self):
+        return self._conn().execute(SELECT_NEXT_DUE).fetchone()[0]
+
+    def counts(self) -> dict:
+        return dict(self._conn().execute(COUNT_BY_STATUS).fetchall())
+
+    def dead_letters(self, limit: int) -> list:
+        return [
+            {
+                "message_id": row[0],
+                "attempts": row[1],
+                "created_at": datetime.utcfromtimestamp(row[2]).isoformat(),
+                "last_error": row[3],
+                **json.loads(row[4])
+            }
+            for row in self._conn().execute(SELECT_DEAD, (limit,))
+        ]
+
+    def requeue(self, message_id: str) -> bool:
+        return self._conn().execute(REQUEUE_DEAD, (time.time(), message_id)).rowcount == 1
+
+    def prune(self, older_than: float) -> int:
+        return self._conn().execute(PRUNE_SENT, (older_than,)).rowcount
+
+    def take_lease(self, owner: str, until: float) -> bool:
+        """
+        Acquire or renew the dispatcher lease; False while another owner holds it.
+        """
+        return self._conn().execute(TAKE_LEASE, (owner, until, time.time())).rowcount == 1
+
+    def release_lease(self, owner: str):
+        self._conn().execute(RELEASE_LEASE, (owner,))
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def _get_outbox() -> _Outbox:
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = _Outbox(settings.EMAIL_OUTBOX_PATH)
+    return _outbox
+
+# -----------------------------
+# Enqueue (request path)
+# -----------------------------
+
+def enqueue_email(subject: str, body: str, recipient: str, html_body: str = None) -> str:
+    """
+    Queue an email for the background dispatcher and return its message_id.
+    Same arguments as email_service.send_email.
+    """
+    message_id = _get_outbox().add({
+        "subject": subject,
+        "body": body,
+        "recipient": recipient,
+        "html_body": html_body
+    })
+    _wake.set()
+    return message_id
+
+
+def get_outbox_stats() -> dict:
+    counts = _get_outbox().counts()
+    return {
+        "pending": counts.get("pending", 0),
+        "sending": counts.get("sending", 0),
+        "sent": counts.get("sent", 0),
+        "dead": counts.get("dead", 0),
+        "send_rate": _bucket.rate if _bucket else None,
+        "dispatcher_running": bool(_thread and _thread.is_alive()),
+        "dispatcher_active": time.time() < _lease_until,  # this worker's dispatcher is the sender
+    }
+
+
+def list_dead_letters(limit: int = 50) -> list:
+    return _get_outbox().dead_letters(limit)
+
+
+def retry_dead_letter(message_id: str) -> bool:
+    """
+    Put a dead message back in the queue with a fresh retry budget.
+    Returns False when there is no dead message with that id.
+    """
+    requeued = _get_outbox().requeue(message_id)
+    if requeued:
+        _wake.set()
+    return requeued
+
+
+# Awaitable versions for async routers (run on the AWS I/O executor)
+enqueue_email_async = awaitable(enqueue_email)
+get_outbox_stats_async = awaitable(get_outbox_stats)
+list_dead_letters_async = awaitable(list_dead_letters)
+retry_dead_letter_async = awaitable(retry_dead_letter)
+
+# =====================================================
+#                DISPATCHER
+# =====================================================
+
+class TokenBucket:
+    """
+    Allow `rate` sends per second on average with bursts of up to `capacity`.
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, stop: threading.Event = None) -> bool:
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            wait = (1 - self.tokens) / self.rate
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+    def drain(self):
+        # SES said we are over the rate: give it a full interval before the next send
+        self.tokens = min(self.tokens, 0.0)
+
+
+_thread = None
+_stop = threading.Event()
+_wake = threading.Event()
+_bucket = None
+_owner = str(uuid4())
+_lease_until = 0.0
+
+
+def _hold_lease(outbox: _Outbox) -> bool:
+    """
+    True while this worker's dispatcher is the outbox's sender. The lease is
+    renewed once half of it has passed, so a healthy sender never loses it.
+    """
+    global _lease_until
+    lease = settings.EMAIL_DISPATCHER_LEASE_SECONDS
+    now = time.time()
+    if now < _lease_until - lease / 2:
+        return True
+    held = _lease_until > now
+    if outbox.take_lease(_owner, now + lease):
+        if not held:
+            print(f"📬 Email dispatcher active ({_bucket.rate:g} msg/s)")
+        _lease_until = now + lease
+        return True
+    _lease_until = 0.0
+    return False
+
+
+def _backoff(attempts: int) -> float:
+    # Exponential with full jitter, so retries from a throttled burst spread out
+    delay = min(settings.EMAIL_RETRY_MAX_SECONDS, settings.EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+    return random.uniform(delay / 2, delay)
+
+
+def _classify(error: Exception) -> str:
+    """
+    "throttled", "permanent" or "transient" for a failed send.
+    """
+    from botocore.exceptions import ClientError
+
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        if code in THROTTLING_SES_ERRORS:
+            return "throttled"
+        if code in PERMANENT_SES_ERRORS:
+            return "permanent"
+    return "transient"
+
+
+def _send_batch(outbox: _Outbox, messages: list):
+    sent, retries, dead = [], [], []
+    for message in messages:
+        if not _bucket.acquire(_stop) or not _hold_lease(outbox):
+            # Shutting down or no longer the sender: unsent messages keep their
+            # lease and are reclaimed once it runs out
+            break
+        attempts = message["attempts"] + 1
+        try:
+            deliver_email(message["subject"], message["body"], message["recipient"], message.get("html_body"))
+            sent.append((attempts, time.time(), message["message_id"]))
+        except Exception as e:
+            kind = _classify(e)
+            if kind == "throttled":
+                _bucket.drain()
+            if kind == "permanent" or attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                print(f"❌ Email {message['message_id']} to {message['recipient']} dead-lettered:", e)
+                dead.append((attempts, str(e), message["message_id"]))
+            else:
+                retries.append((attempts, time.time() + _backoff(attempts), str(e), message["message_id"]))
+    outbox.record(sent, retries, dead)
+
+
+def resolve_send_rate() -> float:
+    """
+    EMAIL_SEND_RATE, or the account's SES MaxSendRate (1/s if it can't be read).
+    This is the rate of the outbox's one active dispatcher.
+    """
+    if settings.EMAIL_SEND_RATE:
+        return settings.EMAIL_SEND_RATE
+    try:
+        return get_send_rate()
+    except Exception as e:
+        print("⚠️ Could not read the SES send quota, sending at 1/s:", e)
+        return 1.0
+
+
+def _run():
+    global _bucket
+    outbox = _get_outbox()
+    _bucket = TokenBucket(resolve_send_rate())
+    last_prune = 0.0
+    print("📬 Email dispatcher started")
+    while not _stop.is_set():
+        try:
+            if not _hold_lease(outbox):
+                # Another worker's dispatcher is sending; check again after the poll interval
+                _stop.wait(settings.EMAIL_OUTBOX_POLL_SECONDS)
+                continue
+            messages = outbox.claim(settings.EMAIL_BATCH_SIZE, settings.EMAIL_LEASE_SECONDS)
+            if messages:
+                _send_batch(outbox, messages)
+                continue
+
+            now = time.time()
+            if now - last_prune > 3600:
+                outbox.prune(now - settings.EMAIL_OUTBOX_RETENTION_SECONDS)
+                last_prune = now
+            # Sleep until the next retry is due, a new message arrives, or the poll
+            # interval passes (other workers enqueue into the same file)
+            next_due = outbox.next_due()
+            timeout = settings.EMAIL_OUTBOX_POLL_SECONDS
+            if next_due is not None:
+                timeout = max(0.0, min(timeout, next_due - now))
+        except Exception as e:
+            print("❌ Email dispatcher error:", e)
+            timeout = settings.EMAIL_OUTBOX_POLL_SECONDS
+        _wake.wait(timeout)
+        _wake.clear()
+
+
+def start_email_dispatcher():
+    """
+    Start the background dispatcher (app startup). No-op when disabled or already running.
+    """
+    global _thread
+    if not settings.EMAIL_DISPATCHER_ENABLED or (_thread and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="email-dispatcher", daemon=True)
+    _thread.start()
+
+
+def stop_email_dispatcher(timeout: float = 5.0):
+    """
+    Stop the dispatcher on app shutdown. Queued messages stay in the outbox.
+    """
+    global _thread, _lease_until
+    if _thread is None:
+        return
+    _stop.set()
+    _wake.set()
+    _thread.join(timeout)
+    _thread = None
+    if _lease_until:
+        # Let a standby dispatcher take over now instead of when the lease runs out
+        try:
+            _get_outbox().release_lease(_owner)
+        except Exception as e:
+            print("⚠️ Could not release the email dispatcher lease:", e)
+        _lease_until = 0.0
@@ -1,14 +1,28 @@
-import boto3
-from botocore.exceptions import BotoCoreError, NoCredentialsError, ClientError
 from app.config.settings import settings
+from app.config.aws_config import get_client
+from app.services.async_io import awaitable
+
+def deliver_email(subject: str, body: str, recipient: str, html_body: str = None):
+    """
+    Send one email via AWS SES and return the SES response. botocore errors are
+    raised as-is so the outbox dispatcher can tell throttling from rejection.
+    """
+    message_body = {
+        'Text': {'Data': body}
+    }
+
+    if html_body:
+        message_body['Html'] = {'Data': html_body}
+
+    return get_client("ses").send_email(
+        Source=settings.SES_EMAIL,
+        Destination={'ToAddresses': [recipient]},
+        Message={
+            'Subject': {'Data': subject},
+            'Body': message_body
+        }
+    )
 
-# Initialize AWS SES client
-ses_client = boto3.client(
-    'ses',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.clean_region
-)
 
 def send_email(subject: str, body: str, recipient: str, html_body: str = None):
     """
@@ -19,24 +33,23 @@ def send_email(subject: str, body: str, recipient: str, html_body: str = None):
     :param recipient: Recipient email address
     :param html_body: Optional HTML version of the email
     """
-    try:
-        message_body = {
-            'Text': {'Data': body}
-        }
+    # botocore is imported on first use so app startup doesn't pay for it
+    from botocore.exceptions import BotoCoreError, NoCredentialsError, ClientError
 
-        if html_body:
-            message_body['Html'] = {'Data': html_body}
-
-        response = ses_client.send_email(
-            Source=settings.SES_EMAIL,
-            Destination={'ToAddresses': [recipient]},
-            Message={
-                'Subject': {'Data': subject},
-                'Body': message_body
-            }
-        )
-        return response
+    try:
+        return deliver_email(subject, body, recipient, html_body)
 
     except (BotoCoreError, NoCredentialsError, ClientError) as e:
         print("❌ Failed to send SES email:", str(e))
         raise Exception(f"SES email failed: {str(e)}")
+
+
+def get_send_rate() -> float:
+    """
+    The account's SES MaxSendRate (messages per second).
+    """
+    return float(get_client("ses").get_send_quota()["MaxSendRate"])
+
+
+# Awaitable version for async routers (runs on the AWS I/O executor)
+send_email_async = awaitable(send_email)
@@ -0,0 +1,271 @@
+import hashlib
+import html
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from app.config.settings import settings
+from app.config.aws_config import get_client
+from app.services.async_io import awaitable
+from app.services.db_service import query_exit_requests, MAX_PAGE_SIZE
+from app.services.email_outbox import TokenBucket, resolve_send_rate
+
+# -----------------------------
+# Registered Templates
+# Placeholders are {{name}}, the subset of SES (Handlebars) syntax that the
+# local renderer understands too, so one definition serves both the outbox
+# (rendered here) and bulk sends (rendered by SES). Missing values render empty.
+# -----------------------------
+EMAIL_TEMPLATES = {
+    "exit_request_submitted": {
+        "subject": "Exit Request Submitted",
+        "text": (
+            "Hi {{name}},\n\nYour exit request has been submitted successfully.\n"
+            "Request ID: {{request_id}}"
+        ),
+    },
+    "damage_report_submitted": {
+        "subject": "Damage Report Submitted",
+        "text": (
+            "Dear Tenant,\n\nYour damage report has been submitted.\n\n"
+            "Report ID: {{report_id}}\nEstimated Amount: ₹{{estimated_cost}}\n\nThank you."
+        ),
+    },
+    "inspection_schedule": {
+        "subject": "Move-out inspection for room {{room_number}}",
+        "text": (
+            "Hi {{name}},\n\nYour move-out inspection for room {{room_number}} is scheduled for "
+            "{{inspection_date}}.\n\n{{message}}\n\nThank you."
+        ),
+    },
+    "announcement": {
+        "subject": "{{subject}}",
+        "text": "Hi {{name}},\n\n{{message}}",
+    },
+}
+
+# SES bulk sends take at most 50 destinations per call
+BULK_BATCH_SIZE = 50
+
+# Exit request attributes available as template data for query-based broadcasts
+RECIPIENT_FIELDS = ["email", "name", "tenant_id", "request_id", "room_number", "exit_date", "request_status"]
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# =====================================================
+#                LOCAL RENDERING
+# =====================================================
+
+def _split(source: str) -> tuple:
+    # ("Hi ", "name", ",\n...") → literals at even indexes, placeholder names at odd ones
+    return tuple(_PLACEHOLDER.split(source))
+
+
+def _default_html(text: str) -> str:
+    # HTML part derived from the text one; placeholders survive the escaping untouched
+    return "<html><body>" + html.escape(text).replace("\n", "<br>\n") + "</body></html>"
+
+
+def get_template(name: str) -> dict:
+    if name not in EMAIL_TEMPLATES:
+        raise ValueError(f"Unknown email template '{name}'. Available: {sorted(EMAIL_TEMPLATES)}")
+    return EMAIL_TEMPLATES[name]
+
+
+@lru_cache(maxsize=None)
+def compile_template(name: str) -> dict:
+    """
+    Parse a registered template once: its parts, placeholder names, and the
+    versioned SES template name (changes to a template register a new version).
+    """
+    template = get_template(name)
+    parts = {
+        "subject": template["subject"],
+        "text": template["text"],
+        "html": template.get("html") or _default_html(template["text"]),
+    }
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return {
+        "name": name,
+        "parts": {part: _split(source) for part, source in parts.items()},
+        "sources": parts,
+        "placeholders": sorted({field for source in parts.values() for field in _PLACEHOLDER.findall(source)}),
+        "ses_name": f"{settings.EMAIL_TEMPLATE_PREFIX}{name}-{digest}",
+    }
+
+
+def _fill(pieces: tuple, data: dict, escape: bool) -> str:
+    out = []
+    for index, piece in enumerate(pieces):
+        if index % 2 == 0:
+            out.append(piece)
+            continue
+        value = data.get(piece)
+        value = "" if value is None else str(value)
+        out.append(html.escape(value) if escape else value)
+    return "".join(out)
+
+
+def render_email(name: str, data: dict) -> dict:
+    """
+    Render a registered template into send_email/enqueue_email keyword
+    arguments: {"subject", "body", "html_body"}.
+    """
+    parts = compile_template(name)["parts"]
+    return {
+        "subject": _fill(parts["subject"], data, escape=False),
+        "body": _fill(parts["text"], data, escape=False),
+        "html_body": _fill(parts["html"], data, escape=True),
+    }
+
+
+def list_templates() -> list:
+    return [
+        {"name": name, "subject": EMAIL_TEMPLATES[name]["subject"], "placeholders": compile_template(name)["placeholders"]}
+        for name in sorted(EMAIL_TEMPLATES)
+    ]
+
+# =====================================================
+#                SES TEMPLATES
+# Created on first use and remembered per process; the versioned name means an
+# existing template never needs updating.
+# =====================================================
+
+_registered = set()
+_registered_lock = threading.Lock()
+
+
+def ensure_ses_template(name: str) -> str:
+    from botocore.exceptions import ClientError
+
+    compiled = compile_template(name)
+    ses_name = compiled["ses_name"]
+    with _registered_lock:
+        if ses_name in _registered:
+            return ses_name
+        try:
+            get_client("ses").create_template(Template={
+                "TemplateName": ses_name,
+                "SubjectPart": compiled["sources"]["subject"],
+                "TextPart": compiled["sources"]["text"],
+                "HtmlPart": compiled["sources"]["html"],
+            })
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "AlreadyExists":
+                raise
+        _registered.add(ses_name)
+    return ses_name
+
+# =====================================================
+#                BROADCAST
+# =====================================================
+
+def _template_data(data: dict) -> str:
+    return json.dumps({key: "" if value is None else str(value) for key, value in data.items()})
+
+
+def resolve_recipients(recipients: list = None, status: str = None, room_number: str = None, tenant_id: str = None) -> list:
+    """
+    Explicit recipients ([{"email", "data"}]) or the exit requests matching the
+    filters, one entry per email address (first request wins).
+    """
+    resolved = {}
+    if recipients:
+        for recipient in recipients:
+            resolved.setdefault(recipient["email"].strip().lower(), {"email": recipient["email"], "data": recipient.get("data") or {}})
+    else:
+        if not (status or room_number or tenant_id):
+            raise ValueError("Give explicit recipients or at least one filter (status, room_number, tenant_id)")
+        next_token = None
+        while True:
+            page = query_exit_requests(
+                status=status,
+                tenant_id=tenant_id,
+                room_number=room_number,
+                limit=MAX_PAGE_SIZE,
+                next_token=next_token,
+                fields=RECIPIENT_FIELDS
+            )
+            for item in page["items"]:
+                if item.get("email"):
+                    resolved.setdefault(item["email"].strip().lower(), {"email": item["email"], "data": item})
+            next_token = page["next_token"]
+            if not next_token:
+                break
+    if len(resolved) > settings.BROADCAST_MAX_RECIPIENTS:
+        raise ValueError(f"Broadcast matches {len(resolved)} recipients; the limit is {settings.BROADCAST_MAX_RECIPIENTS}")
+    return list(resolved.values())
+
+
+def _send_bulk(ses_name: str, default_data: dict, batch: list) -> list:
+    """
+    One SendBulkTemplatedEmail call; throttled calls are retried with backoff.
+    Returns SES's per-destination statuses, in batch order.
+    """
+    from botocore.exceptions import ClientError
+
+    delay = 1.0
+    for attempt in range(settings.BROADCAST_MAX_ATTEMPTS):
+        try:
+            response = get_client("ses").send_bulk_templated_email(
+                Source=settings.SES_EMAIL,
+                Template=ses_name,
+                DefaultTemplateData=_template_data(default_data),
+                Destinations=[
+                    {
+                        "Destination": {"ToAddresses": [recipient["email"]]},
+                        "ReplacementTemplateData": _template_data(recipient["data"]),
+                    }
+                    for recipient in batch
+                ]
+            )
+            return response["Status"]
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code != "Throttling" or attempt == settings.BROADCAST_MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def broadcast_email(template: str, default_data: dict = None, recipients: list = None, **filters) -> dict:
+    """
+    Send a registered template to many recipients via SES bulk templated send,
+    BULK_BATCH_SIZE destinations per call. Batches are paced at the SES send
+    rate. Returns totals and one status entry per recipient.
+    """
+    ses_name = ensure_ses_template(template)
+    targets = resolve_recipients(recipients, **filters)
+    bucket = TokenBucket(resolve_send_rate(), capacity=BULK_BATCH_SIZE)
+    results = []
+    for start in range(0, len(targets), BULK_BATCH_SIZE):
+        batch = targets[start:start + BULK_BATCH_SIZE]
+        for _ in batch:
+            bucket.acquire()
+        try:
+            statuses = _send_bulk(ses_name, default_data or {}, batch)
+        except Exception as e:
+            statuses = [{"Status": "Failed", "Error": str(e)}] * len(batch)
+        for recipient, status in zip(batch, statuses):
+            results.append({
+                "email": recipient["email"],
+                "status": status.get("Status"),
+                "message_id": status.get("MessageId"),
+                "error": status.get("Error"),
+            })
+
+    sent = sum(1 for result in results if result["status"] == "Success")
+    print(f"📣 Broadcast '{template}': {sent}/{len(results)} accepted by SES")
+    return {
+        "template": template,
+        "total": len(results),
+        "sent": sent,
+        "failed": len(results) - sent,
+        "batches": (len(results) + BULK_BATCH_SIZE - 1) // BULK_BATCH_SIZE,
+        "results": results,
+    }
+
+
+# Awaitable version for async routers (runs on the AWS I/O executor)
+broadcast_email_async = awaitable(broadcast_email)
@@ -0,0 +1,68 @@
+import hashlib
+from fastapi import Request
+from fastapi.responses import Response
+from app.services.db_service import peek_collection_version, get_collection_version_async
+
+# Clients may reuse a response only after revalidating it with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+# =====================================================
+#                CONDITIONAL GET
+# ETags are "<collection>-<version>-<variant>": the version changes on every
+# write to the collection (see db_service), the variant is a hash of the path
+# and query string (plus the caller's scope, e.g. whose data it is), so each
+# filter/page/projection gets its own tag.
+# The version is read before the data, and a tenant-cache entry is only served
+# under a newer version once the tenant's own stored version shows no write
+# since the entry was loaded (see db_service), so a cached body is never older
+# than its tag.
+# =====================================================
+
+def make_etag(request: Request, collection: str, version: str, weak: bool = False, scope: str = None) -> str:
+    query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+    source = f"{request.url.path}?{query}" + (f"#{scope}" if scope else "")
+    variant = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    tag = f'"{collection}-{version}-{variant}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match uses the weak comparison: W/ prefixes are ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else {}
+
+
+async def conditional_get(request: Request, collection: str, weak: bool = False, scope: str = None):
+    """
+    Returns (etag, response): response is a ready 304 when the client's
+    If-None-Match still matches, else None and the route builds the body and
+    sends cache_headers(etag) with it. etag is None when the version can't be read.
+    """
+    version = peek_collection_version(collection)
+    if version is None:
+        try:
+            version = await get_collection_version_async(collection)
+        except Exception as e:
+            # Serve the full response untagged rather than fail the read
+            print(f"⚠️ Could not read {collection} version:", e)
+            return None, None
+    etag = make_etag(request, collection, version, weak=weak, scope=scope)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return etag, Response(status_code=304, headers=cache_headers(etag))
+    return etag, None
@@ -0,0 +1,216 @@
+import asyncio
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from app.config.settings import settings
+from app.services.codec import dumps
+
+# -----------------------------
+# Topics and Role Filtering
+# Event types are "<topic>.<change>", e.g. exit_request.status_changed.
+# Each role sees a set of topics and, optionally, only some fields of each
+# event; tenants additionally only see events for their own tenant_id.
+# -----------------------------
+TOPICS = ("exit_request", "damage_report")
+
+ROLE_TOPICS = {
+    "admin": {"exit_request", "damage_report"},
+    "landlord": {"exit_request"},
+    "tenant": {"exit_request", "damage_report"},
+}
+
+# None = every field
+ROLE_FIELDS = {
+    "admin": None,
+    "landlord": {"request_id", "tenant_id", "name", "room_number", "exit_date", "request_status", "previous_status"},
+    "tenant": None,
+}
+
+# =====================================================
+#                IN-PROCESS EVENT BUS
+# db_service publishes from executor threads; subscribers are SSE responses
+# on the event loop, so delivery hops threads with call_soon_threadsafe.
+# Recent events are kept in a ring buffer so a reconnecting client can resume
+# from Last-Event-ID. Events only reach clients of the worker that made the
+# change; with several workers, pin dashboards to one or reload on reconnect.
+# =====================================================
+
+class Subscription:
+    """
+    One connected client: its role/tenant filter and a bounded queue of events.
+    A client that falls max_queue events behind is cut off (`overflowed`) and
+    resumes from its Last-Event-ID when it reconnects.
+    """
+
+    def __init__(self, loop, role: str, tenant_id: str = None, topics: set = None, max_queue: int = None):
+        self.loop = loop
+        self.role = role
+        self.tenant_id = tenant_id
+        self.topics = ROLE_TOPICS[role] & (topics or ROLE_TOPICS[role])
+        self.fields = ROLE_FIELDS[role]
+        self.queue = asyncio.Queue(maxsize=max_queue or settings.EVENT_SUBSCRIBER_QUEUE)
+        self.overflowed = False
+
+    def accepts(self, event: dict) -> bool:
+        if event["topic"] not in self.topics:
+            return False
+        if self.role == "tenant" and event.get("tenant_id") != self.tenant_id:
+            return False
+        return True
+
+    def view(self, event: dict) -> dict:
+        if self.fields is None:
+            return event
+        return dict(event, data={key: value for key, value in event["data"].items() if key in self.fields})
+
+    def _offer(self, event: dict):
+        # Runs on the event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The queue is full, so the reader wakes up and sees the flag
+            self.overflowed = True
+
+    def deliver(self, event: dict):
+        if self.accepts(event):
+            self.loop.call_soon_threadsafe(self._offer, self.view(event))
+
+
+class EventBus:
+    def __init__(self, buffer_size: int = None):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._recent = deque(maxlen=buffer_size or settings.EVENT_BUFFER_SIZE)
+        self._ids = itertools.count(1)
+        self._listeners = []
+
+    def publish(self, event_type: str, key: str, data: dict, tenant_id: str = None) -> dict:
+        topic = event_type.split(".", 1)[0]
+        with self._lock:
+            event = {
+                "id": next(self._ids),
+                "type": event_type,
+                "topic": topic,
+                "key": key,
+                "tenant_id": tenant_id,
+                "data": data,
+                "at": datetime.utcnow().isoformat(),
+            }
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"❌ Event listener failed on {event_type}:", e)
+        for subscription in subscribers:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # Its event loop is closed (worker shutting down)
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, subscription: Subscription, last_event_id: int = None):
+        """
+        Register a subscription. Returns (missed, complete): the buffered events
+        after last_event_id that it should see, and whether that replay is
+        complete (False when the id predates the buffer or this process).
+        """
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return [], True
+            newest = self._recent[-1]["id"] if self._recent else 0
+            oldest = self._recent[0]["id"] if self._recent else newest + 1
+            complete = oldest - 1 <= last_event_id <= newest
+            missed = [event for event in self._recent if event["id"] > last_event_id] if complete else []
+        return [subscription.view(event) for event in missed if subscription.accepts(event)], complete
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def add_listener(self, listener):
+        """
+        Call listener(event) synchronously, on the publishing thread, for every
+        event; used by in-process consumers such as the search index.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def stats(self) -> dict:
+        with self._lock:
+            roles = {}
+            for subscription in self._subscribers:
+                roles[subscription.role] = roles.get(subscription.role, 0) + 1
+            return {
+                "subscribers": len(self._subscribers),
+                "by_role": roles,
+                "buffered_events": len(self._recent),
+                "last_event_id": self._recent[-1]["id"] if self._recent else 0,
+            }
+
+
+event_bus = EventBus()
+
+
+def publish_event(event_type: str, key: str, data: dict, tenant_id: str = None):
+    """
+    Publish a change; never raises, so a bus problem can't fail the write that caused it.
+    """
+    try:
+        event_bus.publish(event_type, key, data, tenant_id=tenant_id)
+    except Exception as e:
+        print(f"❌ Failed to publish {event_type}:", e)
+
+# -----------------------------
+# SSE Encoding
+# -----------------------------
+
+def format_sse(event: dict) -> bytes:
+    return (
+        f"id: {event['id']}\nevent: {event['type']}\ndata: ".encode("utf-8")
+        + dumps(event)
+        + b"\n\n"
+    )
+
+
+async def stream_events(subscription: Subscription, is_disconnected, last_event_id: int = None):
+    """
+    Yield SSE frames for a subscription until the client goes away: missed
+    events first (Last-Event-ID), then live ones, with a comment heartbeat so
+    proxies keep the connection open.
+    """
+    yield f"retry: {settings.EVENT_RETRY_MS}\n\n".encode("utf-8")
+    try:
+        missed, complete = event_bus.subscribe(subscription, last_event_id)
+        if not complete:
+            # Some changes can't be replayed: the client should reload its lists
+            yield b"event: resync\ndata: {}\n\n"
+        for event in missed:
+            yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield b": keep-alive\n\n"
+                continue
+            if subscription.overflowed:
+                # Too far behind: end the stream; the browser reconnects with Last-Event-ID
+                return
+            yield format_sse(event)
+    finally:
+        event_bus.unsubscribe(subscription)
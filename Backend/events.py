@@ -0,0 +1,61 @@
+import asyncio
+from fastapi import APIRouter, Request, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.services.event_bus import Subscription, stream_events, event_bus, ROLE_TOPICS, TOPICS
+
+router = APIRouter(tags=["Live Events"])  # Prefix handled in main.py
+
+# -----------------------------
+# 📡 GET /events/stream
+# Server-Sent Events: exit request and damage report changes as they happen.
+# What a client receives depends on its session role (see ROLE_TOPICS);
+# tenants only get events for their own requests and reports.
+# -----------------------------
+@router.get("/stream")
+async def event_stream(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated subset of exit_request,damage_report"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Subscribe to change events. Each frame's data is
+    {id, type, topic, key, tenant_id, data, at}; `data` holds the changed
+    fields only. Reconnects resume from Last-Event-ID; an `event: resync`
+    frame means some changes were missed and lists should be reloaded.
+    """
+    role = request.session.get("role")
+    if role not in ROLE_TOPICS:
+        raise HTTPException(status_code=401, detail="Login required")
+
+    wanted = None
+    if topics:
+        wanted = {topic.strip() for topic in topics.split(",") if topic.strip()}
+        unknown = wanted - set(TOPICS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown topics: {sorted(unknown)}")
+
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    subscription = Subscription(
+        asyncio.get_running_loop(),
+        role,
+        tenant_id=request.session.get("username"),
+        topics=wanted
+    )
+    return StreamingResponse(
+        stream_events(subscription, request.is_disconnected, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats")
+async def event_stats():
+    """
+    Connected subscribers per role and the replay buffer state for this worker.
+    """
+    return event_bus.stats()
@@ -1,17 +1,23 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Query, Request
 from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from uuid import uuid4
 from datetime import datetime
-import pandas as pd
-import io
 
-from app.services.s3_service import upload_file_to_s3
-from app.services.email_service import send_email
+from app.services.s3_service import upload_file_to_s3_async, resolve_content_type, UploadRejected
+from app.services.image_pipeline import schedule_derivatives
+from app.services.email_outbox import enqueue_email_async
+from app.services.email_templates import render_email
+from app.services.codec import DecimalJSONResponse
+from app.services.etag import conditional_get, cache_headers
+from app.services.export_service import detect_export_format, open_export, EXPORT_FORMATS
 from app.services.db_service import (
-    create_exit_request,
-    get_exit_requests_by_tenant,
-    update_exit_request_status
+    create_exit_request_async,
+    get_exit_requests_by_tenant_async,
+    update_exit_request_status_async,
+    update_exit_request_data,
+    VALID_EXIT_STATUSES,
+    parse_fields
 )
 
 router = APIRouter(tags=["Exit Requests"])  # Prefix handled in main.py
@@ -37,7 +43,7 @@ async def submit_exit_request(
         document_url = None
 
         if supporting_document:
-            document_url = upload_file_to_s3(supporting_document, folder="exit_docs")
+            document_url = await upload_file_to_s3_async(supporting_document, folder="exit_docs")
 
         request_data = {
             "request_id": request_id,
@@ -52,19 +58,26 @@ async def submit_exit_request(
             "submitted_at": datetime.utcnow().isoformat()
         }
 
-        create_exit_request(request_data)
+        await create_exit_request_async(request_data)
 
-        send_email(
-            subject="Exit Request Submitted",
-            body=f"Hi {name},\n\nYour exit request has been submitted successfully.\nRequest ID: {request_id}",
-            recipient=email
-        )
+        if document_url:
+            schedule_derivatives(
+                document_url,
+                "exit_docs",
+                resolve_content_type(supporting_document.filename, supporting_document.content_type),
+                on_ready=lambda urls: update_exit_request_data(request_id, urls)
+            )
+
+        # Queued: delivery (and any SES throttling) happens off the request path
+        await enqueue_email_async(recipient=email, **render_email("exit_request_submitted", request_data))
 
         return {
             "message": "Exit request submitted successfully",
             "request_id": request_id
         }
 
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit exit request: {str(e)}")
 
@@ -72,13 +85,22 @@ async def submit_exit_request(
 # GET: List Exit Requests for a Tenant
 # ------------------------------------------------------
 @router.get("/by-tenant/{tenant_id}")
-async def list_exit_requests(tenant_id: str):
+async def list_exit_requests(
+    request: Request,
+    tenant_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
     """
-    Get all exit requests submitted by a specific tenant.
+    Get all exit requests submitted by a specific tenant (304 on a matching If-None-Match).
     """
     try:
-        records = get_exit_requests_by_tenant(tenant_id)
-        return records
+        etag, not_modified = await conditional_get(request, "exit_requests")
+        if not_modified:
+            return not_modified
+        records = await get_exit_requests_by_tenant_async(tenant_id, fields=parse_fields(fields, "exit_tenant"))
+        return DecimalJSONResponse(records, headers=cache_headers(etag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch exit requests: {str(e)}")
 
@@ -86,27 +108,37 @@ async def list_exit_requests(tenant_id: str):
 # GET: Download CSV Report for Exit Requests
 # ------------------------------------------------------
 @router.get("/report/{tenant_id}")
-async def generate_exit_report(tenant_id: str):
+async def generate_exit_report(
+    request: Request,
+    tenant_id: str,
+    format: str = Query("csv", description="csv or ndjson"),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes, or 'summary'")
+):
     """
-    Download CSV report of all exit requests for a tenant.
+    Download a report of all exit requests for a tenant (CSV or NDJSON).
+    Streamed page by page from storage; weak ETag for conditional re-downloads.
     """
     try:
-        records = get_exit_requests_by_tenant(tenant_id)
-        if not records:
+        etag, not_modified = await conditional_get(request, "exit_requests", weak=True)
+        if not_modified:
+            return not_modified
+        fmt = detect_export_format(format)
+        chunks = await open_export("exit_requests", fmt, tenant_id=tenant_id, fields=parse_fields(fields, "exit_tenant"))
+        if chunks is None:
             raise HTTPException(status_code=404, detail="No exit records found.")
 
-        df = pd.DataFrame(records)
-        stream = io.StringIO()
-        df.to_csv(stream, index=False)
-        stream.seek(0)
-
         return StreamingResponse(
-            iter([stream.getvalue()]),
-            media_type="text/csv",
+            chunks,
+            media_type=EXPORT_FORMATS[fmt],
             headers={
-                "Content-Disposition": f"attachment; filename=exit_report_{tenant_id}.csv"
+                "Content-Disposition": f"attachment; filename=exit_report_{tenant_id}.{fmt}",
+                **cache_headers(etag)
             }
         )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
 
@@ -121,13 +153,11 @@ async def update_exit_status(
     """
     Update the status of an existing exit request.
     """
-    valid_statuses = {"Pending", "Approved", "Rejected"}
-
-    if new_status not in valid_statuses:
+    if new_status not in VALID_EXIT_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status value.")
 
     try:
-        update_exit_request_status(request_id, new_status)
+        await update_exit_request_status_async(request_id, new_status)
         return {"message": f"Request {request_id} updated to '{new_status}'."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update status: {str(e)}")
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import date
+from typing import List, Optional
 
 class ExitRequest(BaseModel):
     tenant_name: str = Field(..., example="John Doe")
@@ -7,3 +8,30 @@ class ExitRequest(BaseModel):
     flat_number: str = Field(..., example="A-101")
     exit_date: date = Field(..., example="2025-07-01")
     reason: str = Field(..., example="Relocation due to job change")
+
+
+class ExitRequestImport(ExitRequest):
+    """
+    One row of a bulk exit request import (CSV or NDJSON).
+    """
+    tenant_id: str = Field(..., example="T1001")
+    moveout_checklist: List[str] = Field(default_factory=list, example=["Keys returned", "Meter reading"])
+    move_in_date: Optional[date] = Field(None, example="2024-01-01")
+    landlord_id: Optional[str] = Field(None, example="L100")
+    property_id: Optional[str] = Field(None, example="P1")
+
+    @field_validator("moveout_checklist", mode="before")
+    @classmethod
+    def split_checklist(cls, value):
+        # CSV cells carry the checklist as "Keys returned;Meter reading"
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [entry.strip() for entry in value.split(";") if entry.strip()]
+        return value
+
+    @field_validator("move_in_date", "landlord_id", "property_id", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        # Empty CSV cells mean "not given"
+        return value or None
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain
+from uuid import uuid4
+from app.config.settings import settings
+from app.services.csv_export import format_cell
+from app.services.db_service import (
+    query_exit_requests,
+    iter_damage_report_pages,
+    get_status_counters,
+    SUMMARY_PROJECTIONS,
+    MAX_PAGE_SIZE
+)
+from app.services.export_service import encode_pages, export_columns, EXPORT_PAGE_SIZE
+from app.services.pdf_writer import PDFWriter, PDFTable
+from app.services.s3_service import S3MultipartWriter, generate_presigned_download_url
+
+# -----------------------------
+# Job Kinds
+# -----------------------------
+JOB_FORMATS = {
+    "csv": {"extension": "csv", "content_type": "text/csv"},
+    "pdf": {"extension": "pdf", "content_type": "application/pdf"},
+}
+
+JOB_REPORTS = {
+    "exit_requests": {
+        "title": "Exit Requests",
+        "filters": {"status", "tenant_id", "room_number"},
+        "pdf_columns": SUMMARY_PROJECTIONS["exit_admin"],
+    },
+    "damage_reports": {
+        "title": "Damage Reports",
+        "filters": {"tenant_id"},
+        "pdf_columns": SUMMARY_PROJECTIONS["damage"],
+    },
+}
+
+# =====================================================
+#                JOB REGISTRY
+# Jobs live in this worker's memory (like the tenant cache); the rendered
+# artifacts live in S3 under exports/.
+# =====================================================
+
+_jobs = {}
+_fingerprints = {}
+_lock = threading.Lock()
+_pool = None
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    # Separate from the AWS I/O executor so long renders never starve request handlers
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.EXPORT_JOB_WORKERS, thread_name_prefix="export-job")
+        return _pool
+
+
+def shutdown_export_jobs():
+    """
+    Stop the worker pool on app shutdown; queued jobs are dropped.
+    """
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _fingerprint(report: str, fmt: str, filters: dict, fields: list) -> str:
+    canonical = json.dumps([report, fmt, filters, fields or []], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _prune(now: float):
+    for job_id, job in list(_jobs.items()):
+        if job["finished_at"] and now - job["finished_at"] > settings.EXPORT_JOB_RETENTION_SECONDS:
+            _jobs.pop(job_id)
+            if _fingerprints.get(job["fingerprint"]) == job_id:
+                _fingerprints.pop(job["fingerprint"])
+
+
+def submit_export_job(report: str, fmt: str, filters: dict = None, fields: list = None) -> dict:
+    """
+    Queue an export and return its job. An identical request that is still running,
+    or that finished within EXPORT_JOB_CACHE_SECONDS, returns the existing job
+    (and artifact) instead of rendering again.
+    """
+    if report not in JOB_REPORTS:
+        raise ValueError(f"Unknown report '{report}'. Available: {sorted(JOB_REPORTS)}")
+    fmt = (fmt or "").lower()
+    if fmt not in JOB_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use csv or pdf.")
+    filters = {name: value for name, value in (filters or {}).items() if value}
+    unknown = set(filters) - JOB_REPORTS[report]["filters"]
+    if unknown:
+        raise ValueError(f"Unsupported filters for {report}: {sorted(unknown)}")
+
+    fingerprint = _fingerprint(report, fmt, filters, fields)
+    now = time.time()
+    with _lock:
+        _prune(now)
+        existing = _jobs.get(_fingerprints.get(fingerprint))
+        if existing and (
+            existing["status"] in {"queued", "running"}
+            or (existing["status"] == "completed" and now - existing["finished_at"] <= settings.EXPORT_JOB_CACHE_SECONDS)
+        ):
+            return dict(_snapshot(existing), reused=True)
+
+        job_id = str(uuid4())
+        job = {
+            "job_id": job_id,
+            "report": report,
+            "format": fmt,
+            "filters": filters,
+            "fields": fields,
+            "fingerprint": fingerprint,
+            "status": "queued",
+            "rows_written": 0,
+            "pages_read": 0,
+            "bytes_written": 0,
+            "total_estimate": None,
+            "error": None,
+            "s3_key": f"exports/{job_id}.{JOB_FORMATS[fmt]['extension']}",
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        _jobs[job_id] = job
+        _fingerprints[fingerprint] = job_id
+
+    _get_pool().submit(_run_job, job)
+    return dict(_snapshot(job), reused=False)
+
+
+def _iso(timestamp):
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+def _snapshot(job: dict) -> dict:
+    total = job["total_estimate"]
+    progress = None
+    if job["status"] == "completed":
+        progress = 1.0
+    elif total:
+        progress = round(min(job["rows_written"] / total, 0.99), 4)
+    return {
+        "job_id": job["job_id"],
+        "report": job["report"],
+        "format": job["format"],
+        "filters": job["filters"],
+        "status": job["status"],
+        "rows_written": job["rows_written"],
+        "pages_read": job["pages_read"],
+        "bytes_written": job["bytes_written"],
+        "total_estimate": total,
+        "progress": progress,
+        "error": job["error"],
+        "created_at": _iso(job["created_at"]),
+        "started_at": _iso(job["started_at"]),
+        "finished_at": _iso(job["finished_at"]),
+    }
+
+
+def get_export_job(job_id: str) -> dict:
+    """
+    Current state of a job; completed jobs include a fresh presigned download_url.
+    Returns None for unknown (or pruned) jobs.
+    """
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = _snapshot(job)
+    if snapshot["status"] == "completed":
+        filename = f"{job['report']}_{job_id[:8]}.{JOB_FORMATS[job['format']]['extension']}"
+        snapshot["download_url"] = generate_presigned_download_url(job["s3_key"], filename=filename)
+        snapshot["expires_in"] = settings.EXPORT_URL_EXPIRY_SECONDS
+    return snapshot
+
+# =====================================================
+#                RENDERING
+# =====================================================
+
+def _iter_report_pages(report: str, filters: dict, fields: list):
+    """
+    Paginated reads for a report; exit filters go through the same indexed
+    query as the admin listing.
+    """
+    if report == "exit_requests":
+        next_token = None
+        while True:
+            page = query_exit_requests(
+                status=filters.get("status"),
+                tenant_id=filters.get("tenant_id"),
+                room_number=filters.get("room_number"),
+                limit=MAX_PAGE_SIZE,
+                next_token=next_token,
+                fields=fields
+            )
+            if page["items"]:
+                yield page["items"]
+            next_token = page["next_token"]
+            if not next_token:
+                return
+    else:
+        yield from iter_damage_report_pages(page_size=EXPORT_PAGE_SIZE, tenant_id=filters.get("tenant_id"), fields=fields)
+
+
+def _estimate_total(report: str, filters: dict):
+    # The status counters give exact totals for unfiltered or status-only exit exports
+    if report != "exit_requests" or set(filters) - {"status"}:
+        return None
+    counters = get_status_counters()
+    if "status" in filters:
+        return counters["statuses"].get(filters["status"], 0)
+    return counters["total_requests"]
+
+
+def _counted(job: dict, pages):
+    for page in pages:
+        job["pages_read"] += 1
+        yield page
+        job["rows_written"] += len(page)
+
+
+def _render_csv(job: dict, pages, sink):
+    first = next(pages, None)
+    columns = export_columns(job["report"], first, job["fields"])
+    for chunk in encode_pages(chain([first] if first else [], pages), "csv", columns):
+        sink.write(chunk)
+        job["bytes_written"] = sink.bytes_written
+
+
+def _render_pdf(job: dict, pages, sink):
+    spec = JOB_REPORTS[job["report"]]
+    columns = job["fields"] or spec["pdf_columns"]
+    scope = ", ".join(f"{name}={value}" for name, value in sorted(job["filters"].items())) or "all"
+    title = f"{spec['title']} ({scope}) - generated {datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC"
+    table = PDFTable(PDFWriter(sink), title, columns)
+    for page in pages:
+        for item in page:
+            table.add_row([format_cell(item.get(name)) for name in columns])
+        job["bytes_written"] = sink.bytes_written
+    table.close()
+
+
+def _run_job(job: dict):
+    job["status"] = "running"
+    job["started_at"] = time.time()
+    try:
+        job["total_estimate"] = _estimate_total(job["report"], job["filters"])
+        pages = _counted(job, _iter_report_pages(job["report"], job["filters"], job["fields"]))
+        with S3MultipartWriter(job["s3_key"], content_type=JOB_FORMATS[job["format"]]["content_type"]) as sink:
+            if job["format"] == "pdf":
+                _render_pdf(job, pages, sink)
+            else:
+                _render_csv(job, pages, sink)
+        job["bytes_written"] = sink.bytes_written
+        job["status"] = "completed"
+        print(f"✅ Export job {job['job_id']} finished: {job['rows_written']} rows, {job['bytes_written']} bytes")
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+        print(f"❌ Export job {job['job_id']} failed:", e)
+    finally:
+        job["finished_at"] = time.time()
@@ -0,0 +1,93 @@
+from itertools import chain
+from app.services.async_io import run_blocking
+from app.services.codec import dumps
+from app.services.csv_export import iter_csv, infer_columns
+from app.services.db_service import iter_exit_request_pages, iter_damage_report_pages
+
+# Items read per storage round trip; peak memory is about one page
+EXPORT_PAGE_SIZE = 500
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# -----------------------------
+# Export Collections
+# CSV needs its header before the first row, so the columns are inferred from
+# the first page (which is read up front anyway) instead of the whole table:
+# these columns lead, in this order, then the page's other attributes in
+# first-seen order. Attributes that only appear after the first page are not
+# exported; pass fields= to pin the columns. NDJSON always carries each item
+# as stored.
+# -----------------------------
+EXPORT_COLLECTIONS = {
+    "exit_requests": {
+        "pages": iter_exit_request_pages,
+        "columns": [
+            "request_id", "tenant_id", "name", "email", "room_number", "exit_reason",
+            "exit_date", "request_status", "submitted_at", "moveout_checklist",
+            "supporting_document_url", "admin_notes"
+        ],
+    },
+    "damage_reports": {
+        "pages": iter_damage_report_pages,
+        "columns": [
+            "report_id", "tenant_id", "room_number", "estimated_cost",
+            "damaged_items", "document_url", "reported_at"
+        ],
+    },
+}
+
+
+def detect_export_format(fmt: str) -> str:
+    fmt = (fmt or "csv").lower()
+    if fmt in {"jsonl", "json"}:
+        fmt = "ndjson"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Use csv or ndjson.")
+    return fmt
+
+
+def export_filename(collection: str, fmt: str, tenant_id: str = None) -> str:
+    scope = tenant_id or "all"
+    return f"{collection}_{scope}.{'csv' if fmt == 'csv' else 'ndjson'}"
+
+
+def export_columns(collection: str, first_page: list, fields: list = None) -> list:
+    """
+    CSV columns for an export: the caller's fields, else inferred from the first page.
+    """
+    if fields:
+        return fields
+    preferred = EXPORT_COLLECTIONS[collection]["columns"]
+    return infer_columns(first_page or [], preferred=preferred) or preferred
+
+
+def encode_pages(pages, fmt: str, columns: list = None):
+    """
+    Encode pages of items as they arrive, one bytes chunk per page.
+    """
+    if fmt == "ndjson":
+        for page in pages:
+            yield b"".join(dumps(item) + b"\n" for item in page)
+        return
+
+    yield "".join(iter_csv([], columns)).encode("utf-8")
+    for page in pages:
+        yield "".join(iter_csv(page, columns, header=False, chunk_rows=len(page))).encode("utf-8")
+
+
+async def open_export(collection: str, fmt: str, tenant_id: str = None, fields: list = None, allow_empty: bool = False):
+    """
+    Start an export and return its chunk iterator. The first page is read up front
+    (on the AWS I/O executor) so storage errors, and an empty result when
+    allow_empty is False (returns None), surface before any bytes are sent.
+    """
+    spec = EXPORT_COLLECTIONS[collection]
+    pages = spec["pages"](page_size=EXPORT_PAGE_SIZE, tenant_id=tenant_id, fields=fields)
+    first = await run_blocking(next, pages, None)
+    if first is None and not allow_empty:
+        return None
+    columns = export_columns(collection, first, fields)
+    return encode_pages(chain([first] if first else [], pages), fmt, columns)
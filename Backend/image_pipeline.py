@@ -0,0 +1,160 @@
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.config.settings import settings
+from app.config.aws_config import get_client
+from app.services.s3_service import object_url, key_from_url, object_exists
+
+# -----------------------------
+# Derivatives
+# Written next to the original: damage_docs/sha256/ab12.jpg →
+# damage_docs/sha256/ab12.thumb.jpg and damage_docs/sha256/ab12.web.jpg
+# -----------------------------
+DERIVATIVES = ("thumb", "web")
+DERIVATIVE_CONTENT_TYPE = "image/jpeg"
+
+# Originals are content-addressed or uuid-named, so derivatives never change under the same key
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# =====================================================
+#                IMAGE PIPELINE
+# Resizing is CPU-bound, so it runs in a process pool; a small thread pool
+# does the S3 reads/writes around it. Nothing here runs on the request path:
+# routers call schedule_derivatives() after the upload and return.
+# Pillow is optional and only imported in the worker processes; without it
+# the pipeline is disabled and listings fall back to the original URL.
+# =====================================================
+
+_lock = threading.Lock()
+_process_pool = None
+_io_pool = None
+_available = None
+
+
+def pipeline_available() -> bool:
+    global _available
+    if _available is None:
+        import importlib.util
+
+        _available = settings.IMAGE_PIPELINE_ENABLED and importlib.util.find_spec("PIL") is not None
+        if settings.IMAGE_PIPELINE_ENABLED and not _available:
+            print("⚠️ Pillow is not installed; image thumbnails are disabled")
+    return _available
+
+
+def is_pipeline_image(folder: str, content_type: str) -> bool:
+    return folder in settings.IMAGE_PIPELINE_FOLDERS and content_type in settings.IMAGE_PIPELINE_TYPES
+
+
+def _get_pools():
+    global _process_pool, _io_pool
+    with _lock:
+        if _process_pool is None:
+            # spawn, not fork: the API process holds threads and open connections
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PIPELINE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _io_pool = ThreadPoolExecutor(max_workers=settings.IMAGE_PIPELINE_WORKERS, thread_name_prefix="image-io")
+        return _process_pool, _io_pool
+
+
+def shutdown_image_pipeline():
+    """
+    Stop both pools on app shutdown; queued images are dropped.
+    """
+    global _process_pool, _io_pool
+    with _lock:
+        if _process_pool is not None:
+            _io_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = _io_pool = None
+
+
+def derivative_key(key: str, name: str) -> str:
+    stem, slash, filename = key.rpartition("/")
+    base = filename.rsplit(".", 1)[0] if "." in filename else filename
+    return f"{stem}{slash}{base}.{name}.jpg"
+
+
+# -----------------------------
+# Worker (runs in the process pool)
+# -----------------------------
+
+def _encode(image, max_size: int, quality: int) -> bytes:
+    copy = image.copy()
+    copy.thumbnail((max_size, max_size))
+    buffer = io.BytesIO()
+    # No exif= argument: EXIF (GPS, device serials) is dropped from the output
+    copy.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def render_derivatives(data: bytes, thumb_size: int, web_size: int, web_quality: int, thumb_quality: int) -> dict:
+    """
+    Decode an image and return {"thumb": bytes, "web": bytes} as JPEG.
+    The EXIF orientation is applied to the pixels before the metadata is dropped,
+    so phone photos stay upright.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.mode != "RGB":
+            # JPEG has no alpha: flatten onto white rather than black
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        return {
+            "thumb": _encode(image, thumb_size, thumb_quality),
+            "web": _encode(image, web_size, web_quality),
+        }
+
+# -----------------------------
+# Coordinator (runs on the image-io threads)
+# -----------------------------
+
+def _process(key: str, on_ready):
+    keys = {name: derivative_key(key, name) for name in DERIVATIVES}
+    client = get_client("s3")
+    try:
+        # Deduplicated originals are shared between reports: render once
+        if not all(object_exists(derived) for derived in keys.values()):
+            original = client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=key)["Body"].read()
+            process_pool, _ = _get_pools()
+            rendered = process_pool.submit(
+                render_derivatives,
+                original,
+                settings.IMAGE_THUMBNAIL_SIZE,
+                settings.IMAGE_WEB_MAX_SIZE,
+                settings.IMAGE_WEB_QUALITY,
+                settings.IMAGE_THUMBNAIL_QUALITY
+            ).result()
+            for name, body in rendered.items():
+                client.put_object(
+                    Bucket=settings.S3_BUCKET_NAME,
+                    Key=keys[name],
+                    Body=body,
+                    ContentType=DERIVATIVE_CONTENT_TYPE,
+                    CacheControl=DERIVATIVE_CACHE_CONTROL
+                )
+            print(f"🖼️ Derivatives for {key}: " + ", ".join(f"{name} {len(body)} bytes" for name, body in rendered.items()))
+        if on_ready:
+            on_ready({"thumbnail_url": object_url(keys["thumb"]), "preview_url": object_url(keys["web"])})
+    except Exception as e:
+        print(f"❌ Image pipeline failed for {key}:", e)
+
+
+def schedule_derivatives(file_url: str, folder: str, content_type: str, on_ready=None) -> bool:
+    """
+    Queue thumbnail/web rendering for an uploaded image and return immediately.
+    on_ready(urls) is called from a pipeline thread with
+    {"thumbnail_url", "preview_url"} once both derivatives are stored.
+    Returns False (and does nothing) for non-image uploads or when Pillow is missing.
+    """
+    if not file_url or not is_pipeline_image(folder, content_type) or not pipeline_available():
+        return False
+    _, io_pool = _get_pools()
+    io_pool.submit(_process, key_from_url(file_url), on_ready)
+    return True
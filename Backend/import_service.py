@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.models.exit_request import ExitRequestImport
+from app.models.damage_report import DamageReportImport
+from app.services.db_service import (
+    batch_create_exit_requests,
+    batch_create_damage_reports,
+    BATCH_WRITE_SIZE
+)
+from app.services.codec import to_dynamo
+
+SUPPORTED_FORMATS = {"csv", "ndjson"}
+
+# -----------------------------
+# Row Readers (streaming)
+# -----------------------------
+
+def detect_format(filename: str, requested: str = None) -> str:
+    """
+    Pick the import format from the explicit parameter or the file extension.
+    """
+    fmt = (requested or (filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt in {"jsonl", "json"}:
+        fmt = "ndjson"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}'. Use csv or ndjson.")
+    return fmt
+
+
+def iter_rows(binary_file, fmt: str):
+    """
+    Yield (row_number, row) pairs one line at a time from an uploaded file.
+    A row that can't be parsed is yielded as an Exception instead of a dict.
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                yield row_number, {key: value for key, value in row.items() if value not in (None, "")}
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row_number, ValueError(f"Invalid JSON: {e.msg}")
+    finally:
+        # Leave the underlying upload open; FastAPI closes it
+        text.detach()
+
+# -----------------------------
+# Row → DynamoDB Item
+# -----------------------------
+
+def exit_item_from_row(row: dict) -> dict:
+    record = ExitRequestImport.model_validate(row)
+    item = {
+        "request_id": str(uuid4()),
+        "tenant_id": record.tenant_id,
+        "name": record.tenant_name,
+        "room_number": record.flat_number,
+        "exit_reason": record.reason,
+        "exit_date": record.exit_date.isoformat(),
+        "moveout_checklist": record.moveout_checklist,
+        "supporting_document_url": None,
+        "email": record.email,
+        "request_status": "Pending",
+        "submitted_at": datetime.utcnow().isoformat()
+    }
+    # Optional: requests without landlord_id/property_id belong to the defaults
+    if record.move_in_date:
+        item["move_in_date"] = record.move_in_date.isoformat()
+    if record.landlord_id:
+        item["landlord_id"] = record.landlord_id
+    if record.property_id:
+        item["property_id"] = record.property_id
+    return item
+
+
+def damage_item_from_row(row: dict) -> dict:
+    if isinstance(row.get("damaged_items"), str):
+        # CSV cells carry the item list as JSON: [{"item": "Door", "price": 1200}]
+        row = dict(row, damaged_items=json.loads(row["damaged_items"]))
+    record = DamageReportImport.model_validate(row)
+    return {
+        "report_id": str(uuid4()),
+        "tenant_id": record.tenant_id,
+        "room_number": record.room_number,
+        "damaged_items": to_dynamo([item.model_dump() for item in record.damaged_items]),
+        "estimated_cost": to_dynamo(record.total_estimated),
+        "document_url": None,
+        "reported_at": datetime.utcnow().isoformat()
+    }
+
+
+IMPORT_KINDS = {
+    "exit_requests": (exit_item_from_row, batch_create_exit_requests, "request_id"),
+    "damage_reports": (damage_item_from_row, batch_create_damage_reports, "report_id"),
+}
+
+# -----------------------------
+# Import Pipeline
+# -----------------------------
+
+def _flush(chunk, writer, id_field):
+    try:
+        failed = writer([item for _, item in chunk])
+        error = "write failed after retries"
+    except Exception as e:
+        failed = {item[id_field] for _, item in chunk}
+        error = str(e)
+
+    for row_number, item in chunk:
+        if item[id_field] in failed:
+            yield {"row": row_number, "status": "error", "errors": [error]}
+        else:
+            yield {"row": row_number, "status": "ok", id_field: item[id_field]}
+
+
+def import_records(binary_file, fmt: str, kind: str):
+    """
+    Validate and bulk-write rows in chunks of BATCH_WRITE_SIZE, yielding one NDJSON
+    result line per row as soon as its chunk is written, then a summary line.
+    Only one chunk is held in memory at a time.
+    """
+    to_item, writer, id_field = IMPORT_KINDS[kind]
+    chunk = []
+    totals = {"ok": 0, "error": 0}
+
+    def emit(result):
+        totals[result["status"]] += 1
+        return json.dumps(result) + "\n"
+
+    for row_number, row in iter_rows(binary_file, fmt):
+        try:
+            if isinstance(row, Exception):
+                raise row
+            chunk.append((row_number, to_item(row)))
+        except ValidationError as e:
+            errors = [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+            yield emit({"row": row_number, "status": "error", "errors": errors})
+            continue
+        except (ValueError, TypeError) as e:
+            yield emit({"row": row_number, "status": "error", "errors": [str(e)]})
+            continue
+
+        if len(chunk) == BATCH_WRITE_SIZE:
+            for result in _flush(chunk, writer, id_field):
+                yield emit(result)
+            chunk = []
+
+    if chunk:
+        for result in _flush(chunk, writer, id_field):
+            yield emit(result)
+
+    yield json.dumps({"summary": {"imported": totals["ok"], "failed": totals["error"]}}) + "\n"
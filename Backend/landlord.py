@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from typing import Optional
+from datetime import date
+from app.services.codec import DecimalJSONResponse
+from app.services.etag import conditional_get, cache_headers
+from app.services.db_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.landlord_views import read_landlord_view_async, VIEW_COLLECTION
 
 # ❌ Removed redundant prefix
 router = APIRouter(tags=["Landlord"])
@@ -7,59 +12,109 @@ router = APIRouter(tags=["Landlord"])
 # -----------------------------
 # 🔐 Dependency: Role-based Access
 # -----------------------------
-def require_landlord_role(request: Request) -> bool:
+def require_landlord_role(request: Request) -> str:
     """
-    Only allow access if the session role is 'landlord'.
+    Only allow access if the session role is 'landlord'; returns the landlord_id
+    set at login, whose views the session may read.
     """
     role = request.session.get("role")
     if role != "landlord":
         raise HTTPException(status_code=403, detail="Access forbidden: Landlord only")
-    return True
+    landlord_id = request.session.get("landlord_id")
+    if not landlord_id:
+        raise HTTPException(status_code=403, detail="No landlord account is linked to this login")
+    return landlord_id
 
 # -----------------------------
-# 📄 Mock Data (Replace with DB fetch)
+# 📄 Shared Read
+# Views are materialized projections of exit requests (see landlord_views),
+# one range read per page
 # -----------------------------
-approved_exits = [
-    {"name": "John Doe", "room_number": "A101", "exit_date": "2025-06-10"},
-    {"name": "Priya Singh", "room_number": "B202", "exit_date": "2025-06-15"},
-]
-
-room_history = [
-    {"room_number": "A101", "tenant_name": "John Doe", "move_in": "2024-01-01", "move_out": "2025-06-10"},
-    {"room_number": "B202", "tenant_name": "Priya Singh", "move_in": "2023-11-01", "move_out": "2025-06-15"},
-]
-
-move_timeline = [
-    {"date": "2025-06-10", "description": "John Doe moved out of Room A101"},
-    {"date": "2025-06-15", "description": "Priya Singh moved out of Room B202"},
-]
+async def _read_view(
+    request: Request,
+    view: str,
+    landlord_id: str,
+    property_id: Optional[str],
+    limit: int,
+    next_token: Optional[str],
+    order: Optional[str],
+    since: Optional[date],
+    until: Optional[date]
+):
+    try:
+        etag, not_modified = await conditional_get(request, VIEW_COLLECTION, scope=landlord_id)
+        if not_modified:
+            return not_modified
+        page = await read_landlord_view_async(
+            view,
+            landlord_id=landlord_id,
+            property_id=property_id,
+            limit=limit,
+            next_token=next_token,
+            order=order,
+            since=since,
+            until=until
+        )
+        return DecimalJSONResponse(page, headers=cache_headers(etag))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ Error reading landlord view {view}:", e)
+        raise HTTPException(status_code=500, detail="Failed to load landlord view")
 
 # -----------------------------
 # 📤 GET /landlord/approved-exits
 # -----------------------------
-@router.get("/approved-exits", response_model=List[Dict[str, Any]])
-def get_approved_exits(allowed: bool = Depends(require_landlord_role)):
+@router.get("/approved-exits")
+async def get_approved_exits(
+    request: Request,
+    property_id: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None),
+    order: Optional[str] = Query(None, description="'asc' (default) or 'desc' by exit date"),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    landlord_id: str = Depends(require_landlord_role)
+):
     """
-    Return a list of approved tenant exit requests.
+    Approved exit requests ordered by exit date, one page at a time.
     """
-    return approved_exits
+    return await _read_view(request, "approved_exits", landlord_id, property_id, limit, next_token, order, since, until)
 
 # -----------------------------
 # 🏘️ GET /landlord/room-history
 # -----------------------------
-@router.get("/room-history", response_model=List[Dict[str, Any]])
-def get_room_history(allowed: bool = Depends(require_landlord_role)):
+@router.get("/room-history")
+async def get_room_history(
+    request: Request,
+    property_id: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None),
+    order: Optional[str] = Query(None, description="'desc' (default) or 'asc' by move-out date"),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    landlord_id: str = Depends(require_landlord_role)
+):
     """
-    Return historical room occupancy details.
+    Room occupancy history ordered by move-out date (planned or recorded).
     """
-    return room_history
+    return await _read_view(request, "room_history", landlord_id, property_id, limit, next_token, order, since, until)
 
 # -----------------------------
 # 🕓 GET /landlord/move-timeline
 # -----------------------------
-@router.get("/move-timeline", response_model=List[Dict[str, Any]])
-def get_move_timeline(allowed: bool = Depends(require_landlord_role)):
+@router.get("/move-timeline")
+async def get_move_timeline(
+    request: Request,
+    property_id: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    next_token: Optional[str] = Query(None),
+    order: Optional[str] = Query(None, description="'desc' (default) or 'asc' by date"),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    landlord_id: str = Depends(require_landlord_role)
+):
     """
-    Return tenant movement timeline entries.
+    Move-ins, approvals, scheduled and recorded move-outs, newest first.
     """
-    return move_timeline
+    return await _read_view(request, "move_timeline", landlord_id, property_id, limit, next_token, order, since, until)
@@ -0,0 +1,212 @@
+import time
+from app.config.settings import settings
+from app.services.async_io import awaitable
+from app.services.event_bus import event_bus
+from app.services.db_service import (
+    get_exit_request,
+    iter_exit_request_pages,
+    replace_landlord_view_entries,
+    page_landlord_view,
+    bump_collection_version
+)
+
+# -----------------------------
+# Views
+# Entries live under view_key "<view>#<landlord_id>#<property_id>" and sort by
+# sort_key "<YYYY-MM-DD>#<entry id>", so each page is one range read in date
+# order. Requests without landlord_id/property_id belong to the defaults.
+# -----------------------------
+LANDLORD_VIEWS = {
+    "approved_exits": {"order": "asc"},   # upcoming exits first
+    "room_history": {"order": "desc"},    # most recent move-out first
+    "move_timeline": {"order": "desc"},
+}
+
+# Exit request fields the views are derived from: a change to any of them re-projects the request
+PROJECTED_FIELDS = {
+    "request_status", "status_updated_at", "exit_date", "moved_out_at", "move_in_date",
+    "name", "room_number", "tenant_id", "landlord_id", "property_id",
+}
+
+# ETag collection: bumped after the entries are written, so a 304 never hides a change
+VIEW_COLLECTION = "landlord_views"
+
+INTERNAL_KEYS = ("view_key", "sort_key", "source_id")
+PAGE_SCAN_SIZE = 500
+
+
+def view_key(view: str, landlord_id: str = None, property_id: str = None) -> str:
+    return f"{view}#{landlord_id or settings.DEFAULT_LANDLORD_ID}#{property_id or settings.DEFAULT_PROPERTY_ID}"
+
+
+def _day(value) -> str:
+    # ISO date or datetime → "YYYY-MM-DD"
+    return str(value)[:10] if value else None
+
+# =====================================================
+#                PROJECTION
+# =====================================================
+
+def project_exit_request(item: dict) -> list:
+    """
+    The view entries an exit request contributes. Approved requests appear in
+    approved_exits, room_history (with their exit date as the planned move-out)
+    and move_timeline; a recorded move-out (moved_out_at) keeps a request in
+    room_history and move_timeline whatever its status.
+    """
+    request_id = item["request_id"]
+    approved = item.get("request_status") == "Approved"
+    moved_out = _day(item.get("moved_out_at"))
+    if not (approved or moved_out):
+        return []
+
+    name, room = item.get("name"), item.get("room_number")
+    exit_date = _day(item.get("exit_date"))
+    approved_on = _day(item.get("status_updated_at")) if approved else None
+    landlord_id, property_id = item.get("landlord_id"), item.get("property_id")
+    common = {"request_id": request_id, "tenant_id": item.get("tenant_id"), "property_id": property_id or settings.DEFAULT_PROPERTY_ID}
+
+    def entry(view: str, day: str, entry_id: str, data: dict) -> dict:
+        return {
+            "view_key": view_key(view, landlord_id, property_id),
+            "sort_key": f"{day}#{entry_id}",
+            "source_id": request_id,
+            **common,
+            **data,
+        }
+
+    entries = []
+    if approved:
+        day = exit_date or approved_on or _day(item.get("submitted_at"))
+        entries.append(entry("approved_exits", day, request_id, {
+            "name": name,
+            "room_number": room,
+            "exit_date": exit_date,
+            "approved_at": item.get("status_updated_at"),
+            "moved_out_at": moved_out,
+        }))
+
+    move_out = moved_out or exit_date
+    if move_out:
+        entries.append(entry("room_history", move_out, request_id, {
+            "room_number": room,
+            "tenant_name": name,
+            "move_in": _day(item.get("move_in_date")),
+            "move_out": move_out,
+            "moved_out": bool(moved_out),
+        }))
+
+    timeline = []
+    if item.get("move_in_date"):
+        timeline.append((_day(item["move_in_date"]), "move_in", f"{name} moved into Room {room}"))
+    if approved_on:
+        timeline.append((approved_on, "exit_approved", f"Exit of {name} from Room {room} approved"))
+    if moved_out:
+        timeline.append((moved_out, "moved_out", f"{name} moved out of Room {room}"))
+    elif approved and exit_date:
+        timeline.append((exit_date, "move_out_scheduled", f"{name} is scheduled to move out of Room {room}"))
+    for day, kind, description in timeline:
+        entries.append(entry("move_timeline", day, f"{request_id}:{kind}", {
+            "date": day,
+            "type": kind,
+            "description": description,
+            "room_number": room,
+            "tenant_name": name,
+        }))
+    return entries
+
+
+def refresh_exit_request_views(request_id: str = None, item: dict = None) -> int:
+    """
+    Re-derive one exit request's entries and replace its old ones (including
+    entries under a previous landlord/property). Returns the number of entries.
+    """
+    item = item or get_exit_request(request_id)
+    if item is None:
+        return 0
+    entries = project_exit_request(item)
+    replace_landlord_view_entries(item["request_id"], entries)
+    bump_collection_version(VIEW_COLLECTION)
+    return len(entries)
+
+
+def backfill_landlord_views() -> dict:
+    """
+    Rebuild every request's entries from the exit table. Idempotent, and safe
+    while the API is serving: each request's entries are replaced on their own.
+    """
+    started = time.perf_counter()
+    requests = entries = 0
+    for page in iter_exit_request_pages(page_size=PAGE_SCAN_SIZE):
+        for item in page:
+            projected = project_exit_request(item)
+            replace_landlord_view_entries(item["request_id"], projected)
+            requests += 1
+            entries += len(projected)
+    bump_collection_version(VIEW_COLLECTION)
+    return {"requests": requests, "entries": entries, "seconds": round(time.perf_counter() - started, 3)}
+
+# =====================================================
+#                INCREMENTAL UPDATES
+# Driven by the event bus on the thread that made the write, so entries are
+# current before the admin's request returns. Only changes that can affect a
+# view are projected: status moves into or out of Approved, and updates to
+# PROJECTED_FIELDS (exit date, move-out, ...). Bulk imports create Pending
+# requests, which no view shows.
+# =====================================================
+
+def _on_event(event: dict):
+    if event["topic"] != "exit_request" or event["key"] is None:
+        return
+    change = event["type"].split(".", 1)[1]
+    data = event["data"]
+    if change == "created":
+        if project_exit_request(data):
+            refresh_exit_request_views(item=data)
+    elif change == "status_changed":
+        if "Approved" in (data.get("request_status"), data.get("previous_status")):
+            refresh_exit_request_views(event["key"])
+    elif change == "updated":
+        if PROJECTED_FIELDS & set(data):
+            refresh_exit_request_views(event["key"])
+
+
+def start_landlord_projections():
+    event_bus.add_listener(_on_event)
+
+
+def stop_landlord_projections():
+    event_bus.remove_listener(_on_event)
+
+# =====================================================
+#                READS
+# =====================================================
+
+def read_landlord_view(view: str, landlord_id: str = None, property_id: str = None, limit: int = None,
+                       next_token: str = None, order: str = None, since: str = None, until: str = None) -> dict:
+    """
+    One page of a view in date order (the view's default order unless `order`
+    is "asc"/"desc"), optionally limited to dates in [since, until].
+    """
+    if view not in LANDLORD_VIEWS:
+        raise ValueError(f"Unknown landlord view '{view}'. Available: {sorted(LANDLORD_VIEWS)}")
+    order = order or LANDLORD_VIEWS[view]["order"]
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    page = page_landlord_view(
+        view_key(view, landlord_id, property_id),
+        limit=limit,
+        next_token=next_token,
+        descending=order == "desc",
+        start=_day(since),
+        end=_day(until)
+    )
+    return {
+        "items": [{name: value for name, value in entry.items() if name not in INTERNAL_KEYS} for entry in page["items"]],
+        "next_token": page["next_token"],
+    }
+
+
+# Awaitable versions for async routers (run on the AWS I/O executor)
+read_landlord_view_async = awaitable(read_landlord_view)
+backfill_landlord_views_async = awaitable(backfill_landlord_views)
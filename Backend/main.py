@@ -2,6 +2,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
+from app.services.async_io import shutdown_executor
+from app.services.export_jobs import shutdown_export_jobs
+from app.services.image_pipeline import shutdown_image_pipeline
+from app.services.email_outbox import start_email_dispatcher, stop_email_dispatcher
+from app.services.search_index import start_search_index, stop_search_index
+from app.services.analytics import start_analytics, stop_analytics
+from app.services.landlord_views import start_landlord_projections, stop_landlord_projections
+from app.services.codec import DecimalJSONResponse
+
 # -----------------------------
 # 🔁 Import Routers
 # -----------------------------
@@ -13,16 +22,19 @@ from app.routers import (
     admin,
     auth,
     tenant,
-    landlord
+    landlord,
+    events
 )
 
 # -----------------------------
 # 🚀 Initialize FastAPI App
+# DecimalJSONResponse encodes DynamoDB Decimals directly (orjson when installed)
 # -----------------------------
 app = FastAPI(
     title="TenantExitEase API",
     description="API for managing tenant exit requests, uploads, damage reports, notifications, and role-based dashboards.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DecimalJSONResponse
 )
 
 # -----------------------------
@@ -57,6 +69,30 @@ app.include_router(admin.router, prefix="/admin")
 app.include_router(auth.router)  # /login, /logout
 app.include_router(tenant.router, prefix="/tenant")
 app.include_router(landlord.router, prefix="/landlord")
+app.include_router(events.router, prefix="/events")
+
+# -----------------------------
+# 📬 Startup: email outbox dispatcher, landlord projections, search index, analytics snapshot
+# -----------------------------
+@app.on_event("startup")
+async def on_startup():
+    start_email_dispatcher()
+    start_landlord_projections()
+    start_search_index()
+    start_analytics()
+
+# -----------------------------
+# 🧵 Shutdown: stop background workers, drain the AWS I/O executor
+# -----------------------------
+@app.on_event("shutdown")
+async def on_shutdown():
+    stop_email_dispatcher()
+    stop_landlord_projections()
+    stop_search_index()
+    stop_analytics()
+    shutdown_export_jobs()
+    shutdown_image_pipeline()
+    shutdown_executor()
 
 # -----------------------------
 # ✅ Root Health Check
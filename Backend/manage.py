@@ -0,0 +1,61 @@
+"""
+Maintenance commands for TenantExitEase.
+
+Usage:
+    python -m app.manage rebuild-counters
+    python -m app.manage reindex
+    python -m app.manage backfill-landlord-views
+"""
+import argparse
+import json
+
+from app.services.db_service import rebuild_status_counters
+from app.services.search_index import rebuild_search_index
+from app.services.landlord_views import backfill_landlord_views
+
+
+def rebuild_counters(args):
+    """
+    Recompute the dashboard status counters from a scan of the exit table.
+    """
+    result = rebuild_status_counters()
+    print(json.dumps(result, indent=2))
+
+
+def reindex(args):
+    """
+    Rebuild the full-text search index from storage and write its snapshot.
+    Running workers load it at their next start.
+    """
+    result = rebuild_search_index()
+    print(json.dumps(result, indent=2))
+
+
+def backfill_landlord_view_entries(args):
+    """
+    Rebuild the landlord views (approved exits, room history, move timeline)
+    from the existing exit requests. Safe to re-run and to run while serving.
+    """
+    result = backfill_landlord_views()
+    print(json.dumps(result, indent=2))
+
+
+# -----------------------------
+# Command Registry
+# -----------------------------
+COMMANDS = {
+    "rebuild-counters": rebuild_counters,
+    "reindex": reindex,
+    "backfill-landlord-views": backfill_landlord_view_entries,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="TenantExitEase maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
-from fastapi import APIRouter, Form, HTTPException
-from app.services.email_service import send_email
+from fastapi import APIRouter, Form, HTTPException, Query
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List, Dict, Any
+from app.services.email_service import send_email_async
+from app.services.email_templates import list_templates, broadcast_email_async
+from app.services.email_outbox import get_outbox_stats_async, list_dead_letters_async, retry_dead_letter_async
 
 router = APIRouter(prefix="/notify", tags=["Notification"])
 
@@ -10,7 +14,96 @@ async def notify_user(
     body: str = Form(...)
 ):
     try:
-        send_email(subject=subject, body=body, recipient=recipient)
+        await send_email_async(subject=subject, body=body, recipient=recipient)
         return {"message": f"Email successfully sent to {recipient}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Email sending failed: {str(e)}")
+
+# -----------------------------
+# Templated Broadcasts
+# -----------------------------
+class BroadcastRecipient(BaseModel):
+    email: EmailStr
+    data: Dict[str, Any] = Field(default_factory=dict, description="Per-recipient template values")
+
+
+class RecipientQuery(BaseModel):
+    status: Optional[str] = Field(None, example="Approved")
+    room_number: Optional[str] = None
+    tenant_id: Optional[str] = None
+
+
+class BroadcastRequest(BaseModel):
+    template: str = Field(..., example="inspection_schedule")
+    template_data: Dict[str, Any] = Field(default_factory=dict, description="Values shared by every recipient")
+    recipients: Optional[List[BroadcastRecipient]] = None
+    query: Optional[RecipientQuery] = Field(None, description="Exit requests to notify, when no explicit recipients")
+
+
+@router.get("/templates")
+async def email_templates():
+    """
+    Registered email templates and the placeholders each one uses.
+    """
+    return {"templates": list_templates()}
+
+
+@router.post("/broadcast")
+async def broadcast(request: BroadcastRequest):
+    """
+    Send a registered template to an explicit recipient list, or to the tenants
+    whose exit requests match `query` (their request fields are template values).
+    Sent with SES bulk templated email, 50 per call; reports each recipient's status.
+    """
+    if not request.recipients and not request.query:
+        raise HTTPException(status_code=400, detail="Provide recipients or query")
+    try:
+        filters = request.query.model_dump() if request.query and not request.recipients else {}
+        return await broadcast_email_async(
+            request.template,
+            default_data=request.template_data,
+            recipients=[recipient.model_dump() for recipient in request.recipients or []],
+            **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Broadcast failed: {str(e)}")
+
+# -----------------------------
+# Email Outbox (queued submission emails)
+# -----------------------------
+@router.get("/outbox")
+async def outbox_stats():
+    """
+    Outbox counts by status (pending/sending/sent/dead) and the dispatcher's send rate.
+    """
+    try:
+        return await get_outbox_stats_async()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read outbox: {str(e)}")
+
+
+@router.get("/outbox/dead-letters")
+async def dead_letters(limit: int = Query(50, ge=1, le=500)):
+    """
+    Emails that were given up on, newest first, with their last error.
+    """
+    try:
+        return {"items": await list_dead_letters_async(limit)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read dead letters: {str(e)}")
+
+
+@router.post("/outbox/dead-letters/{message_id}/retry")
+async def retry_dead_letter(message_id: str):
+    """
+    Queue a dead-lettered email again with a fresh retry budget.
+    """
+    try:
+        requeued = await retry_dead_letter_async(message_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to requeue email: {str(e)}")
+    if not requeued:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    return {"message": "Email queued again", "message_id": message_id}
@@ -0,0 +1,174 @@
+import zlib
+
+# -----------------------------
+# Page Geometry (PDF points, 72 per inch)
+# -----------------------------
+LETTER_LANDSCAPE = (792, 612)
+MARGIN = 36
+
+# Courier is one of the 14 standard fonts: nothing to embed, and every glyph is
+# 0.6 em wide, so table columns can be laid out by character count.
+COURIER_CHAR_WIDTH = 0.6
+
+# =====================================================
+#                MINIMAL PDF WRITER
+# Pure Python, text-only. Each page is written to the sink as soon as it is
+# added, so memory stays at one page no matter how long the document gets.
+# Only the page tree and cross-reference table are written at close().
+# =====================================================
+
+CATALOG_ID = 1
+PAGES_ID = 2
+FONT_ID = 3
+
+
+def _escape(text: str) -> bytes:
+    # Standard fonts use WinAnsiEncoding; anything outside Latin-1 becomes '?'
+    raw = text.encode("latin-1", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class PDFWriter:
+    """
+    Write a text-only PDF to a binary sink (anything with .write(bytes)).
+
+        writer = PDFWriter(sink)
+        writer.add_page(["line 1", "line 2"])
+        writer.close()
+    """
+
+    def __init__(self, sink, page_size: tuple = LETTER_LANDSCAPE, font_size: float = 8, leading: float = None):
+        self.sink = sink
+        self.width, self.height = page_size
+        self.font_size = font_size
+        self.leading = leading or round(font_size * 1.35, 2)
+        self.offsets = {}
+        self.page_ids = []
+        self.position = 0
+        self.next_id = FONT_ID + 1
+        self.closed = False
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(CATALOG_ID, f"<< /Type /Catalog /Pages {PAGES_ID} 0 R >>".encode("ascii"))
+        self._object(FONT_ID, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    # ---------- Layout helpers ----------
+
+    @property
+    def chars_per_line(self) -> int:
+        return int((self.width - 2 * MARGIN) / (self.font_size * COURIER_CHAR_WIDTH))
+
+    @property
+    def lines_per_page(self) -> int:
+        return int((self.height - 2 * MARGIN) / self.leading)
+
+    # ---------- Output ----------
+
+    def _write(self, data: bytes):
+        self.sink.write(data)
+        self.position += len(data)
+
+    def _object(self, object_id: int, body: bytes):
+        self.offsets[object_id] = self.position
+        self._write(f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+
+    def add_page(self, lines: list):
+        """
+        Add a page with `lines` of text, top to bottom. Lines beyond the page
+        height or width are clipped by the page, so callers should wrap/truncate.
+        """
+        if self.closed:
+            raise ValueError("PDF already closed")
+
+        top = self.height - MARGIN - self.font_size
+        ops = [f"BT /F1 {self.font_size} Tf {self.leading} TL {MARGIN} {top} Td".encode("ascii")]
+        for line in lines:
+            ops.append(b"(" + _escape(line) + b") Tj T*")
+        ops.append(b"ET")
+        stream = zlib.compress(b"\n".join(ops))
+
+        content_id = self._allocate()
+        self._object(
+            content_id,
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + stream + b"\nendstream"
+        )
+        page_id = self._allocate()
+        self._object(page_id, (
+            f"<< /Type /Page /Parent {PAGES_ID} 0 R /MediaBox [0 0 {self.width} {self.height}] "
+            f"/Resources << /Font << /F1 {FONT_ID} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        """
+        Write the page tree, cross-reference table and trailer. A document needs
+        at least one page, so an empty one gets a blank page.
+        """
+        if self.closed:
+            return
+        if not self.page_ids:
+            self.add_page([])
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._object(PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode("ascii"))
+
+        xref_offset = self.position
+        size = self.next_id
+        entries = [b"0000000000 65535 f \n"]
+        entries += [f"{self.offsets[object_id]:010d} 00000 n \n".encode("ascii") for object_id in range(1, size)]
+        self._write(f"xref\n0 {size}\n".encode("ascii") + b"".join(entries))
+        self._write(f"trailer\n<< /Size {size} /Root {CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        self.closed = True
+
+
+class PDFTable:
+    """
+    Lay out rows of a fixed set of columns as monospaced text across PDF pages,
+    repeating the title and header on every page.
+    """
+
+    def __init__(self, writer: PDFWriter, title: str, columns: list):
+        self.writer = writer
+        self.title = title
+        self.columns = columns
+        self.width = max(4, writer.chars_per_line // max(1, len(columns)) - 1)
+        self.rows = []
+        self.page_number = 0
+        self.body_lines = writer.lines_per_page - 4  # title, blank, header, rule
+
+    def _line(self, cells) -> str:
+        return " ".join(self._fit(cell) for cell in cells)
+
+    def _fit(self, value) -> str:
+        text = "" if value is None else " ".join(str(value).split())
+        if len(text) > self.width:
+            text = text[:self.width - 1] + "~"
+        return text.ljust(self.width)
+
+    def add_row(self, cells: list):
+        self.rows.append(self._line(cells))
+        if len(self.rows) >= self.body_lines:
+            self.flush()
+
+    def flush(self):
+        if not self.rows and self.page_number:
+            return
+        self.page_number += 1
+        header = self._line(self.columns)
+        self.writer.add_page([
+            f"{self.title} - page {self.page_number}",
+            "",
+            header,
+            "-" * len(header.rstrip()),
+            *self.rows
+        ])
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
@@ -0,0 +1,256 @@
+import base64
+import importlib
+import json
+import threading
+from decimal import Decimal
+from app.config.settings import settings
+
+# -----------------------------
+# Shared Paging Settings
+# -----------------------------
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+BATCH_WRITE_SIZE = 25  # Items per bulk write chunk (DynamoDB BatchWriteItem maximum)
+TOKEN_VERSION = 1
+
+# =====================================================
+#                PAGINATION TOKENS
+# Every backend hands out the same opaque cursor format: base64url JSON of the
+# last key read, tagged with a scope so it can't be replayed on another listing.
+# =====================================================
+
+def _encode_key_value(value):
+    if isinstance(value, Decimal):
+        return {"N": str(value)}
+    return {"S": value}
+
+
+def _decode_key_value(value: dict):
+    if "N" in value:
+        return Decimal(value["N"])
+    return value["S"]
+
+
+def encode_next_token(last_key, scope: str = None):
+    """
+    Turn the last key read (e.g. DynamoDB's LastEvaluatedKey) into an opaque,
+    URL-safe cursor. Returns None when there are no more pages.
+    """
+    if not last_key:
+        return None
+    payload = {
+        "v": TOKEN_VERSION,
+        "s": scope,
+        "k": {name: _encode_key_value(value) for name, value in last_key.items()}
+    }
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_next_token(token, scope: str = None):
+    """
+    Turn a cursor produced by encode_next_token back into a start key.
+    Raises ValueError for tokens that were not issued by this service or scope.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload.get("v") != TOKEN_VERSION:
+            raise ValueError("unsupported token version")
+        if payload.get("s") != scope:
+            raise ValueError("token was issued for a different listing")
+        return {name: _decode_key_value(value) for name, value in payload["k"].items()}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid next_token: {str(e)}")
+
+
+def clamp_page_size(limit):
+    """
+    Keep client supplied page sizes within [1, MAX_PAGE_SIZE].
+    """
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def project_items(items: list, fields) -> list:
+    """
+    Keep only `fields` of each item (all attributes when fields is empty).
+    """
+    if not fields:
+        return items
+    return [{name: item[name] for name in fields if name in item} for item in items]
+
+# =====================================================
+#                REPOSITORY INTERFACE
+# =====================================================
+
+class Repository:
+    """
+    Storage interface for exit requests, damage reports and the status counters.
+
+    db_service owns caching and request-level rules and calls only these methods,
+    so the routers run unchanged against any implementation. Items are plain dicts
+    with DynamoDB-style values (numbers come back as Decimal).
+    """
+
+    name = "abstract"
+
+    # ---------- Exit requests ----------
+
+    def put_exit_request(self, item: dict):
+        """Insert a new exit request and count it in the status counters atomically."""
+        raise NotImplementedError
+
+    def get_exit_request(self, request_id: str):
+        """Return one exit request (read-after-write consistent), or None."""
+        raise NotImplementedError
+
+    def query_exit_requests_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        raise NotImplementedError
+
+    def update_exit_status(self, request_id: str, new_status: str) -> dict:
+        """
+        Set request_status (stamping status_updated_at) and move the counter from the
+        old to the new status atomically.
+        Returns the previous {request_status, tenant_id}; raises if the request doesn't exist.
+        """
+        raise NotImplementedError
+
+    def batch_update_exit_status(self, changes: dict) -> dict:
+        """
+        Apply request_id -> new_status changes; returns request_id -> outcome dict.
+        Outcomes for touched requests carry the owning "tenant_id".
+        """
+        raise NotImplementedError
+
+    def update_exit_fields(self, request_id: str, updates: dict) -> dict:
+        """Set top-level attributes of an existing request; returns the full updated item."""
+        raise NotImplementedError
+
+    def page_exit_requests(self, filters: dict, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        """One page of requests matching equality `filters`: {"items": [...], "next_token": ...}."""
+        raise NotImplementedError
+
+    def iter_exit_requests(self, fields: list = None, total_segments: int = None):
+        """Stream every exit request (any order)."""
+        raise NotImplementedError
+
+    def iter_exit_request_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        """Yield every exit request (or one tenant's) one page (list) at a time."""
+        raise NotImplementedError
+
+    def batch_put_exit_requests(self, items: list) -> set:
+        """Insert one chunk of new requests and count them; returns request_ids that failed."""
+        raise NotImplementedError
+
+    # ---------- Status counters ----------
+
+    def get_status_counters(self) -> dict:
+        """{"total_requests": int, "statuses": {status: int}}"""
+        raise NotImplementedError
+
+    def replace_status_counters(self, counts: dict):
+        """Overwrite the counters with freshly computed per-status counts."""
+        raise NotImplementedError
+
+    # ---------- Collection versions (ETags) ----------
+
+    def get_collection_versions(self) -> dict:
+        """{collection: int} write counters; collections never written are absent."""
+        raise NotImplementedError
+
+    def bump_collection_version(self, collection: str) -> int:
+        """Atomically increment a collection's version and return the new value."""
+        raise NotImplementedError
+
+    def get_tenant_version(self, collection: str, tenant_id: str) -> int:
+        """A tenant's write counter within a collection (0 if never written), read consistently."""
+        raise NotImplementedError
+
+    def bump_tenant_version(self, collection: str, tenant_id: str) -> int:
+        """Atomically increment a tenant's write counter and return the new value."""
+        raise NotImplementedError
+
+    # ---------- Damage reports ----------
+
+    def put_damage_report(self, item: dict):
+        raise NotImplementedError
+
+    def query_damage_reports_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        raise NotImplementedError
+
+    def update_damage_fields(self, report_id: str, updates: dict) -> dict:
+        """Set top-level attributes of an existing report; returns the full updated item."""
+        raise NotImplementedError
+
+    def page_damage_reports(self, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        raise NotImplementedError
+
+    def iter_damage_reports(self, fields: list = None, total_segments: int = None):
+        raise NotImplementedError
+
+    def iter_damage_report_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        raise NotImplementedError
+
+    def batch_put_damage_reports(self, items: list) -> set:
+        """Insert one chunk of new reports; returns report_ids that failed."""
+        raise NotImplementedError
+
+    # ---------- Upload dedup index ----------
+
+    def get_upload_index(self, content_id: str):
+        """The {content_id, key, size, content_type, ...} entry for stored content, or None."""
+        raise NotImplementedError
+
+    def put_upload_index(self, entry: dict):
+        """Record (or replace) the stored copy for entry["content_id"]."""
+        raise NotImplementedError
+
+    # ---------- Landlord view projections ----------
+
+    def replace_view_entries(self, source_id: str, entries: list):
+        """
+        Atomically replace every view entry derived from source_id (an exit request)
+        with `entries`. Each entry carries view_key, sort_key and source_id.
+        """
+        raise NotImplementedError
+
+    def page_view_entries(self, view_key: str, limit: int = None, next_token: str = None,
+                          descending: bool = False, start: str = None, end: str = None) -> dict:
+        """
+        One page of a view's entries in sort_key order, optionally limited to
+        start <= sort_key <= end: {"items": [...], "next_token": ...}.
+        """
+        raise NotImplementedError
+
+# -----------------------------
+# Backend Selection
+# Implementations are imported on first use, so e.g. the SQLite backend never
+# loads boto3.
+# -----------------------------
+_BACKENDS = {
+    "dynamodb": "app.services.dynamo_repository:DynamoRepository",
+    "sqlite": "app.services.sqlite_repository:SQLiteRepository",
+}
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> Repository:
+    """
+    The process-wide repository selected by settings.STORAGE_BACKEND.
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                backend = settings.STORAGE_BACKEND.lower()
+                if backend not in _BACKENDS:
+                    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}'. Available: {sorted(_BACKENDS)}")
+                module_name, class_name = _BACKENDS[backend].split(":")
+                _repository = getattr(importlib.import_module(module_name), class_name)()
+    return _repository
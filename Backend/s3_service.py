@@ -1,22 +1,582 @@
-import boto3
-from botocore.exceptions import BotoCoreError, NoCredentialsError
+import base64
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
 from fastapi import UploadFile
 from app.config.settings import settings
-import uuid
+from app.config.aws_config import get_client
+from app.services.async_io import awaitable
+from app.services.db_service import get_upload_index_entry, record_upload_index_entry
+
+MB = 1024 * 1024
+
+# =====================================================
+#                UPLOAD POLICIES
+# Per-folder size limits and MIME types come from Settings
+# (UPLOAD_MAX_SIZE_MB / UPLOAD_ALLOWED_TYPES) and apply to both API-proxied
+# uploads and presigned direct-to-S3 uploads.
+# =====================================================
+
+class UploadRejected(ValueError):
+    """
+    An upload broke its folder policy. status_code is the HTTP status to answer with
+    (413 too large, 415 unsupported type, 400 otherwise).
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_upload_policy(folder: str) -> dict:
+    if folder not in settings.UPLOAD_MAX_SIZE_MB:
+        raise UploadRejected(f"Unknown upload folder '{folder}'. Available: {sorted(settings.UPLOAD_MAX_SIZE_MB)}")
+    return {
+        "folder": folder,
+        "max_size": settings.UPLOAD_MAX_SIZE_MB[folder] * MB,
+        "allowed_types": set(settings.UPLOAD_ALLOWED_TYPES.get(folder, [])),
+    }
+
+
+def _check_content_type(policy: dict, content_type: str):
+    if policy["allowed_types"] and content_type not in policy["allowed_types"]:
+        raise UploadRejected(
+            f"Content type '{content_type}' is not allowed in {policy['folder']}. "
+            f"Allowed: {sorted(policy['allowed_types'])}",
+            status_code=415
+        )
+
+
+def _check_size(policy: dict, size: int):
+    if size is not None and size > policy["max_size"]:
+        raise UploadRejected(
+            f"File is larger than the {policy['max_size'] // MB} MB limit for {policy['folder']}",
+            status_code=413
+        )
+
+
+_EXTENSION = re.compile(r"^[a-z0-9]{1,10}$")
+
+
+def safe_extension(filename: str, content_type: str = None) -> str:
+    """
+    Extension for the generated object key: the filename's own extension when it
+    is short and alphanumeric, otherwise one derived from the content type.
+    Never trusts path separators or dots in client supplied names.
+    """
+    _, extension = os.path.splitext(os.path.basename((filename or "").replace("\\", "/")))
+    extension = extension.lstrip(".").lower()
+    if _EXTENSION.match(extension):
+        return extension
+    guessed = mimetypes.guess_extension(content_type or "") or ""
+    return guessed.lstrip(".") or "bin"
+
+
+def resolve_content_type(filename: str, content_type: str = None) -> str:
+    if content_type and content_type != "application/octet-stream":
+        return content_type.split(";")[0].strip().lower()
+    guessed, _ = mimetypes.guess_type(filename or "")
+    return guessed or "application/octet-stream"
+
+
+def _new_key(folder: str, filename: str, content_type: str) -> str:
+    return f"{folder}/{uuid.uuid4()}.{safe_extension(filename, content_type)}"
+
+
+def object_url(key: str) -> str:
+    return f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+
+def key_from_url(url: str) -> str:
+    """
+    Inverse of object_url(). Raises ValueError for URLs outside the bucket.
+    """
+    prefix = object_url("")
+    if not url or not url.startswith(prefix):
+        raise ValueError(f"Not an object URL for this bucket: {url}")
+    return url[len(prefix):]
+
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.clean_region
-)
+def sniff_content_type(head: bytes):
+    """
+    Best-effort MIME type from the first bytes of a file (None when unknown).
+    """
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp":
+        brand = head[8:12]
+        if brand == b"qt  ":
+            return "video/quicktime"
+        if brand in {b"heic", b"heix", b"mif1"}:
+            return "image/heic"
+        return "video/mp4"
+    return None
+
+# =====================================================
+#                TRANSFER METRICS
+# =====================================================
+
+class UploadMetrics:
+    """
+    Per-folder totals plus the byte rate of each finished upload.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.folders = {}
+
+    def record(self, folder: str, size: int, seconds: float, rejected: bool = False, deduplicated: bool = False):
+        rate = size / seconds if seconds > 0 else 0.0
+        with self.lock:
+            stats = self.folders.setdefault(folder, {
+                "uploads": 0, "rejected": 0, "deduplicated": 0, "bytes_saved": 0,
+                "bytes": 0, "seconds": 0.0, "last_rate_bytes_per_sec": None
+            })
+            if rejected:
+                stats["rejected"] += 1
+                return
+            if deduplicated:
+                stats["deduplicated"] += 1
+                stats["bytes_saved"] += size
+                return
+            stats["uploads"] += 1
+            stats["bytes"] += size
+            stats["seconds"] += seconds
+            stats["last_rate_bytes_per_sec"] = round(rate, 1)
+        print(f"📤 Uploaded {size} bytes to {folder} in {seconds:.2f}s ({rate / MB:.2f} MB/s)")
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                folder: dict(
+                    stats,
+                    seconds=round(stats["seconds"], 3),
+                    avg_rate_bytes_per_sec=round(stats["bytes"] / stats["seconds"], 1) if stats["seconds"] else None
+                )
+                for folder, stats in self.folders.items()
+            }
+
+
+upload_metrics = UploadMetrics()
+
+
+def get_upload_stats() -> dict:
+    return upload_metrics.stats()
+
+# =====================================================
+#                API-PROXIED UPLOADS
+# =====================================================
+
+class _GuardedReader:
+    """
+    Read-only, non-seekable view of an upload that enforces the folder policy as
+    bytes flow: the type is sniffed from the first chunk and the size is checked
+    on every read. Being non-seekable makes s3transfer read it sequentially and
+    buffer at most chunk size x concurrency, never the whole file.
+    """
+
+    def __init__(self, raw, policy: dict, digest=None):
+        self.raw = raw
+        self.policy = policy
+        self.digest = digest  # optional hashlib object fed every byte read
+        self.bytes_read = 0
+        self.sniffed = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        if data and not self.sniffed:
+            self.sniffed = True
+            detected = sniff_content_type(data[:16])
+            if detected:
+                _check_content_type(self.policy, detected)
+        self.bytes_read += len(data)
+        _check_size(self.policy, self.bytes_read)
+        if self.digest is not None:
+            self.digest.update(data)
+        return data
+
+
+def transfer_config():
+    """
+    s3transfer settings for API-proxied uploads (see UPLOAD_* in Settings).
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=settings.UPLOAD_MULTIPART_THRESHOLD_MB * MB,
+        multipart_chunksize=settings.UPLOAD_CHUNK_SIZE_MB * MB,
+        max_concurrency=settings.UPLOAD_MAX_CONCURRENCY,
+        use_threads=settings.UPLOAD_MAX_CONCURRENCY > 1
+    )
+
+
+def _transfer(reader: _GuardedReader, key: str, content_type: str):
+    get_client("s3").upload_fileobj(
+        reader,
+        settings.S3_BUCKET_NAME,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=transfer_config()
+    )
+
+# -----------------------------
+# Content-Addressed Dedup
+# Stored copies are indexed by "<folder>/<sha256>"; a repeat upload of the same
+# bytes into the same folder returns the existing object's URL.
+# -----------------------------
+HASH_CHUNK_SIZE = 1 * MB
+
+
+def _is_seekable(raw) -> bool:
+    try:
+        return raw.seekable()
+    except AttributeError:
+        return hasattr(raw, "seek") and hasattr(raw, "tell")
+
+
+def object_exists(key: str) -> bool:
+    from botocore.exceptions import ClientError
 
-def upload_file_to_s3(file: UploadFile, folder: str = "uploads") -> str:
     try:
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{folder}/{uuid.uuid4()}.{file_extension}"
-        s3_client.upload_fileobj(file.file, settings.S3_BUCKET_NAME, unique_filename)
-        s3_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{unique_filename}"
-        return s3_url
+        get_client("s3").head_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+            return False
+        raise
+
+
+def _indexed_copy(folder: str, digest: str):
+    # The index can outlive the object (lifecycle rules, manual deletes), so check it is still there
+    entry = get_upload_index_entry(f"{folder}/{digest}")
+    if entry and object_exists(entry["key"]):
+        return entry["key"]
+    return None
+
+
+def _upload_deduplicated(file: UploadFile, folder: str, policy: dict, content_type: str):
+    """
+    Returns (key, reader, duplicate). Spooled (seekable) uploads are hashed locally
+    first, so a duplicate never reaches S3; otherwise the hash is computed while
+    uploading and the duplicate copy is deleted afterwards.
+    """
+    raw = file.file
+    if _is_seekable(raw):
+        start = raw.tell()
+        reader = _GuardedReader(raw, policy, hashlib.sha256())
+        while reader.read(HASH_CHUNK_SIZE):
+            pass
+        digest = reader.digest.hexdigest()
+        existing = _indexed_copy(folder, digest)
+        if existing:
+            return existing, reader, True
+        raw.seek(start)
+        # The key is derived from the content, so concurrent identical uploads write the same object
+        key = f"{folder}/sha256/{digest}.{safe_extension(file.filename, content_type)}"
+        reader = _GuardedReader(raw, policy)
+        _transfer(reader, key, content_type)
+    else:
+        reader = _GuardedReader(raw, policy, hashlib.sha256())
+        key = _new_key(folder, file.filename, content_type)
+        _transfer(reader, key, content_type)
+        digest = reader.digest.hexdigest()
+        existing = _indexed_copy(folder, digest)
+        if existing:
+            get_client("s3").delete_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+            return existing, reader, True
+
+    record_upload_index_entry({
+        "content_id": f"{folder}/{digest}",
+        "key": key,
+        "sha256": digest,
+        "size": reader.bytes_read,
+        "content_type": content_type,
+        "created_at": datetime.utcnow().isoformat()
+    })
+    return key, reader, False
+
+
+def upload_file_to_s3(file: UploadFile, folder: str = "uploads", dedup: bool = None) -> str:
+    """
+    Stream an uploaded file into `folder` (multipart above the configured threshold)
+    and return its URL. Raises UploadRejected when it breaks the folder policy.
+    With dedup (default: settings.UPLOAD_DEDUP), content already stored in the
+    folder is not uploaded again and the existing object's URL is returned.
+    """
+    # botocore is imported on first use so app startup doesn't pay for it
+    from botocore.exceptions import BotoCoreError, NoCredentialsError
+
+    policy = get_upload_policy(folder)
+    content_type = resolve_content_type(file.filename, file.content_type)
+    _check_content_type(policy, content_type)
+    _check_size(policy, getattr(file, "size", None))
+
+    dedup = settings.UPLOAD_DEDUP if dedup is None else dedup
+    started = time.perf_counter()
+    try:
+        if dedup:
+            key, reader, duplicate = _upload_deduplicated(file, folder, policy, content_type)
+        else:
+            key, reader, duplicate = _new_key(folder, file.filename, content_type), _GuardedReader(file.file, policy), False
+            _transfer(reader, key, content_type)
+    except UploadRejected:
+        upload_metrics.record(folder, 0, time.perf_counter() - started, rejected=True)
+        raise
     except (BotoCoreError, NoCredentialsError) as e:
         raise Exception(f"S3 upload failed: {e}")
+    upload_metrics.record(folder, reader.bytes_read, time.perf_counter() - started, deduplicated=duplicate)
+    return object_url(key)
+
+
+# Awaitable version for async routers (runs on the AWS I/O executor)
+upload_file_to_s3_async = awaitable(upload_file_to_s3)
+
+# =====================================================
+#                PRESIGNED UPLOAD SESSIONS
+# The client uploads straight to S3 with a presigned POST (or PUT) and then
+# calls back with the session token; the API only HEADs the object. The token
+# is HMAC-signed, so no session state is kept server side.
+# =====================================================
+
+# How long after the presigned URL expires the upload can still be completed
+COMPLETION_GRACE_SECONDS = 3600
+
+
+def _session_secret() -> bytes:
+    secret = settings.UPLOAD_SESSION_SECRET or settings.AWS_SECRET_ACCESS_KEY
+    return hashlib.sha256(b"upload-session:" + secret.encode("utf-8")).digest()
+
+
+def _sign_session(payload: dict) -> str:
+    raw = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")).rstrip(b"=")
+    signature = base64.urlsafe_b64encode(hmac.new(_session_secret(), raw, hashlib.sha256).digest()).rstrip(b"=")
+    return (raw + b"." + signature).decode("ascii")
+
+
+def _verify_session(token: str) -> dict:
+    try:
+        raw, signature = token.encode("ascii").split(b".")
+        expected = base64.urlsafe_b64encode(hmac.new(_session_secret(), raw, hashlib.sha256).digest()).rstrip(b"=")
+        if not hmac.compare_digest(signature, expected):
+            raise ValueError("bad signature")
+        payload = json.loads(base64.urlsafe_b64decode(raw + b"=" * (-len(raw) % 4)))
+    except (ValueError, UnicodeError) as e:
+        raise UploadRejected(f"Invalid upload token: {e}")
+    if time.time() > payload["exp"] + COMPLETION_GRACE_SECONDS:
+        raise UploadRejected("Upload session has expired")
+    return payload
+
+
+def create_upload_session(folder: str, filename: str, content_type: str = None, size: int = None, method: str = "post") -> dict:
+    """
+    Presigned direct-to-S3 upload constrained to the folder's types and size limit.
+
+    method="post": a browser form POST; S3 enforces Content-Type and the size range.
+    method="put": a single PUT; `size` is required and signed as Content-Length.
+    Either way complete_upload_session re-checks size and type with HEAD.
+    """
+    policy = get_upload_policy(folder)
+    content_type = resolve_content_type(filename, content_type)
+    _check_content_type(policy, content_type)
+    _check_size(policy, size)
+
+    key = _new_key(folder, filename, content_type)
+    expires_in = settings.UPLOAD_SESSION_EXPIRY_SECONDS
+    client = get_client("s3")
+    session = {"key": key, "method": method, "expires_in": expires_in, "max_size": policy["max_size"]}
+
+    if method == "post":
+        presigned = client.generate_presigned_post(
+            Bucket=settings.S3_BUCKET_NAME,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, policy["max_size"]]],
+            ExpiresIn=expires_in
+        )
+        session.update(url=presigned["url"], fields=presigned["fields"])
+    elif method == "put":
+        if not size:
+            raise UploadRejected("size is required for PUT uploads")
+        session["url"] = client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": settings.S3_BUCKET_NAME, "Key": key, "ContentType": content_type, "ContentLength": size},
+            ExpiresIn=expires_in
+        )
+        session["headers"] = {"Content-Type": content_type, "Content-Length": str(size)}
+    else:
+        raise UploadRejected("method must be 'post' or 'put'")
+
+    session["upload_token"] = _sign_session({
+        "key": key,
+        "folder": folder,
+        "content_type": content_type,
+        "exp": int(time.time()) + expires_in,
+    })
+    return session
+
+
+def complete_upload_session(upload_token: str) -> dict:
+    """
+    Verify a direct upload with HEAD (exists, size within limit, expected type).
+    Objects that break the policy are deleted. Returns {folder, key, file_url, size, content_type}.
+    """
+    from botocore.exceptions import ClientError
+
+    session = _verify_session(upload_token)
+    policy = get_upload_policy(session["folder"])
+    client = get_client("s3")
+    try:
+        head = client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=session["key"])
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+            raise UploadRejected("Upload not found; send the file before completing the session")
+        raise
+
+    size = head["ContentLength"]
+    content_type = head.get("ContentType", "")
+    try:
+        if size < 1:
+            raise UploadRejected("Uploaded file is empty")
+        _check_size(policy, size)
+        if content_type != session["content_type"]:
+            raise UploadRejected(f"Uploaded content type '{content_type}' doesn't match the session", status_code=415)
+    except UploadRejected:
+        client.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=session["key"])
+        upload_metrics.record(session["folder"], size, 0, rejected=True)
+        raise
+
+    return {
+        "folder": session["folder"],
+        "key": session["key"],
+        "file_url": object_url(session["key"]),
+        "size": size,
+        "content_type": content_type,
+    }
+
+
+create_upload_session_async = awaitable(create_upload_session)
+complete_upload_session_async = awaitable(complete_upload_session)
+
+# =====================================================
+#                MULTIPART WRITER
+# =====================================================
+
+# S3 requires every part except the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3MultipartWriter:
+    """
+    File-like sink that streams bytes into one S3 object with a multipart upload.
+
+    Bytes are buffered until a part is full and then uploaded, so memory stays at
+    about one part. Small objects (never reaching one part) fall back to a single
+    PutObject. Use as a context manager: an exception aborts the upload.
+    """
+
+    def __init__(self, key: str, content_type: str = "application/octet-stream", part_size: int = None):
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(part_size or settings.EXPORT_PART_SIZE_MB * 1024 * 1024, MIN_PART_SIZE)
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+        self.bytes_written = 0
+
+    def write(self, data: bytes):
+        self.buffer += data
+        self.bytes_written += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def _upload_part(self, body: bytes):
+        client = get_client("s3")
+        if self.upload_id is None:
+            self.upload_id = client.create_multipart_upload(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.key,
+                ContentType=self.content_type
+            )["UploadId"]
+        part_number = len(self.parts) + 1
+        response = client.upload_part(
+            Bucket=settings.S3_BUCKET_NAME,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def close(self):
+        """
+        Upload what is left and finish the object.
+        """
+        client = get_client("s3")
+        if self.upload_id is None:
+            client.put_object(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.key,
+                Body=bytes(self.buffer),
+                ContentType=self.content_type
+            )
+        else:
+            if self.buffer:
+                self._upload_part(bytes(self.buffer))
+            client.complete_multipart_upload(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self.parts}
+            )
+        self.buffer = bytearray()
+
+    def abort(self):
+        if self.upload_id is not None:
+            get_client("s3").abort_multipart_upload(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=self.key,
+                UploadId=self.upload_id
+            )
+            self.upload_id = None
+        self.buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def generate_presigned_download_url(key: str, expires_in: int = None, filename: str = None) -> str:
+    """
+    Time-limited GET link for a private object (served as an attachment when filename is given).
+    """
+    params = {"Bucket": settings.S3_BUCKET_NAME, "Key": key}
+    if filename:
+        params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+    return get_client("s3").generate_presigned_url(
+        "get_object",
+        Params=params,
+        ExpiresIn=expires_in or settings.EXPORT_URL_EXPIRY_SECONDS
+    )
@@ -0,0 +1,445 @@
+import bisect
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from app.config.settings import settings
+from app.services.codec import json_default, from_dynamo
+from app.services.event_bus import event_bus
+from app.services.db_service import iter_exit_request_pages, iter_damage_report_pages
+from app.services.repository import encode_next_token, decode_next_token, clamp_page_size
+
+# -----------------------------
+# Indexed Collections
+# Text fields are searched; meta fields are kept with each document so results
+# render (and filter) without a storage read.
+# -----------------------------
+SEARCH_KINDS = {
+    "exit": {
+        "key": "request_id",
+        "text": ["exit_reason", "admin_notes"],
+        "meta": ["request_id", "tenant_id", "name", "room_number", "request_status", "submitted_at"],
+    },
+    "damage": {
+        "key": "report_id",
+        "text": ["damaged_items", "description", "damage_description"],
+        "meta": ["report_id", "tenant_id", "room_number", "estimated_cost", "reported_at"],
+    },
+}
+EVENT_KINDS = {"exit_request": "exit", "damage_report": "damage"}
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A query prefix matches at most this many index terms, and scores a bit below an exact hit
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_WEIGHT = 0.8
+
+SNAPSHOT_VERSION = 1
+PAGE_SCAN_SIZE = 500
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it its my of on or our so that the "
+    "to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _field_text(value) -> str:
+    # damaged_items is a list of {"item", "price"}; only the item names are text
+    if isinstance(value, list):
+        return " ".join(_field_text(entry.get("item") if isinstance(entry, dict) else entry) for entry in value)
+    if value is None:
+        return ""
+    return str(value)
+
+# =====================================================
+#                INVERTED INDEX
+# postings: term → {doc_id: term frequency}. Documents keep their source text
+# so partial updates (e.g. new admin_notes) can be re-tokenized in full.
+# =====================================================
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.docs = {}          # doc_id → {"kind", "text": {field: str}, "meta": {...}, "length", "terms"}
+        self.postings = {}      # term → {doc_id: tf}
+        self.vocabulary = []    # sorted terms, for prefix lookups
+        self.total_length = 0
+        self.dirty = False
+
+    # ---------- Writes ----------
+
+    def _unlink(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return None
+        self.total_length -= doc["length"]
+        for term in doc["terms"]:
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+                index = bisect.bisect_left(self.vocabulary, term)
+                if index < len(self.vocabulary) and self.vocabulary[index] == term:
+                    self.vocabulary.pop(index)
+        return doc
+
+    def upsert(self, kind: str, item: dict, partial: bool = False):
+        """
+        Index an item; with partial=True, `item` only holds changed fields and
+        is merged into the stored document.
+        """
+        spec = SEARCH_KINDS[kind]
+        doc_id = f"{kind}:{item[spec['key']]}"
+        with self._lock:
+            previous = self._unlink(doc_id)
+            if partial and previous is None:
+                # Changes to a document we never indexed: nothing to merge into
+                return
+            text = dict(previous["text"]) if previous else {}
+            meta = dict(previous["meta"]) if previous else {}
+            for field in spec["text"]:
+                if field in item:
+                    text[field] = _field_text(item[field])
+            for field in spec["meta"]:
+                if field in item:
+                    meta[field] = from_dynamo(item[field])
+
+            counts = Counter(token for field in spec["text"] for token in tokenize(text.get(field, "")))
+            for term, tf in counts.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    bisect.insort(self.vocabulary, term)
+                postings[doc_id] = tf
+            length = sum(counts.values())
+            self.docs[doc_id] = {"kind": kind, "text": text, "meta": meta, "length": length, "terms": list(counts)}
+            self.total_length += length
+            self.dirty = True
+
+    def clear(self):
+        with self._lock:
+            self.docs, self.postings, self.vocabulary = {}, {}, []
+            self.total_length = 0
+            self.dirty = False
+
+    def replace_with(self, other: "SearchIndex"):
+        """
+        Swap in the contents of a freshly built index, in one step for readers.
+        """
+        with self._lock:
+            self.docs, self.postings, self.vocabulary = other.docs, other.postings, other.vocabulary
+            self.total_length = other.total_length
+            self.dirty = True
+
+    # ---------- Reads ----------
+
+    def _expand(self, token: str) -> dict:
+        """
+        term → weight for one query token: the exact term plus index terms it prefixes.
+        """
+        weights = {}
+        if token in self.postings:
+            weights[token] = 1.0
+        start = bisect.bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            weights.setdefault(term, PREFIX_WEIGHT)
+        return weights
+
+    def search(self, query: str, filters: dict = None) -> list:
+        """
+        All matching documents as (score, doc_id), best first. Every query token
+        must match (exactly or as a prefix) for a document to be returned.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        filters = {name: value for name, value in (filters or {}).items() if value}
+        with self._lock:
+            total_docs = len(self.docs)
+            if not total_docs:
+                return []
+            average_length = self.total_length / total_docs or 1.0
+            scores = None
+            for token in tokens:
+                token_scores = {}
+                for term, weight in self._expand(token).items():
+                    postings = self.postings[term]
+                    idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf in postings.items():
+                        length = self.docs[doc_id]["length"]
+                        norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+                        # A document matching several expansions of one token keeps its best one
+                        token_scores[doc_id] = max(token_scores.get(doc_id, 0.0), weight * idf * norm)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+                if not scores:
+                    return []
+
+            results = []
+            for doc_id, score in scores.items():
+                doc = self.docs[doc_id]
+                if "kind" in filters and doc["kind"] != filters["kind"]:
+                    continue
+                if any(doc["meta"].get(name) != value for name, value in filters.items() if name != "kind"):
+                    continue
+                results.append((round(score, 6), doc_id))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results
+
+    def document(self, doc_id: str, tokens: list) -> dict:
+        doc = self.docs[doc_id]
+        matched = sorted({term for term in doc["terms"] if any(term.startswith(token) for token in tokens)})
+        return {"kind": doc["kind"], "id": doc_id.split(":", 1)[1], **doc["meta"], "text": doc["text"], "matched_terms": matched}
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds = Counter(doc["kind"] for doc in self.docs.values())
+            return {"documents": len(self.docs), "by_kind": dict(kinds), "terms": len(self.postings)}
+
+    # ---------- Snapshot ----------
+
+    def to_snapshot(self) -> dict:
+        with self._lock:
+            self.dirty = False
+            return {
+                "version": SNAPSHOT_VERSION,
+                "saved_at": time.time(),
+                "docs": {doc_id: [doc["kind"], doc["text"], doc["meta"]] for doc_id, doc in self.docs.items()},
+            }
+
+    def load_snapshot(self, snapshot: dict):
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported search snapshot version {snapshot.get('version')}")
+        with self._lock:
+            self.clear()
+            for doc_id, (kind, text, meta) in snapshot["docs"].items():
+                key = doc_id.split(":", 1)[1]
+                self.upsert(kind, {SEARCH_KINDS[kind]["key"]: key, **text, **meta})
+            self.dirty = False
+
+
+search_index = SearchIndex()
+
+# =====================================================
+#                LIFECYCLE
+# The index follows the write paths through the event bus (db_service
+# publishes every create/update), is saved to SEARCH_SNAPSHOT_PATH when it
+# changed (every SEARCH_SNAPSHOT_SECONDS and at shutdown) and reloaded from it
+# at startup. Each worker indexes the writes it sees; bulk imports and other
+# workers' writes arrive with the next rebuild (scheduled after a bulk import,
+# every SEARCH_REBUILD_SECONDS, or `python -m app.manage reindex`).
+# =====================================================
+
+_state = {"status": "empty", "built_at": None, "loaded_from": None, "stale": False}
+_stop = threading.Event()
+_thread = None
+_building = None
+
+
+def _on_event(event: dict):
+    kind = EVENT_KINDS.get(event["topic"])
+    if kind is None:
+        return
+    if event["key"] is None:
+        # Bulk imports publish a count, not the rows: pick them up with a rebuild
+        _state["stale"] = True
+        return
+    change = event["type"].split(".", 1)[1]
+    item = dict(event["data"], **{SEARCH_KINDS[kind]["key"]: event["key"]})
+    for index in (search_index, _building):
+        if index is not None:
+            index.upsert(kind, item, partial=change != "created")
+
+
+def save_snapshot(path: str = None) -> str:
+    path = path or settings.SEARCH_SNAPSHOT_PATH
+    snapshot = search_index.to_snapshot()
+    # Written to a temp file of our own (workers may save at the same time), then
+    # swapped in atomically: a crash mid-write never leaves a truncated snapshot behind
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as temp:
+        temp_path = temp.name
+    try:
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=json_default, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+
+def load_snapshot(path: str = None) -> bool:
+    path = path or settings.SEARCH_SNAPSHOT_PATH
+    if not os.path.exists(path):
+        return False
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    search_index.load_snapshot(snapshot)
+    _state.update(status="ready", built_at=snapshot["saved_at"], loaded_from=path)
+    return True
+
+
+def rebuild_search_index() -> dict:
+    """
+    Re-read every exit request and damage report into a fresh index, then save it.
+    """
+    global _building
+    started = time.perf_counter()
+    _state.update(status="building", stale=False)
+    # Writes made during the scan go to both indexes, so the swap loses none of them
+    fresh = _building = SearchIndex()
+    try:
+        _scan(fresh)
+    finally:
+        _building = None
+    search_index.replace_with(fresh)
+    save_snapshot()
+    _state.update(status="ready", built_at=time.time(), loaded_from=None)
+    return {**search_index.stats(), "seconds": round(time.perf_counter() - started, 3)}
+
+
+def _scan(index: SearchIndex):
+    for kind, pages in (("exit", iter_exit_request_pages), ("damage", iter_damage_report_pages)):
+        fields = [SEARCH_KINDS[kind]["key"], *SEARCH_KINDS[kind]["text"], *SEARCH_KINDS[kind]["meta"]]
+        for page in pages(page_size=PAGE_SCAN_SIZE, fields=list(dict.fromkeys(fields))):
+            for item in page:
+                index.upsert(kind, item)
+
+
+def _maintain():
+    last_rebuild = time.monotonic()
+    while not _stop.wait(settings.SEARCH_SNAPSHOT_SECONDS):
+        try:
+            rebuild_every = settings.SEARCH_REBUILD_SECONDS
+            due = rebuild_every and time.monotonic() - last_rebuild >= rebuild_every
+            if due or _state["stale"]:
+                rebuild_search_index()
+                last_rebuild = time.monotonic()
+            elif search_index.dirty:
+                save_snapshot()
+        except Exception as e:
+            print("❌ Search index maintenance failed:", e)
+
+
+def start_search_index():
+    """
+    App startup: load the snapshot (or build the index in the background when
+    there is none), follow writes, and keep the snapshot current.
+    """
+    global _thread
+    event_bus.add_listener(_on_event)
+    try:
+        loaded = load_snapshot()
+    except Exception as e:
+        print("⚠️ Search snapshot unreadable, rebuilding:", e)
+        loaded = False
+
+    def run():
+        if not loaded:
+            try:
+                print(f"🔎 Search index rebuilt: {rebuild_search_index()}")
+            except Exception as e:
+                _state["status"] = "failed"
+                print("❌ Search index build failed:", e)
+        _maintain()
+
+    _stop.clear()
+    _thread = threading.Thread(target=run, name="search-index", daemon=True)
+    _thread.start()
+
+
+def stop_search_index():
+    """
+    App shutdown: stop maintenance and save unsaved changes.
+    """
+    global _thread
+    _stop.set()
+    event_bus.remove_listener(_on_event)
+    if search_index.dirty:
+        try:
+            save_snapshot()
+        except Exception as e:
+            print("❌ Failed to save search snapshot:", e)
+    _thread = None
+
+# =====================================================
+#                QUERIES
+# =====================================================
+
+def _scope(query: str, filters: dict) -> str:
+    canonical = json.dumps([tokenize(query), filters], sort_keys=True)
+    return "search:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def search_documents(query: str, kind: str = None, tenant_id: str = None, status: str = None,
+                     limit: int = None, next_token: str = None) -> dict:
+    """
+    One page of ranked matches. The cursor is the (score, id) of the last result,
+    so pages stay consistent while documents are added.
+    """
+    if not query or not query.strip():
+        raise ValueError("Search query is empty")
+    if kind and kind not in SEARCH_KINDS:
+        raise ValueError(f"Unknown kind '{kind}'. Use one of {sorted(SEARCH_KINDS)}")
+    filters = {"kind": kind, "tenant_id": tenant_id, "request_status": status}
+    scope = _scope(query, filters)
+    page_size = clamp_page_size(limit)
+    start = decode_next_token(next_token, scope)
+
+    results = search_index.search(query, filters)
+    if start:
+        after = (-float(start["score"]), start["id"])
+        position = bisect.bisect_right([(-score, doc_id) for score, doc_id in results], after)
+        results_page = results[position:position + page_size + 1]
+    else:
+        results_page = results[:page_size + 1]
+
+    has_more = len(results_page) > page_size
+    results_page = results_page[:page_size]
+    tokens = tokenize(query)
+    items = []
+    for score, doc_id in results_page:
+        try:
+            items.append(dict(search_index.document(doc_id, tokens), score=score))
+        except KeyError:
+            # Removed between ranking and rendering
+            continue
+    last = results_page[-1] if results_page else None
+    return {
+        "items": items,
+        "total": len(results),
+        "next_token": encode_next_token({"score": Decimal(str(last[0])), "id": last[1]}, scope) if has_more else None,
+        "index": _state["status"],
+    }
+
+
+def get_search_stats() -> dict:
+    built_at = _state["built_at"]
+    return {
+        **search_index.stats(),
+        "status": _state["status"],
+        "stale": _state["stale"],
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(built_at)) if built_at else None,
+        "loaded_from": _state["loaded_from"],
+        "unsaved_changes": search_index.dirty,
+    }
@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import EmailStr
 
@@ -14,6 +15,126 @@ class Settings(BaseSettings):
     S3_BUCKET_NAME: str
     SES_EMAIL: EmailStr  # Validates format like example@example.com
 
+    # AWS client tuning (shared clients in app.config.aws_config)
+    AWS_MAX_POOL_CONNECTIONS: int = 50  # keep >= AWS_IO_MAX_WORKERS
+    AWS_TCP_KEEPALIVE: bool = True
+    AWS_RETRY_MODE: str = "standard"  # "legacy", "standard" or "adaptive"
+    AWS_MAX_ATTEMPTS: int = 5
+    AWS_CONNECT_TIMEOUT: float = 5.0
+    AWS_READ_TIMEOUT: float = 30.0
+
+    # Endpoint overrides for local stand-ins (DynamoDB Local, LocalStack, MinIO...):
+    # one URL for every service, and/or per-service, e.g. '{"dynamodb": "http://localhost:8000"}'
+    AWS_ENDPOINT_URL: Optional[str] = None
+    AWS_ENDPOINT_OVERRIDES: Dict[str, str] = {}
+
+    # Storage backend: "dynamodb" or "sqlite" (embedded, for on-prem sites and load tests)
+    STORAGE_BACKEND: str = "dynamodb"
+    SQLITE_PATH: str = "tenantexitease.db"
+
+    # Bulk reads (parallel segmented DynamoDB scans)
+    SCAN_TOTAL_SEGMENTS: int = 8
+    SCAN_MAX_WORKERS: int = 8
+
+    # Threads used to run blocking boto3 calls off the event loop
+    AWS_IO_MAX_WORKERS: int = 32
+
+    # Per-tenant read-through cache
+    TENANT_CACHE_BACKEND: str = "memory"
+    TENANT_CACHE_MAX_ENTRIES: int = 2048
+    TENANT_CACHE_TTL_SECONDS: float = 60.0
+
+    # Uploads: transfer engine for API-proxied files
+    UPLOAD_MULTIPART_THRESHOLD_MB: int = 8
+    UPLOAD_CHUNK_SIZE_MB: int = 8
+    UPLOAD_MAX_CONCURRENCY: int = 4
+    UPLOAD_DEDUP: bool = True  # store by content hash; skip re-uploading identical files
+
+    # Uploads: presigned direct-to-S3 sessions (token signed with UPLOAD_SESSION_SECRET,
+    # falling back to a key derived from the AWS secret)
+    UPLOAD_SESSION_EXPIRY_SECONDS: int = 900
+    UPLOAD_SESSION_SECRET: Optional[str] = None
+
+    # Uploads: per-folder policy
+    UPLOAD_MAX_SIZE_MB: Dict[str, int] = {
+        "exit_docs": 25,
+        "damage_docs": 200,  # photos and video walkthroughs
+        "tenant_docs": 50,
+        "uploads": 25,
+    }
+    UPLOAD_ALLOWED_TYPES: Dict[str, List[str]] = {
+        "exit_docs": ["application/pdf", "image/jpeg", "image/png"],
+        "damage_docs": [
+            "application/pdf", "image/jpeg", "image/png", "image/webp", "image/heic",
+            "video/mp4", "video/quicktime"
+        ],
+        "tenant_docs": [
+            "application/pdf", "image/jpeg", "image/png",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        ],
+        "uploads": ["application/pdf", "image/jpeg", "image/png"],
+    }
+
+    # Image pipeline: thumbnail + recompressed web copy for uploaded photos (needs Pillow)
+    IMAGE_PIPELINE_ENABLED: bool = True
+    IMAGE_PIPELINE_WORKERS: int = 2  # worker processes
+    IMAGE_PIPELINE_FOLDERS: List[str] = ["damage_docs", "exit_docs"]
+    IMAGE_PIPELINE_TYPES: List[str] = ["image/jpeg", "image/png", "image/webp"]
+    IMAGE_THUMBNAIL_SIZE: int = 320  # longest edge, px
+    IMAGE_THUMBNAIL_QUALITY: int = 70
+    IMAGE_WEB_MAX_SIZE: int = 1600
+    IMAGE_WEB_QUALITY: int = 80
+
+    # Email outbox: routers enqueue, a background dispatcher sends through SES
+    EMAIL_OUTBOX_PATH: str = "email_outbox.db"
+    EMAIL_DISPATCHER_ENABLED: bool = True
+    # msg/s for the whole outbox: only one worker's dispatcher sends at a time (it holds
+    # a lease in the outbox file). None = the SES MaxSendRate. The outbox is per host, so
+    # with several hosts set this to the SES rate divided by the number of hosts.
+    EMAIL_SEND_RATE: Optional[float] = None
+    EMAIL_DISPATCHER_LEASE_SECONDS: float = 30.0  # a dead sender's standby takes over after this
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_LEASE_SECONDS: float = 300.0
+    EMAIL_MAX_ATTEMPTS: int = 8  # then the message is dead-lettered
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_RETENTION_SECONDS: float = 7 * 86400.0  # sent messages kept for inspection
+
+    # Templated broadcasts (SES bulk templated send)
+    EMAIL_TEMPLATE_PREFIX: str = "tenantexitease-"
+    BROADCAST_MAX_RECIPIENTS: int = 1000
+    BROADCAST_MAX_ATTEMPTS: int = 4  # per batch, on SES throttling
+
+    # Conditional GETs: how stale this worker's copy of the collection versions may get
+    ETAG_VERSION_TTL_SECONDS: float = 2.0
+
+    # Live events (SSE)
+    EVENT_BUFFER_SIZE: int = 1000  # recent events kept for Last-Event-ID replay
+    EVENT_SUBSCRIBER_QUEUE: int = 500  # a client further behind is disconnected
+    EVENT_HEARTBEAT_SECONDS: float = 15.0
+    EVENT_RETRY_MS: int = 3000
+
+    # Full-text search index (in memory, snapshotted to a local file)
+    SEARCH_SNAPSHOT_PATH: str = "search_index.json.gz"
+    SEARCH_SNAPSHOT_SECONDS: float = 30.0  # unsaved changes are written this often
+    SEARCH_REBUILD_SECONDS: Optional[float] = None  # periodic full rebuild; None = only after bulk imports
+
+    # Landlord views: owner of exit requests that don't name a landlord/property
+    DEFAULT_LANDLORD_ID: str = "default"
+    DEFAULT_PROPERTY_ID: str = "default"
+
+    # Analytics: in-memory columnar snapshot (needs NumPy; disabled without it)
+    ANALYTICS_ENABLED: bool = True
+    ANALYTICS_REFRESH_SECONDS: Optional[float] = 900.0  # full reload, picks up other workers' writes; None = only after bulk imports
+
+    # Background export jobs (rendered to S3, handed out as presigned links)
+    EXPORT_JOB_WORKERS: int = 2
+    EXPORT_JOB_CACHE_SECONDS: float = 300.0  # identical requests reuse the artifact this long
+    EXPORT_JOB_RETENTION_SECONDS: float = 86400.0
+    EXPORT_PART_SIZE_MB: int = 8
+    EXPORT_URL_EXPIRY_SECONDS: int = 3600
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
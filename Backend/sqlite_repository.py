@@ -0,0 +1,496 @@
+import json
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from app.config.settings import settings
+from app.services.codec import dumps
+from app.services.repository import (
+    Repository,
+    encode_next_token,
+    decode_next_token,
+    clamp_page_size,
+    project_items
+)
+
+SCAN_BATCH_SIZE = 500
+STATUS_CHUNK_SIZE = 500
+
+# -----------------------------
+# Schema
+# Each row keeps the full item as JSON plus the columns we filter on, so the
+# indexes serve tenant/status/room lookups and keyset pagination.
+# -----------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exit_requests (
+    request_id     TEXT PRIMARY KEY,
+    tenant_id      TEXT,
+    request_status TEXT,
+    room_number    TEXT,
+    submitted_at   TEXT,
+    data           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exit_tenant ON exit_requests (tenant_id, request_id);
+CREATE INDEX IF NOT EXISTS idx_exit_status ON exit_requests (request_status, request_id);
+CREATE INDEX IF NOT EXISTS idx_exit_room ON exit_requests (room_number, request_id);
+
+CREATE TABLE IF NOT EXISTS damage_reports (
+    report_id   TEXT PRIMARY KEY,
+    tenant_id   TEXT,
+    room_number TEXT,
+    reported_at TEXT,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_damage_tenant ON damage_reports (tenant_id, report_id);
+
+CREATE TABLE IF NOT EXISTS exit_status_counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS collection_versions (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tenant_versions (
+    collection TEXT NOT NULL,
+    tenant_id  TEXT NOT NULL,
+    value      INTEGER NOT NULL,
+    PRIMARY KEY (collection, tenant_id)
+);
+
+CREATE TABLE IF NOT EXISTS upload_index (
+    content_id TEXT PRIMARY KEY,
+    data       TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS landlord_views (
+    view_key  TEXT NOT NULL,
+    sort_key  TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (view_key, sort_key)
+);
+CREATE INDEX IF NOT EXISTS idx_view_source ON landlord_views (source_id);
+"""
+
+# -----------------------------
+# Statements (constant SQL, so sqlite3's per-connection statement cache
+# keeps them prepared)
+# -----------------------------
+INSERT_EXIT = """
+INSERT INTO exit_requests (request_id, tenant_id, request_status, room_number, submitted_at, data)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+UPDATE_EXIT = """
+UPDATE exit_requests
+SET tenant_id = ?, request_status = ?, room_number = ?, submitted_at = ?, data = ?
+WHERE request_id = ?
+"""
+SELECT_EXIT = "SELECT data FROM exit_requests WHERE request_id = ?"
+SELECT_EXIT_BY_TENANT = "SELECT data FROM exit_requests WHERE tenant_id = ? ORDER BY request_id"
+SELECT_ALL_EXIT = "SELECT data FROM exit_requests"
+SELECT_EXIT_PAGE = "SELECT request_id, data FROM exit_requests WHERE request_id > ? ORDER BY request_id LIMIT ?"
+SELECT_EXIT_PAGE_BY_TENANT = """
+SELECT request_id, data FROM exit_requests
+WHERE tenant_id = ? AND request_id > ? ORDER BY request_id LIMIT ?
+"""
+INSERT_DAMAGE = """
+INSERT INTO damage_reports (report_id, tenant_id, room_number, reported_at, data)
+VALUES (?, ?, ?, ?, ?)
+"""
+UPDATE_DAMAGE = """
+UPDATE damage_reports
+SET tenant_id = ?, room_number = ?, reported_at = ?, data = ?
+WHERE report_id = ?
+"""
+SELECT_DAMAGE = "SELECT data FROM damage_reports WHERE report_id = ?"
+SELECT_DAMAGE_BY_TENANT = "SELECT data FROM damage_reports WHERE tenant_id = ? ORDER BY report_id"
+SELECT_ALL_DAMAGE = "SELECT data FROM damage_reports"
+SELECT_DAMAGE_PAGE = "SELECT report_id, data FROM damage_reports WHERE report_id > ? ORDER BY report_id LIMIT ?"
+SELECT_DAMAGE_PAGE_BY_TENANT = """
+SELECT report_id, data FROM damage_reports
+WHERE tenant_id = ? AND report_id > ? ORDER BY report_id LIMIT ?
+"""
+ADD_COUNTER = """
+INSERT INTO exit_status_counters (name, value) VALUES (?, ?)
+ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+"""
+SELECT_COUNTERS = "SELECT name, value FROM exit_status_counters"
+SELECT_UPLOAD_INDEX = "SELECT data FROM upload_index WHERE content_id = ?"
+INSERT_UPLOAD_INDEX = "INSERT OR REPLACE INTO upload_index (content_id, data) VALUES (?, ?)"
+DELETE_COUNTERS = "DELETE FROM exit_status_counters"
+SELECT_VERSIONS = "SELECT name, value FROM collection_versions"
+BUMP_VERSION = """
+INSERT INTO collection_versions (name, value) VALUES (?, 1)
+ON CONFLICT (name) DO UPDATE SET value = value + 1
+"""
+SELECT_VERSION = "SELECT value FROM collection_versions WHERE name = ?"
+BUMP_TENANT_VERSION = """
+INSERT INTO tenant_versions (collection, tenant_id, value) VALUES (?, ?, 1)
+ON CONFLICT (collection, tenant_id) DO UPDATE SET value = value + 1
+"""
+SELECT_TENANT_VERSION = "SELECT value FROM tenant_versions WHERE collection = ? AND tenant_id = ?"
+DELETE_VIEW_ENTRIES = "DELETE FROM landlord_views WHERE source_id = ?"
+INSERT_VIEW_ENTRY = "INSERT OR REPLACE INTO landlord_views (view_key, sort_key, source_id, data) VALUES (?, ?, ?, ?)"
+SELECT_VIEW_PAGE = """
+SELECT sort_key, data FROM landlord_views
+WHERE view_key = ? AND sort_key > ? AND sort_key BETWEEN ? AND ? ORDER BY sort_key LIMIT ?
+"""
+SELECT_VIEW_PAGE_DESC = """
+SELECT sort_key, data FROM landlord_views
+WHERE view_key = ? AND sort_key < ? AND sort_key BETWEEN ? AND ? ORDER BY sort_key DESC LIMIT ?
+"""
+
+# Exit columns that may be used as equality filters
+EXIT_FILTER_COLUMNS = ("tenant_id", "room_number", "request_status")
+
+# =====================================================
+#                ITEM ENCODING
+# =====================================================
+
+def _dump(item: dict) -> str:
+    return dumps(item).decode("utf-8")
+
+
+def _load(data: str) -> dict:
+    # Numbers come back as Decimal, matching what boto3 returns for DynamoDB
+    return json.loads(data, parse_float=Decimal, parse_int=Decimal)
+
+
+def _exit_row(item: dict) -> tuple:
+    return (
+        item["request_id"],
+        item.get("tenant_id"),
+        item.get("request_status"),
+        item.get("room_number"),
+        item.get("submitted_at"),
+        _dump(item)
+    )
+
+
+def _damage_row(item: dict) -> tuple:
+    return (
+        item["report_id"],
+        item.get("tenant_id"),
+        item.get("room_number"),
+        item.get("reported_at"),
+        _dump(item)
+    )
+
+
+def _counter_rows(deltas: dict, total_delta: int = 0) -> list:
+    rows = [(f"status_{status}", delta) for status, delta in deltas.items() if status and delta]
+    if total_delta:
+        rows.append(("total_requests", total_delta))
+    return rows
+
+# =====================================================
+#                SQLITE REPOSITORY
+# =====================================================
+
+class SQLiteRepository(Repository):
+    """
+    Embedded local store for on-prem sites and load tests.
+
+    One connection per thread (the routers call in from the AWS I/O executor),
+    WAL journaling so readers never block the writer, and explicit
+    BEGIN IMMEDIATE transactions for the read-modify-write paths.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.SQLITE_PATH
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=256, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _iter_query(self, sql: str, params: tuple = (), fields: list = None):
+        cursor = self._conn().execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(SCAN_BATCH_SIZE)
+            if not rows:
+                break
+            yield from project_items([_load(row[0]) for row in rows], fields)
+
+    def _keyset_page(self, table: str, key: str, where: dict, limit, next_token, fields, scope: str) -> dict:
+        page_size = clamp_page_size(limit)
+        start_key = decode_next_token(next_token, scope)
+
+        clauses = [f"{key} > ?"]
+        params = [start_key[key] if start_key else ""]
+        for column, value in where.items():
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        params.append(page_size + 1)
+
+        sql = f"SELECT {key}, data FROM {table} WHERE {' AND '.join(clauses)} ORDER BY {key} LIMIT ?"
+        rows = self._conn().execute(sql, params).fetchall()
+
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        last_key = {key: rows[-1][0]} if more else None
+        return {
+            "items": project_items([_load(row[1]) for row in rows], fields),
+            "next_token": encode_next_token(last_key, scope)
+        }
+
+    def _iter_keyset_pages(self, sql: str, page_size: int = None, params: tuple = (), fields: list = None):
+        # `params` fill any placeholders before the (last key, page size) pair
+        page_size = page_size or SCAN_BATCH_SIZE
+        last_key = ""
+        while True:
+            rows = self._conn().execute(sql, (*params, last_key, page_size)).fetchall()
+            if not rows:
+                break
+            yield project_items([_load(row[1]) for row in rows], fields)
+            last_key = rows[-1][0]
+
+    # ---------- Exit requests ----------
+
+    def put_exit_request(self, item: dict):
+        with self._transaction() as conn:
+            conn.execute(INSERT_EXIT, _exit_row(item))
+            conn.executemany(ADD_COUNTER, _counter_rows({item.get("request_status", "Pending"): 1}, total_delta=1))
+
+    def get_exit_request(self, request_id: str):
+        row = self._conn().execute(SELECT_EXIT, (request_id,)).fetchone()
+        return _load(row[0]) if row else None
+
+    def query_exit_requests_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        return list(self._iter_query(SELECT_EXIT_BY_TENANT, (tenant_id,), fields))
+
+    def _set_status(self, conn, request_id: str, new_status: str):
+        """
+        Inside an open transaction: change one request's status and its counters.
+        Returns the previous {request_status, tenant_id}, or None if it doesn't exist.
+        """
+        row = conn.execute(SELECT_EXIT, (request_id,)).fetchone()
+        if row is None:
+            return None
+
+        item = _load(row[0])
+        previous = {"request_status": item.get("request_status"), "tenant_id": item.get("tenant_id")}
+        old_status = previous["request_status"]
+        if old_status == new_status:
+            return previous
+
+        item["request_status"] = new_status
+        item["status_updated_at"] = datetime.utcnow().isoformat()
+        conn.execute(UPDATE_EXIT, _exit_row(item)[1:] + (request_id,))
+        deltas = Counter({new_status: 1})
+        if old_status is not None:
+            deltas[old_status] -= 1
+        conn.executemany(ADD_COUNTER, _counter_rows(deltas))
+        return previous
+
+    def update_exit_status(self, request_id: str, new_status: str) -> dict:
+        with self._transaction() as conn:
+            previous = self._set_status(conn, request_id, new_status)
+        if previous is None:
+            raise Exception(f"Exit request {request_id} not found")
+        return previous
+
+    def batch_update_exit_status(self, changes: dict) -> dict:
+        outcomes = {}
+        request_ids = list(changes)
+        for start in range(0, len(request_ids), STATUS_CHUNK_SIZE):
+            chunk = request_ids[start:start + STATUS_CHUNK_SIZE]
+            try:
+                with self._transaction() as conn:
+                    for request_id in chunk:
+                        new_status = changes[request_id]
+                        previous = self._set_status(conn, request_id, new_status)
+                        if previous is None:
+                            outcomes[request_id] = {"status": "not_found"}
+                        elif previous["request_status"] == new_status:
+                            outcomes[request_id] = {"status": "unchanged", "request_status": new_status}
+                        else:
+                            outcomes[request_id] = {
+                                "status": "updated",
+                                "previous_status": previous["request_status"],
+                                "request_status": new_status,
+                                "tenant_id": previous["tenant_id"]
+                            }
+            except sqlite3.Error as e:
+                for request_id in chunk:
+                    outcomes[request_id] = {"status": "error", "detail": str(e)}
+        return outcomes
+
+    def update_exit_fields(self, request_id: str, updates: dict) -> dict:
+        with self._transaction() as conn:
+            row = conn.execute(SELECT_EXIT, (request_id,)).fetchone()
+            if row is None:
+                raise Exception(f"Exit request {request_id} not found")
+            item = _load(row[0])
+            item.update(updates)
+            conn.execute(UPDATE_EXIT, _exit_row(item)[1:] + (request_id,))
+        return item
+
+    def page_exit_requests(self, filters: dict, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        where = {column: value for column, value in (filters or {}).items() if value and column in EXIT_FILTER_COLUMNS}
+        scope = "sqlite:exit:" + ",".join(sorted(where))
+        return self._keyset_page("exit_requests", "request_id", where, limit, next_token, fields, scope)
+
+    def iter_exit_requests(self, fields: list = None, total_segments: int = None):
+        return self._iter_query(SELECT_ALL_EXIT, fields=fields)
+
+    def iter_exit_request_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        if tenant_id:
+            return self._iter_keyset_pages(SELECT_EXIT_PAGE_BY_TENANT, page_size, (tenant_id,), fields)
+        return self._iter_keyset_pages(SELECT_EXIT_PAGE, page_size, fields=fields)
+
+    def _batch_insert(self, insert_sql: str, rows: list) -> set:
+        """
+        Insert a chunk in one transaction; if that fails, retry row by row so only
+        the offending rows are reported. Returns the primary keys that failed.
+        """
+        try:
+            with self._transaction() as conn:
+                conn.executemany(insert_sql, rows)
+            return set()
+        except sqlite3.Error:
+            failed = set()
+            for row in rows:
+                try:
+                    with self._transaction() as conn:
+                        conn.execute(insert_sql, row)
+                except sqlite3.Error:
+                    failed.add(row[0])
+            return failed
+
+    def batch_put_exit_requests(self, items: list) -> set:
+        failed = self._batch_insert(INSERT_EXIT, [_exit_row(item) for item in items])
+        written = [item for item in items if item["request_id"] not in failed]
+        if written:
+            deltas = Counter(item.get("request_status", "Pending") for item in written)
+            with self._transaction() as conn:
+                conn.executemany(ADD_COUNTER, _counter_rows(deltas, total_delta=len(written)))
+        return failed
+
+    # ---------- Status counters ----------
+
+    def get_status_counters(self) -> dict:
+        rows = dict(self._conn().execute(SELECT_COUNTERS).fetchall())
+        return {
+            "total_requests": int(rows.pop("total_requests", 0)),
+            "statuses": {name[len("status_"):]: int(value) for name, value in rows.items()}
+        }
+
+    def replace_status_counters(self, counts: dict):
+        with self._transaction() as conn:
+            conn.execute(DELETE_COUNTERS)
+            conn.executemany(ADD_COUNTER, _counter_rows(counts, total_delta=sum(counts.values())))
+
+    # ---------- Collection versions (ETags) ----------
+
+    def get_collection_versions(self) -> dict:
+        return {name: int(value) for name, value in self._conn().execute(SELECT_VERSIONS)}
+
+    def bump_collection_version(self, collection: str) -> int:
+        with self._transaction() as conn:
+            conn.execute(BUMP_VERSION, (collection,))
+            return int(conn.execute(SELECT_VERSION, (collection,)).fetchone()[0])
+
+    def get_tenant_version(self, collection: str, tenant_id: str) -> int:
+        row = self._conn().execute(SELECT_TENANT_VERSION, (collection, tenant_id)).fetchone()
+        return int(row[0]) if row else 0
+
+    def bump_tenant_version(self, collection: str, tenant_id: str) -> int:
+        with self._transaction() as conn:
+            conn.execute(BUMP_TENANT_VERSION, (collection, tenant_id))
+            return int(conn.execute(SELECT_TENANT_VERSION, (collection, tenant_id)).fetchone()[0])
+
+    # ---------- Damage reports ----------
+
+    def put_damage_report(self, item: dict):
+        with self._transaction() as conn:
+            conn.execute(INSERT_DAMAGE, _damage_row(item))
+
+    def query_damage_reports_by_tenant(self, tenant_id: str, fields: list = None) -> list:
+        return list(self._iter_query(SELECT_DAMAGE_BY_TENANT, (tenant_id,), fields))
+
+    def update_damage_fields(self, report_id: str, updates: dict) -> dict:
+        with self._transaction() as conn:
+            row = conn.execute(SELECT_DAMAGE, (report_id,)).fetchone()
+            if row is None:
+                raise Exception(f"Damage report {report_id} not found")
+            item = _load(row[0])
+            item.update(updates)
+            conn.execute(UPDATE_DAMAGE, _damage_row(item)[1:] + (report_id,))
+        return item
+
+    def page_damage_reports(self, limit: int = None, next_token: str = None, fields: list = None) -> dict:
+        return self._keyset_page("damage_reports", "report_id", {}, limit, next_token, fields, "sqlite:damage")
+
+    def iter_damage_reports(self, fields: list = None, total_segments: int = None):
+        return self._iter_query(SELECT_ALL_DAMAGE, fields=fields)
+
+    def iter_damage_report_pages(self, page_size: int = None, tenant_id: str = None, fields: list = None):
+        if tenant_id:
+            return self._iter_keyset_pages(SELECT_DAMAGE_PAGE_BY_TENANT, page_size, (tenant_id,), fields)
+        return self._iter_keyset_pages(SELECT_DAMAGE_PAGE, page_size, fields=fields)
+
+    def batch_put_damage_reports(self, items: list) -> set:
+        return self._batch_insert(INSERT_DAMAGE, [_damage_row(item) for item in items])
+
+    # ---------- Upload dedup index ----------
+
+    def get_upload_index(self, content_id: str):
+        row = self._conn().execute(SELECT_UPLOAD_INDEX, (content_id,)).fetchone()
+        return _load(row[0]) if row else None
+
+    def put_upload_index(self, entry: dict):
+        self._conn().execute(INSERT_UPLOAD_INDEX, (entry["content_id"], _dump(entry)))
+
+    # ---------- Landlord view projections ----------
+
+    def replace_view_entries(self, source_id: str, entries: list):
+        with self._transaction() as conn:
+            conn.execute(DELETE_VIEW_ENTRIES, (source_id,))
+            conn.executemany(INSERT_VIEW_ENTRY, [
+                (entry["view_key"], entry["sort_key"], source_id, _dump(entry)) for entry in entries
+            ])
+
+    def page_view_entries(self, view_key: str, limit: int = None, next_token: str = None,
+                          descending: bool = False, start: str = None, end: str = None) -> dict:
+        page_size = clamp_page_size(limit)
+        scope = f"sqlite:view:{view_key}:{descending}:{start}:{end}"
+        start_key = decode_next_token(next_token, scope)
+        # sort_key is "<date>#<entry id>"; "~" sorts after every such suffix
+        low, high = start or "", (end or "9999-12-31") + "~"
+        after = start_key["sort_key"] if start_key else (high if descending else "")
+        rows = self._conn().execute(
+            SELECT_VIEW_PAGE_DESC if descending else SELECT_VIEW_PAGE,
+            (view_key, after, low, high, page_size + 1)
+        ).fetchall()
+
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        return {
+            "items": [_load(row[1]) for row in rows],
+            "next_token": encode_next_token({"sort_key": rows[-1][0]} if more else None, scope)
+        }
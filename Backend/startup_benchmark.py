@@ -0,0 +1,124 @@
+"""
+Worker cold-start benchmark.
+
+Imports the app in fresh interpreters (what every autoscaled worker pays at boot)
+and reports wall time, peak RSS and the slowest imports from `python -X importtime`.
+
+Usage:
+    python -m app.startup_benchmark [--runs 5] [--top 15] [--json]
+                                    [--max-seconds 1.5] [--max-rss-mb 150]
+
+With --max-seconds/--max-rss-mb it exits non-zero when the median boot time or
+peak RSS goes over budget, so it can run as a CI check.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_TARGET = "app.main"
+
+
+def _run_import(target: str, importtime: bool = False):
+    """
+    Import `target` in a new interpreter; returns (seconds, peak_rss_kb, stderr).
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", f"import {target}"]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    with process.stderr:
+        stderr = process.stderr.read().decode("utf-8", "replace")
+    # wait4 gives the child's own resource usage (ru_maxrss is in KB on Linux)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{stderr}")
+    return elapsed, usage.ru_maxrss, stderr
+
+
+def slowest_imports(importtime_output: str, top: int) -> list:
+    """
+    Parse `-X importtime` lines ("import time: self | cumulative | name") and return
+    the `top` modules by cumulative microseconds.
+    """
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us)
+        })
+    rows.sort(key=lambda row: row["cumulative_us"], reverse=True)
+    return rows[:top]
+
+
+def benchmark(target: str = DEFAULT_TARGET, runs: int = 5, top: int = 15) -> dict:
+    timings, rss = [], []
+    for _ in range(runs):
+        seconds, peak_kb, _ = _run_import(target)
+        timings.append(seconds)
+        rss.append(peak_kb / 1024)
+    _, _, importtime_output = _run_import(target, importtime=True)
+    return {
+        "target": target,
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "wall_seconds": {
+            "median": round(statistics.median(timings), 4),
+            "min": round(min(timings), 4),
+            "max": round(max(timings), 4)
+        },
+        "peak_rss_mb": round(max(rss), 1),
+        "slowest_imports": slowest_imports(importtime_output, top)
+    }
+
+
+def _print_report(result: dict):
+    wall = result["wall_seconds"]
+    print(f"Startup of {result['target']} over {result['runs']} runs (Python {result['python']})")
+    print(f"  wall time : median {wall['median']:.3f}s  (min {wall['min']:.3f}s, max {wall['max']:.3f}s)")
+    print(f"  peak RSS  : {result['peak_rss_mb']:.1f} MB")
+    print("  slowest imports (cumulative):")
+    for row in result["slowest_imports"]:
+        print(f"    {row['cumulative_us'] / 1000:9.1f} ms  {row['module']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.startup_benchmark", description="Measure worker cold-start time and memory")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Module to import (default: app.main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON (for tracking over time)")
+    parser.add_argument("--max-seconds", type=float, help="Fail if the median boot time exceeds this")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if peak RSS exceeds this")
+    args = parser.parse_args(argv)
+
+    result = benchmark(args.target, max(1, args.runs), args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
+
+    over_budget = []
+    if args.max_seconds is not None and result["wall_seconds"]["median"] > args.max_seconds:
+        over_budget.append(f"median boot {result['wall_seconds']['median']:.3f}s > {args.max_seconds}s")
+    if args.max_rss_mb is not None and result["peak_rss_mb"] > args.max_rss_mb:
+        over_budget.append(f"peak RSS {result['peak_rss_mb']:.1f} MB > {args.max_rss_mb} MB")
+    if over_budget:
+        print("❌ Over budget: " + "; ".join(over_budget), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
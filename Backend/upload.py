@@ -1,5 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.s3_service import upload_file_to_s3
+from pydantic import BaseModel, Field
+from app.services.s3_service import (
+    upload_file_to_s3_async,
+    create_upload_session_async,
+    complete_upload_session_async,
+    get_upload_stats,
+    UploadRejected
+)
+from app.services.db_service import (
+    update_exit_request_data,
+    update_exit_request_data_async,
+    update_damage_report_data,
+    update_damage_report_data_async
+)
+from app.services.image_pipeline import schedule_derivatives
 
 router = APIRouter(prefix="/upload", tags=["File Upload"])
 
@@ -9,11 +24,92 @@ async def upload_document(file: UploadFile = File(...)):
     Upload a document to the 'tenant_docs' folder in the configured S3 bucket.
     """
     try:
-        s3_url = upload_file_to_s3(file, folder="tenant_docs")
+        s3_url = await upload_file_to_s3_async(file, folder="tenant_docs")
         return {
             "message": "File uploaded successfully",
             "file_url": s3_url
         }
 
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+
+# -----------------------------
+# Presigned Direct-to-S3 Uploads
+# 1. POST /sessions           → presigned POST (or PUT) for the file
+# 2. client uploads to S3 directly
+# 3. POST /sessions/complete  → verified, and attached to the exit request / damage report
+# -----------------------------
+class UploadSessionRequest(BaseModel):
+    folder: str = Field(..., example="damage_docs")  # exit_docs | damage_docs | tenant_docs
+    filename: str = Field(..., example="walkthrough.mp4")
+    content_type: Optional[str] = Field(None, example="video/mp4")
+    size: Optional[int] = Field(None, ge=1, description="Bytes; required for method=put")
+    method: str = Field("post", description="post or put")
+
+
+class UploadCompletion(BaseModel):
+    upload_token: str
+    request_id: Optional[str] = Field(None, description="Exit request to attach an exit_docs upload to")
+    report_id: Optional[str] = Field(None, description="Damage report to attach a damage_docs upload to")
+
+
+@router.post("/sessions")
+async def create_upload_session(session: UploadSessionRequest):
+    """
+    Start a direct upload: returns the presigned url (+ form fields or headers)
+    and an upload_token for the completion call.
+    """
+    try:
+        return await create_upload_session_async(
+            session.folder,
+            session.filename,
+            content_type=session.content_type,
+            size=session.size,
+            method=session.method.lower()
+        )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create upload session: {str(e)}")
+
+
+@router.post("/sessions/complete")
+async def complete_upload_session(completion: UploadCompletion):
+    """
+    Verify a direct upload (HEAD) and attach its URL: exit_docs → the exit request's
+    supporting_document_url, damage_docs → the damage report's document_url.
+    Attached photos are queued for thumbnails (thumbnail_url/preview_url appear on the item later).
+    """
+    try:
+        upload = await complete_upload_session_async(completion.upload_token)
+        if upload["folder"] == "exit_docs" and completion.request_id:
+            await update_exit_request_data_async(completion.request_id, {"supporting_document_url": upload["file_url"]})
+            upload["attached_to"] = {"request_id": completion.request_id}
+        elif upload["folder"] == "damage_docs" and completion.report_id:
+            await update_damage_report_data_async(completion.report_id, {"document_url": upload["file_url"]})
+            upload["attached_to"] = {"report_id": completion.report_id}
+
+        attached = upload.get("attached_to")
+        if attached:
+            if "request_id" in attached:
+                on_ready = lambda urls: update_exit_request_data(attached["request_id"], urls)
+            else:
+                on_ready = lambda urls: update_damage_report_data(attached["report_id"], urls)
+            upload["derivatives_queued"] = schedule_derivatives(
+                upload["file_url"], upload["folder"], upload["content_type"], on_ready=on_ready
+            )
+        return {"message": "Upload completed", **upload}
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to complete upload: {str(e)}")
+
+
+@router.get("/stats")
+async def upload_stats():
+    """
+    Per-folder upload counts, bytes and byte rates for this worker.
+    """
+    return get_upload_stats()
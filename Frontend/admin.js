@@ -2,14 +2,47 @@ document.addEventListener("DOMContentLoaded", () => {
   fetchExitRequests();
   fetchDamageReports();
   attachLogoutHandler();
+  attachLoadMoreHandlers();
+  attachBatchStatusHandlers();
+  subscribeToEvents();
 });
 
+// Cursors returned by the paginated admin endpoints
+let exitNextToken = null;
+let damageNextToken = null;
+
+// Only request the attributes each table renders
+const EXIT_FIELDS = "request_id,tenant_id,name,room_number,exit_reason,moveout_checklist,request_status";
+const DAMAGE_FIELDS = "summary";
+
+function pageUrl(path, token, fields) {
+  const url = new URL(`http://127.0.0.1:8000${path}`);
+  url.searchParams.set("limit", "50");
+  if (fields) url.searchParams.set("fields", fields);
+  if (token) url.searchParams.set("next_token", token);
+  return url.toString();
+}
+
+function toggleLoadMore(buttonId, token) {
+  const btn = document.getElementById(buttonId);
+  if (btn) btn.classList.toggle("hidden", !token);
+}
+
+function statusBadgeClass(status) {
+  return {
+    Pending: "bg-yellow-100 text-yellow-700",
+    Approved: "bg-green-100 text-green-700",
+    Rejected: "bg-red-100 text-red-700",
+    InReview: "bg-blue-100 text-blue-700"
+  }[status] || "bg-gray-100 text-gray-700";
+}
+
 // -------------------------------
 // Fetch & Render Exit Requests
 // -------------------------------
-async function fetchExitRequests() {
+async function fetchExitRequests(append = false) {
   try {
-    const res = await fetch("http://127.0.0.1:8000/admin/exit-requests", {
+    const res = await fetch(pageUrl("/admin/exit-requests", append ? exitNextToken : null, EXIT_FIELDS), {
       credentials: "include"
     });
 
@@ -17,54 +50,54 @@ async function fetchExitRequests() {
 
     const data = await res.json();
     const tbody = document.getElementById("exitBody");
-    tbody.innerHTML = "";
-
-    data.forEach((item) => {
-      const checklist = (item.moveout_checklist || []).join(", ") || "N/A";
-      const badgeClass = {
-        Pending: "bg-yellow-100 text-yellow-700",
-        Approved: "bg-green-100 text-green-700",
-        Rejected: "bg-red-100 text-red-700",
-        InReview: "bg-blue-100 text-blue-700"
-      }[item.request_status] || "bg-gray-100 text-gray-700";
-
-      const row = document.createElement("tr");
-      row.classList.add("hover:bg-gray-50", "transition");
-
-      row.innerHTML = `
-        <td class="px-4 py-3 text-sm font-medium text-gray-900">${item.request_id}</td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.name}<br><span class="text-xs text-gray-500">${item.tenant_id}</span></td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.room_number}</td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.exit_reason}</td>
-        <td class="px-4 py-3 text-sm text-gray-700" title="${checklist}">
-          ${checklist.length > 40 ? checklist.substring(0, 40) + "..." : checklist}
-        </td>
-        <td class="px-4 py-3 text-sm">
-          <span class="px-2 py-1 rounded-full text-xs font-semibold ${badgeClass}">
-            ${item.request_status}
-          </span>
-        </td>
-        <td class="px-4 py-3 text-sm">
-          <button onclick="updateStatus('${item.request_id}')" class="bg-indigo-600 hover:bg-indigo-700 text-white text-xs px-3 py-1 rounded">
-            Update
-          </button>
-        </td>
-      `;
-
-      tbody.appendChild(row);
-    });
+    if (!append) tbody.innerHTML = "";
+    exitNextToken = data.next_token;
+    toggleLoadMore("loadMoreExit", exitNextToken);
+
+    data.items.forEach((item) => tbody.appendChild(buildExitRow(item)));
   } catch (err) {
     console.error("Error fetching exit requests:", err);
     Swal.fire("Error", "Failed to load exit requests", "error");
   }
 }
 
+function buildExitRow(item) {
+  const checklist = (item.moveout_checklist || []).join(", ") || "N/A";
+  const badgeClass = statusBadgeClass(item.request_status);
+
+  const row = document.createElement("tr");
+  row.classList.add("hover:bg-gray-50", "transition");
+  row.dataset.requestId = item.request_id;
+
+  row.innerHTML = `
+    <td class="px-4 py-3 text-sm"><input type="checkbox" class="exit-select" value="${item.request_id}" /></td>
+    <td class="px-4 py-3 text-sm font-medium text-gray-900">${item.request_id}</td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.name}<br><span class="text-xs text-gray-500">${item.tenant_id}</span></td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.room_number}</td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.exit_reason}</td>
+    <td class="px-4 py-3 text-sm text-gray-700" title="${checklist}">
+      ${checklist.length > 40 ? checklist.substring(0, 40) + "..." : checklist}
+    </td>
+    <td class="px-4 py-3 text-sm">
+      <span class="status-badge px-2 py-1 rounded-full text-xs font-semibold ${badgeClass}">
+        ${item.request_status}
+      </span>
+    </td>
+    <td class="px-4 py-3 text-sm">
+      <button onclick="updateStatus('${item.request_id}')" class="bg-indigo-600 hover:bg-indigo-700 text-white text-xs px-3 py-1 rounded">
+        Update
+      </button>
+    </td>
+  `;
+  return row;
+}
+
 // -------------------------------
 // Fetch & Render Damage Reports
 // -------------------------------
-async function fetchDamageReports() {
+async function fetchDamageReports(append = false) {
   try {
-    const res = await fetch("http://127.0.0.1:8000/admin/damage-reports", {
+    const res = await fetch(pageUrl("/admin/damage-reports", append ? damageNextToken : null, DAMAGE_FIELDS), {
       credentials: "include"
     });
 
@@ -72,29 +105,55 @@ async function fetchDamageReports() {
 
     const data = await res.json();
     const tbody = document.getElementById("damageBody");
-    tbody.innerHTML = "";
-
-    data.forEach((item) => {
-      const row = document.createElement("tr");
-      row.classList.add("hover:bg-gray-50", "transition");
-
-      row.innerHTML = `
-        <td class="px-4 py-3 text-sm font-medium text-gray-900">${item.report_id}</td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.tenant_id}</td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.room_number}</td>
-        <td class="px-4 py-3 text-sm text-gray-700">${item.damage_description || item.description || "N/A"}</td>
-        <td class="px-4 py-3 text-sm text-green-600 font-semibold">₹${item.estimated_cost || 0}</td>
-        <td class="px-4 py-3 text-sm text-gray-500">${item.reported_at ? new Date(item.reported_at).toLocaleDateString() : "N/A"}</td>
-      `;
-
-      tbody.appendChild(row);
-    });
+    if (!append) tbody.innerHTML = "";
+    damageNextToken = data.next_token;
+    toggleLoadMore("loadMoreDamage", damageNextToken);
+
+    data.items.forEach((item) => tbody.appendChild(buildDamageRow(item)));
   } catch (err) {
     console.error("Error fetching damage reports:", err);
     Swal.fire("Error", "Failed to load damage reports", "error");
   }
 }
 
+function damagePhotoCell(item) {
+  // Thumbnails are a few KB; the full photo only loads when clicked
+  return item.thumbnail_url
+    ? `<a href="${item.document_url}" target="_blank"><img src="${item.thumbnail_url}" loading="lazy" class="h-12 w-12 object-cover rounded" alt="Damage photo"></a>`
+    : item.document_url
+      ? `<a href="${item.document_url}" target="_blank" class="text-indigo-600 underline">View</a>`
+      : "—";
+}
+
+function buildDamageRow(item) {
+  const row = document.createElement("tr");
+  row.classList.add("hover:bg-gray-50", "transition");
+  row.dataset.reportId = item.report_id;
+  row.dataset.documentUrl = item.document_url || "";
+  row.dataset.thumbnailUrl = item.thumbnail_url || "";
+
+  row.innerHTML = `
+    <td class="px-4 py-3 photo-cell">${damagePhotoCell(item)}</td>
+    <td class="px-4 py-3 text-sm font-medium text-gray-900">${item.report_id}</td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.tenant_id}</td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.room_number}</td>
+    <td class="px-4 py-3 text-sm text-gray-700">${item.damage_description || item.description || "N/A"}</td>
+    <td class="px-4 py-3 text-sm text-green-600 font-semibold">₹${item.estimated_cost || 0}</td>
+    <td class="px-4 py-3 text-sm text-gray-500">${item.reported_at ? new Date(item.reported_at).toLocaleDateString() : "N/A"}</td>
+  `;
+
+  return row;
+}
+
+function setRowStatus(requestId, status) {
+  const row = document.querySelector(`tr[data-request-id="${requestId}"]`);
+  if (!row) return null;
+  const badge = row.querySelector(".status-badge");
+  badge.className = `status-badge px-2 py-1 rounded-full text-xs font-semibold ${statusBadgeClass(status)}`;
+  badge.textContent = status;
+  return row;
+}
+
 // -------------------------------
 // Update Exit Request Status
 // -------------------------------
@@ -131,7 +190,7 @@ async function updateStatus(requestId) {
       const result = await res.json();
       if (res.ok) {
         Swal.fire("Success", result.message || "Status updated successfully", "success");
-        fetchExitRequests();
+        setRowStatus(requestId, status);
       } else {
         throw new Error(result.detail || "Unknown error");
       }
@@ -142,6 +201,127 @@ async function updateStatus(requestId) {
   }
 }
 
+// -------------------------------
+// Batch Status Update (selected rows)
+// -------------------------------
+function attachBatchStatusHandlers() {
+  const selectAll = document.getElementById("selectAllExit");
+  if (selectAll) {
+    selectAll.addEventListener("change", () => {
+      document.querySelectorAll(".exit-select").forEach((box) => (box.checked = selectAll.checked));
+    });
+  }
+
+  const approveBtn = document.getElementById("approveSelected");
+  if (approveBtn) approveBtn.addEventListener("click", () => updateSelectedStatus("Approved"));
+
+  const rejectBtn = document.getElementById("rejectSelected");
+  if (rejectBtn) rejectBtn.addEventListener("click", () => updateSelectedStatus("Rejected"));
+}
+
+async function updateSelectedStatus(status) {
+  const ids = Array.from(document.querySelectorAll(".exit-select:checked")).map((box) => box.value);
+  if (!ids.length) {
+    Swal.fire("Nothing selected", "Select one or more exit requests first.", "info");
+    return;
+  }
+
+  try {
+    const res = await fetch("http://127.0.0.1:8000/admin/update-exit-status/batch", {
+      method: "PATCH",
+      headers: {
+        "Content-Type": "application/json"
+      },
+      credentials: "include",
+      body: JSON.stringify({
+        updates: ids.map((id) => ({ request_id: id, new_status: status }))
+      })
+    });
+
+    const result = await res.json();
+    if (!res.ok) throw new Error(result.detail || "Unknown error");
+
+    // Apply outcomes in place instead of re-fetching the whole list
+    Object.entries(result.results).forEach(([requestId, outcome]) => {
+      if (outcome.status !== "updated" && outcome.status !== "unchanged") return;
+      const row = setRowStatus(requestId, outcome.request_status);
+      if (row) row.querySelector(".exit-select").checked = false;
+    });
+
+    const failed = result.total - Object.values(result.results).filter(
+      (outcome) => outcome.status === "updated" || outcome.status === "unchanged"
+    ).length;
+    Swal.fire(
+      failed ? "Partially updated" : "Success",
+      `${result.updated} request(s) set to ${status}` + (failed ? `, ${failed} failed` : ""),
+      failed ? "warning" : "success"
+    );
+  } catch (err) {
+    console.error("Batch update failed:", err);
+    Swal.fire("Error", "Batch status update failed", "error");
+  }
+}
+
+// -------------------------------
+// Live Updates (Server-Sent Events)
+// Changes made anywhere are applied to the rows in place; the lists are only
+// reloaded after bulk imports or when the stream reports missed events.
+// -------------------------------
+function subscribeToEvents() {
+  if (!window.EventSource) return;
+  const source = new EventSource("http://127.0.0.1:8000/events/stream", { withCredentials: true });
+
+  source.addEventListener("exit_request.created", (e) => {
+    const event = JSON.parse(e.data);
+    if (document.querySelector(`tr[data-request-id="${event.key}"]`)) return;
+    document.getElementById("exitBody").prepend(buildExitRow(event.data));
+  });
+
+  const onExitChange = (e) => {
+    const event = JSON.parse(e.data);
+    if (event.data.request_status) setRowStatus(event.key, event.data.request_status);
+  };
+  source.addEventListener("exit_request.status_changed", onExitChange);
+  source.addEventListener("exit_request.updated", onExitChange);
+
+  source.addEventListener("damage_report.created", (e) => {
+    const event = JSON.parse(e.data);
+    if (document.querySelector(`tr[data-report-id="${event.key}"]`)) return;
+    document.getElementById("damageBody").prepend(buildDamageRow(event.data));
+  });
+
+  source.addEventListener("damage_report.updated", (e) => {
+    const event = JSON.parse(e.data);
+    const row = document.querySelector(`tr[data-report-id="${event.key}"]`);
+    if (!row) return;
+    if (!event.data.thumbnail_url && !event.data.document_url) return;
+    if (event.data.document_url) row.dataset.documentUrl = event.data.document_url;
+    if (event.data.thumbnail_url) row.dataset.thumbnailUrl = event.data.thumbnail_url;
+    row.querySelector(".photo-cell").innerHTML = damagePhotoCell({
+      document_url: row.dataset.documentUrl,
+      thumbnail_url: row.dataset.thumbnailUrl
+    });
+  });
+
+  source.addEventListener("exit_request.bulk_created", () => fetchExitRequests());
+  source.addEventListener("damage_report.bulk_created", () => fetchDamageReports());
+  source.addEventListener("resync", () => {
+    fetchExitRequests();
+    fetchDamageReports();
+  });
+}
+
+// -------------------------------
+// Load More (next page)
+// -------------------------------
+function attachLoadMoreHandlers() {
+  const exitBtn = document.getElementById("loadMoreExit");
+  if (exitBtn) exitBtn.addEventListener("click", () => fetchExitRequests(true));
+
+  const damageBtn = document.getElementById("loadMoreDamage");
+  if (damageBtn) damageBtn.addEventListener("click", () => fetchDamageReports(true));
+}
+
 // -------------------------------
 // Logout Functionality
 // -------------------------------
@@ -3,14 +3,32 @@ document.addEventListener("DOMContentLoaded", () => {
   fetchRoomHistory();
   fetchMoveTimeline();
   attachLogoutHandler();
+  attachLoadMoreHandlers();
 });
 
+// Cursors returned by the paginated landlord endpoints
+let exitNextToken = null;
+let historyNextToken = null;
+let timelineNextToken = null;
+
+function pageUrl(path, token) {
+  const url = new URL(`http://127.0.0.1:8000${path}`);
+  url.searchParams.set("limit", "50");
+  if (token) url.searchParams.set("next_token", token);
+  return url.toString();
+}
+
+function toggleLoadMore(buttonId, token) {
+  const btn = document.getElementById(buttonId);
+  if (btn) btn.classList.toggle("hidden", !token);
+}
+
 // -----------------------------
 // Fetch Approved Exit Requests
 // -----------------------------
-async function fetchApprovedExits() {
+async function fetchApprovedExits(append = false) {
   try {
-    const response = await fetch("http://127.0.0.1:8000/landlord/approved-exits", {
+    const response = await fetch(pageUrl("/landlord/approved-exits", append ? exitNextToken : null), {
       method: "GET",
       credentials: "include",
     });
@@ -21,20 +39,23 @@ async function fetchApprovedExits() {
     const exitContainer = document.getElementById("approvedExitList");
     if (!exitContainer) return;
 
-    exitContainer.innerHTML = "";
+    if (!append) exitContainer.innerHTML = "";
+    exitNextToken = data.next_token;
+    toggleLoadMore("loadMoreExits", exitNextToken);
 
-    if (data.length === 0) {
+    if (!append && data.items.length === 0) {
       exitContainer.innerHTML = `<p class="text-gray-500">No approved exits found.</p>`;
       return;
     }
 
-    data.forEach((exit, index) => {
+    const offset = exitContainer.children.length;
+    data.items.forEach((exit, index) => {
       const card = `
         <div class="bg-white p-4 rounded-lg shadow-md mb-4">
-          <h4 class="font-bold text-lg">Exit ${index + 1}</h4>
+          <h4 class="font-bold text-lg">Exit ${offset + index + 1}</h4>
           <p><strong>Tenant:</strong> ${exit.name}</p>
           <p><strong>Room:</strong> ${exit.room_number}</p>
-          <p><strong>Date:</strong> ${exit.exit_date}</p>
+          <p><strong>Date:</strong> ${exit.exit_date || "Not set"}</p>
         </div>
       `;
       exitContainer.innerHTML += card;
@@ -48,9 +69,9 @@ async function fetchApprovedExits() {
 // -----------------------------
 // Fetch Room History
 // -----------------------------
-async function fetchRoomHistory() {
+async function fetchRoomHistory(append = false) {
   try {
-    const response = await fetch("http://127.0.0.1:8000/landlord/room-history", {
+    const response = await fetch(pageUrl("/landlord/room-history", append ? historyNextToken : null), {
       method: "GET",
       credentials: "include",
     });
@@ -61,20 +82,22 @@ async function fetchRoomHistory() {
     const historyContainer = document.getElementById("roomHistoryList");
     if (!historyContainer) return;
 
-    historyContainer.innerHTML = "";
+    if (!append) historyContainer.innerHTML = "";
+    historyNextToken = data.next_token;
+    toggleLoadMore("loadMoreHistory", historyNextToken);
 
-    if (data.length === 0) {
+    if (!append && data.items.length === 0) {
       historyContainer.innerHTML = `<tr><td colspan="4" class="text-center text-gray-500 py-2">No room history found.</td></tr>`;
       return;
     }
 
-    data.forEach((entry) => {
+    data.items.forEach((entry) => {
       const row = `
         <tr class="border-b">
           <td class="py-2 px-4">${entry.room_number}</td>
           <td class="py-2 px-4">${entry.tenant_name}</td>
-          <td class="py-2 px-4">${entry.move_in}</td>
-          <td class="py-2 px-4">${entry.move_out}</td>
+          <td class="py-2 px-4">${entry.move_in || "-"}</td>
+          <td class="py-2 px-4">${entry.move_out}${entry.moved_out ? "" : " (planned)"}</td>
         </tr>
       `;
       historyContainer.innerHTML += row;
@@ -88,9 +111,9 @@ async function fetchRoomHistory() {
 // -----------------------------
 // Fetch Move-in/Out Timeline
 // -----------------------------
-async function fetchMoveTimeline() {
+async function fetchMoveTimeline(append = false) {
   try {
-    const response = await fetch("http://127.0.0.1:8000/landlord/move-timeline", {
+    const response = await fetch(pageUrl("/landlord/move-timeline", append ? timelineNextToken : null), {
       method: "GET",
       credentials: "include",
     });
@@ -101,14 +124,16 @@ async function fetchMoveTimeline() {
     const timelineContainer = document.getElementById("moveTimelineList");
     if (!timelineContainer) return;
 
-    timelineContainer.innerHTML = "";
+    if (!append) timelineContainer.innerHTML = "";
+    timelineNextToken = data.next_token;
+    toggleLoadMore("loadMoreTimeline", timelineNextToken);
 
-    if (data.length === 0) {
+    if (!append && data.items.length === 0) {
       timelineContainer.innerHTML = `<p class="text-gray-500">No movement events found.</p>`;
       return;
     }
 
-    data.forEach((event) => {
+    data.items.forEach((event) => {
       const timelineItem = `
         <div class="border-l-4 border-blue-500 pl-4 mb-4">
           <p class="text-sm text-gray-600">${event.date}</p>
@@ -123,6 +148,20 @@ async function fetchMoveTimeline() {
   }
 }
 
+// -----------------------------
+// Load More (next page)
+// -----------------------------
+function attachLoadMoreHandlers() {
+  const exitBtn = document.getElementById("loadMoreExits");
+  if (exitBtn) exitBtn.addEventListener("click", () => fetchApprovedExits(true));
+
+  const historyBtn = document.getElementById("loadMoreHistory");
+  if (historyBtn) historyBtn.addEventListener("click", () => fetchRoomHistory(true));
+
+  const timelineBtn = document.getElementById("loadMoreTimeline");
+  if (timelineBtn) timelineBtn.addEventListener("click", () => fetchMoveTimeline(true));
+}
+
 // -----------------------------
 // Logout Button Handler
 // -----------------------------
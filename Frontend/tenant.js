@@ -1,6 +1,7 @@
 document.addEventListener("DOMContentLoaded", () => {
   handleExitFormSubmit();
   attachLogoutHandler();
+  subscribeToStatusUpdates();
 });
 
 // -----------------------------
@@ -126,6 +127,23 @@ async function fetchMyExitRequests(tenantId) {
   }
 }
 
+// -----------------------------
+// Live Status Updates (Server-Sent Events)
+// The stream only carries this tenant's own changes; refresh the list when
+// one of them is approved/rejected instead of polling.
+// -----------------------------
+function subscribeToStatusUpdates() {
+  if (!window.EventSource) return;
+  const source = new EventSource("http://127.0.0.1:8000/events/stream?topics=exit_request", { withCredentials: true });
+  const refresh = () => {
+    const tenantId = document.getElementById("tenantId")?.value.trim();
+    if (tenantId) fetchMyExitRequests(tenantId);
+  };
+  source.addEventListener("exit_request.status_changed", refresh);
+  source.addEventListener("exit_request.updated", refresh);
+  source.addEventListener("resync", refresh);
+}
+
 // -----------------------------
 // Logout Functionality
 // -----------------------------